@@ -1,12 +1,18 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-import time
 from util import success_msg, delete_msg
-from db import init_db
+from queries import TASK_COLUMNS, TASK_FILTERS
+from changeset import diff_frames
+from tags import fetch_tag_counts
+from archive import fetch_archived_topics
+import services
+from services import TASK_STATUSES, TASK_PRIORITIES, TASK_CATEGORIES
+from metrics import track_page
+from writer import write
 
-# Custom CSS for colourful visuals
-st.markdown("""
+# Custom CSS for colourful visuals; injected by the page rather than on import
+TASK_CSS = """
     <style>
     .stButton > button {
         background-color: #4CAF50;
@@ -61,9 +67,11 @@ st.markdown("""
         font-weight: bold;
     }
     </style>
-""", unsafe_allow_html=True)
+"""
 
+@track_page("task")
 def add_task(conn, user_id):
+    st.markdown(TASK_CSS, unsafe_allow_html=True)
     st.subheader("➕ Add Task")
     
     # Input fields for adding a new task
@@ -93,45 +101,63 @@ def add_task(conn, user_id):
 
     # Save Task button
     if st.button("💾 Save Task"):
-        if not title or not from_date or not due_date or not priority:
-            st.error("Please fill in all required fields (marked with *).")
-        elif from_date > due_date:
-            st.error("❌ 'From Date' cannot be later than 'Due Date'.")
-        else:
-            try:
-                conn.execute(
-                    """
-                    INSERT INTO topic (user_id, title, description, from_date, due_date, status, priority, progress, category, recurrence, tags)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (user_id, title, description, from_date.strftime("%Y-%m-%d"), due_date.strftime("%Y-%m-%d"), "Not Started", priority, 0, category, recurrence, tags)
-                )
-                conn.commit()
-                st.success("🎉 Task saved successfully!")
-                st.rerun()  # Refresh the page to reflect changes
-            except Exception as e:
-                st.error(f"❌ Error saving task: {str(e)}")
+        try:
+            write(
+                services.create_task, user_id, title, from_date, due_date, priority, category,
+                recurrence=recurrence, description=description, tags=tags
+            )
+            success_msg("Task saved successfully!")
+            st.rerun()  # Refresh the page to reflect changes
+        except ValueError as e:
+            st.error(f"❌ {str(e)}")
+        except Exception as e:
+            st.error(f"❌ Error saving task: {str(e)}")
     st.divider()  
     
     # Use an accordion to show/hide tasks
     with st.expander("📋 Tasks", expanded=False):
         display_tasks(conn, user_id)
 
+    # Archived tasks are only read when asked for
+    if st.checkbox("🗄️ Show archived tasks", value=False):
+        archived = fetch_archived_topics(conn, user_id)
+        if archived:
+            st.dataframe(
+                pd.DataFrame(archived, columns=["ID", "Title", "Category", "From Date", "Due Date", "Archived At"]).drop(columns=["ID"]),
+                use_container_width=True, hide_index=True
+            )
+        else:
+            st.info("ℹ️ No archived tasks yet.")
+
 def display_tasks(conn, user_id):
     try:
-        # Fetch tasks for the logged-in user
-        tasks = conn.execute("SELECT * FROM topic WHERE user_id = ?", (user_id,)).fetchall()
+        # Filters are applied in SQL, not on the fetched frame
+        filter_cols = st.columns(len(TASK_FILTERS) + 1)
+        filters = {}
+        for col, column in zip(filter_cols, TASK_FILTERS):
+            with col:
+                filters[column] = st.multiselect(
+                    f"Filter by {column.title()}",
+                    {"status": TASK_STATUSES, "category": TASK_CATEGORIES, "priority": TASK_PRIORITIES}[column],
+                    key=f"tasks_filter_{column}"
+                )
+        with filter_cols[-1]:
+            filters["tags"] = st.multiselect(
+                "Filter by Tags", [name for name, _ in fetch_tag_counts(conn, user_id)], key="tasks_filter_tags"
+            )
+
+        # Keyset pagination: keep the cursor of every visited page so "Previous" is cheap
+        filter_key = repr(sorted(filters.items()))
+        if st.session_state.get('tasks_filter_key') != filter_key:
+            st.session_state['tasks_filter_key'] = filter_key
+            st.session_state['tasks_cursors'] = [None]
+        cursors = st.session_state['tasks_cursors']
+
+        tasks, next_cursor = services.list_tasks_page(conn, user_id, filters, after=cursors[-1])
         
         if tasks:
-            # Define the column names based on the database schema
-            columns = [
-                "topic_id", "user_id", "title", "description", "from_date", "due_date", 
-                "status", "priority", "progress", "category", "recurrence", "tags",
-                "created_at", "updated_at"  # Include all columns from the database
-            ]
-            
             # Create a DataFrame with the fetched tasks
-            df = pd.DataFrame(tasks, columns=columns)
+            df = pd.DataFrame(tasks, columns=TASK_COLUMNS)
             df["from_date"] = pd.to_datetime(df["from_date"]).dt.date
             df["due_date"] = pd.to_datetime(df["due_date"]).dt.date
             
@@ -140,63 +166,80 @@ def display_tasks(conn, user_id):
                 df,
                 column_config={
                     "topic_id": None,  # Hide the ID column
-                    "user_id": None,  # Hide the UserID column
                     "from_date": st.column_config.DateColumn("From Date", format="YYYY-MM-DD"),
                     "due_date": st.column_config.DateColumn("Due Date", format="YYYY-MM-DD"),
                     "priority": st.column_config.SelectboxColumn("Priority", options=["None","High", "Medium", "Low"]),
-                    "status": st.column_config.SelectboxColumn("Status", options=["Not Started", "Pending", "In Progress", "Completed"]),
+                    "status": st.column_config.SelectboxColumn("Status", options=TASK_STATUSES),
                     "progress": st.column_config.ProgressColumn("Progress", min_value=0, max_value=100),
                     "recurrence": st.column_config.SelectboxColumn("Recurrence", options=["None", "Daily", "Weekly", "Monthly"]),
                     "category": st.column_config.SelectboxColumn(
                         "Category", 
-                        options=[
-                            "None", "Programming", "Mathematics", "Science", "Literature", "History", 
-                            "Art", "Music", "Finance", "Health & Fitness", "Business", 
-                            "Design", "Engineering", "Language Learning", "Personal Development", 
-                            "Travel", "Cooking", "Sports", "Technology", "Gaming", "Photography"
-                        ]
+                        options=["None"] + TASK_CATEGORIES
                     )
                 },
-                key="tasks_table"
+                key=f"tasks_table_{len(cursors)}"
             )
+
+            # Page navigation
+            prev_col, page_col, next_col = st.columns([1, 2, 1])
+            with prev_col:
+                if st.button("⬅️ Previous", disabled=len(cursors) == 1):
+                    cursors.pop()
+                    st.rerun()
+            with page_col:
+                st.caption(f"Page {len(cursors)}")
+            with next_col:
+                if st.button("Next ➡️", disabled=next_cursor is None):
+                    cursors.append(next_cursor)
+                    st.rerun()
             
             # Save changes to the database
             if st.button("💾 Save Changes"):
                 try:
-                    for index, row in edited_df.iterrows():
-                        conn.execute(
-                            """
-                            UPDATE topic 
-                            SET title = ?, description = ?, from_date = ?, due_date = ?, status = ?, priority = ?, progress = ?, category = ?, recurrence = ?, tags = ?
-                            WHERE topic_id = ? AND user_id = ?
-                            """,
-                            (
-                                row["title"], row["description"], row["from_date"].strftime("%Y-%m-%d"), 
-                                row["due_date"].strftime("%Y-%m-%d"), row["status"], row["priority"], 
-                                row["progress"], row["category"], row["recurrence"], row["tags"], 
-                                row["topic_id"], user_id
-                            )
-                        )
-                    conn.commit()
-                    st.success("🎉 Tasks updated successfully!")
+                    updated = write(services.update_tasks, user_id, diff_frames(df, edited_df, key="topic_id"))
+                    st.success(f"🎉 {updated} task(s) updated successfully!")
                 except Exception as e:
                     st.error(f"❌ Error updating tasks: {str(e)}")
             st.divider()  
+
+            task_titles = dict(zip(df["topic_id"], df["title"]))  # {topic_id: title}
+
+            # Description is only fetched for the task the user opens
+            selected_task_id = st.selectbox(
+                "📝 Show description for", options=[None] + list(task_titles.keys()),
+                format_func=lambda x: "Select a task" if x is None else task_titles[x]
+            )
+            if selected_task_id is not None:
+                with st.expander(f"📝 {task_titles[selected_task_id]}", expanded=True):
+                    description = st.text_area(
+                        "Description", value=services.get_task_description(conn, user_id, selected_task_id) or "",
+                        key=f"task_description_{selected_task_id}"
+                    )
+                    if st.button("💾 Save Description"):
+                        try:
+                            write(services.update_task_description, user_id, selected_task_id, description)
+                            st.success("🎉 Description updated successfully!")
+                        except Exception as e:
+                            st.error(f"❌ Error updating description: {str(e)}")
+            st.divider()
             
             # Delete Task option
             col1, col2 = st.columns(2)
             with col1:
-                task_to_delete = st.selectbox("Select a task to delete", df["title"])
+                task_to_delete = st.selectbox("Select a task to delete", list(task_titles.keys()), format_func=lambda x: task_titles[x])
             with col2:    
                 if st.button("🗑️ Delete Task"):
                     try:
-                        conn.execute("DELETE FROM topic WHERE title = ? AND user_id = ?", (task_to_delete, user_id))
-                        conn.commit()
-                        st.success(f"✅ Task '{task_to_delete}' deleted successfully!")
+                        write(services.delete_task, user_id, task_to_delete)
+                        delete_msg(task_titles[task_to_delete])
                         st.rerun()  # Refresh the page to reflect changes
                     except Exception as e:
                         st.error(f"❌ Error deleting task: {str(e)}")
+        elif len(cursors) > 1:
+            # The page emptied (e.g. after deletes); step back
+            cursors.pop()
+            st.rerun()
         else:
             st.info("ℹ️ No tasks found. Add a task to get started!")
     except Exception as e:
-        st.error(f"❌ Error fetching tasks: {str(e)}")
\ No newline at end of file
+        st.error(f"❌ Error fetching tasks: {str(e)}")
@@ -0,0 +1,31 @@
+import os
+import streamlit as st
+import sqltrace
+
+# Usernames allowed to see the admin panels, comma separated
+ADMIN_USERS = {name.strip() for name in os.getenv("SKILLFORGE_ADMIN_USERS", "").split(",") if name.strip()}
+
+def is_admin(username):
+    return username in ADMIN_USERS
+
+def show_sql_trace_panel(conn, username):
+    """Render the SQL trace summary in the sidebar for admins; no-op unless tracing is on."""
+    if not sqltrace.SQL_TRACE or not is_admin(username) or not hasattr(conn, "sql_stats"):
+        return
+    with st.sidebar.expander("🛠️ SQL Trace"):
+        scope = st.radio("Scope", ["This run", "Since start"], horizontal=True, key="sql_trace_scope")
+        stats = conn.sql_stats if scope == "This run" else sqltrace.process_stats
+        summary = stats.summary()
+        if not summary:
+            st.info("ℹ️ No statements recorded yet.")
+            return
+        import pandas as pd  # Only needed when the panel is open
+
+        df = pd.DataFrame(summary)
+        st.caption(
+            f"{df['calls'].sum()} statements, {df['total_ms'].sum():.1f} ms total. "
+            f"Slow queries (≥ {sqltrace.SLOW_QUERY_MS:g} ms) are logged to {sqltrace.SLOW_QUERY_LOG}."
+        )
+        st.dataframe(df[["calls", "started", "total_ms", "p95_ms", "rows", "sql"]], hide_index=True)
+        if scope == "Since start" and st.button("Reset", key="sql_trace_reset"):
+            sqltrace.process_stats.reset()
@@ -0,0 +1,283 @@
+"""Local HTTP/JSON API over the services layer, for batch clients.
+
+    python app/api.py token alice                  # prints a new API token for user 'alice'
+    python app/api.py serve --port 8765 --pool 8   # http://127.0.0.1:8765
+
+Every endpoint except /health and /metrics needs `Authorization: Bearer <token>`.
+
+    GET  /topics?status=Pending&after=<cursor>&limit=100
+    POST /topics              {"topics": [{"title", "from_date", "due_date", "priority", "category", ...}]}
+    POST /slots               {"slots": [{"topic_id", "date", "time_slot"}]}
+    GET  /schedules?include_archived=true
+    POST /schedules/complete  {"schedule_ids": [1, 2, ...]}
+"""
+import argparse
+import hashlib
+import json
+import logging
+import queue
+import secrets
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import metrics
+import services
+from archive import fetch_schedule_history
+from db import connect_readonly, init_db
+from queries import TASK_COLUMNS, TASK_FILTERS
+from writer import get_writer
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+MAX_BATCH = 10000
+MAX_PAGE_LIMIT = 1000
+POOL_TIMEOUT_SECONDS = 10
+
+log = logging.getLogger("skillforge.api")
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class ConnectionPool:
+    """A fixed number of read-only connections shared by the request threads."""
+
+    def __init__(self, db_path, size=8):
+        self._idle = queue.LifoQueue()  # The most recently used connection has the warmest cache
+        for _ in range(size):
+            self._idle.put(connect_readonly(db_path))
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._idle.get(timeout=POOL_TIMEOUT_SECONDS)
+        except queue.Empty:
+            raise ApiError(503, "All database connections are busy; retry later.")
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:  # Never hand on a half-finished transaction
+                conn.rollback()
+            self._idle.put(conn)
+
+    def close(self):
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
+
+def _hash_token(token):
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+def issue_token(conn, username, name=None):
+    """Create an API token for a user and return it; only its hash is stored.
+
+    A writer job: get_writer(db_path).write(issue_token, username, name).
+    """
+    row = conn.execute("SELECT user_id FROM user WHERE username = ?", (username,)).fetchone()
+    if row is None:
+        raise ValueError(f"No such user: {username}")
+    token = secrets.token_urlsafe(32)
+    conn.execute("INSERT INTO api_token (token_hash, user_id, name) VALUES (?, ?, ?)", (_hash_token(token), row[0], name))
+    return token
+
+def authenticate_token(conn, token):
+    """Return the user_id a token belongs to, or None."""
+    row = conn.execute("SELECT user_id FROM api_token WHERE token_hash = ?", (_hash_token(token),)).fetchone()
+    return row[0] if row else None
+
+def _parse_date(value, field):
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ApiError(400, f"{field} must be an ISO date (YYYY-MM-DD).")
+
+def _batch(body, field):
+    items = body.get(field) if isinstance(body, dict) else None
+    if not isinstance(items, list) or not items:
+        raise ApiError(400, f"Expected a non-empty '{field}' array.")
+    if len(items) > MAX_BATCH:
+        raise ApiError(413, f"At most {MAX_BATCH} {field} per request.")
+    return items
+
+# Handlers take (conn, user_id, query, body) and return (status, payload)
+def get_topics(conn, user_id, query, body):
+    filters = {column: query[column] for column in TASK_FILTERS + ["tags"] if column in query}
+    after = None
+    if "after" in query:
+        due_date, _, topic_id = query["after"][0].rpartition(",")
+        if not topic_id.isdigit():
+            raise ApiError(400, "after must be the 'next' value of the previous page.")
+        after = (due_date, int(topic_id))
+    try:
+        limit = int(query.get("limit", ["100"])[0])
+    except ValueError:
+        limit = None
+    if limit is None or not 1 <= limit <= MAX_PAGE_LIMIT:
+        raise ApiError(400, f"limit must be an integer from 1 to {MAX_PAGE_LIMIT}.")
+    rows, next_cursor = services.list_tasks_page(conn, user_id, filters, after, limit)
+    return 200, {
+        "topics": [dict(zip(TASK_COLUMNS, row)) for row in rows],
+        "next": f"{next_cursor[0]},{next_cursor[1]}" if next_cursor else None,
+    }
+
+def post_topics(conn, user_id, query, body):
+    tasks = []
+    for index, task in enumerate(_batch(body, "topics")):
+        if not isinstance(task, dict):
+            raise ApiError(400, f"Task {index}: expected an object.")
+        tasks.append({
+            **task,
+            "from_date": _parse_date(task.get("from_date"), f"topics[{index}].from_date"),
+            "due_date": _parse_date(task.get("due_date"), f"topics[{index}].due_date"),
+        })
+    return 201, {"topic_ids": services.create_tasks(conn, user_id, tasks)}
+
+def post_slots(conn, user_id, query, body):
+    slots = []
+    for index, slot in enumerate(_batch(body, "slots")):
+        if not isinstance(slot, dict) or not isinstance(slot.get("topic_id"), int):
+            raise ApiError(400, f"slots[{index}] needs an integer topic_id.")
+        slots.append((slot["topic_id"], _parse_date(slot.get("date"), f"slots[{index}].date"), slot.get("time_slot")))
+    created, skipped = services.add_slots(conn, user_id, slots)
+    return 200, {"created": created, "skipped": [{"index": index, "reason": reason} for index, reason in skipped]}
+
+def get_schedules(conn, user_id, query, body):
+    include_archived = query.get("include_archived", ["false"])[0].lower() in ("1", "true", "yes")
+    columns = ["schedule_id", "date", "time_slot", "title", "subtopic", "is_completed", "archived"]
+    rows = fetch_schedule_history(conn, user_id, include_archived)
+    return 200, {"schedules": [dict(zip(columns, row)) for row in rows]}
+
+def post_schedules_complete(conn, user_id, query, body):
+    schedule_ids = _batch(body, "schedule_ids")
+    if not all(isinstance(schedule_id, int) and not isinstance(schedule_id, bool) for schedule_id in schedule_ids):
+        raise ApiError(400, "schedule_ids must be integers.")
+    return 200, {"updated": services.complete_sessions(conn, user_id, schedule_ids)}
+
+ROUTES = {
+    ("GET", "/topics"): get_topics,
+    ("POST", "/topics"): post_topics,
+    ("POST", "/slots"): post_slots,
+    ("GET", "/schedules"): get_schedules,
+    ("POST", "/schedules/complete"): post_schedules_complete,
+}
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so batch clients reuse their connection
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _send(self, status, payload, content_type="application/json"):
+        body = payload.encode("utf-8") if isinstance(payload, str) else json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self, method):
+        started = time.perf_counter()
+        url = urlsplit(self.path)
+        route = url.path
+        status = 500
+        try:
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                self.close_connection = True  # Where the body ends is unknown
+                raise ApiError(400, "Content-Length must be a non-negative integer.")
+            if length > MAX_BODY_BYTES:
+                self.close_connection = True  # The unread body would be taken for the next request
+                raise ApiError(413, "Request body too large.")
+            raw = self.rfile.read(length) if length else b""
+
+            if route == "/health":
+                status, payload = 200, {"status": "ok"}
+            elif route == "/metrics":
+                status = 200
+                self._send(status, metrics.render(), "text/plain; version=0.0.4; charset=utf-8")
+                return
+            else:
+                handler = ROUTES.get((method, route))
+                if handler is None:
+                    route = "unknown"
+                    raise ApiError(404, "Not found.")
+                try:
+                    body = json.loads(raw) if raw else None
+                except ValueError:
+                    raise ApiError(400, "Body is not valid JSON.")
+                scheme, _, token = (self.headers.get("Authorization") or "").partition(" ")
+                with self.server.pool.connection() as conn:
+                    user_id = authenticate_token(conn, token) if scheme.lower() == "bearer" and token else None
+                    if user_id is None:
+                        raise ApiError(401, "Missing or invalid bearer token.")
+                    try:
+                        if method == "POST":
+                            # Writes run on the writer thread, group-committed with the app's
+                            status, payload = self.server.writer.write(handler, user_id, parse_qs(url.query), body)
+                        else:
+                            status, payload = handler(conn, user_id, parse_qs(url.query), body)
+                    except ValueError as e:
+                        raise ApiError(400, str(e))
+                    except sqlite3.IntegrityError as e:
+                        raise ApiError(409, str(e))
+        except ApiError as e:
+            status, payload = e.status, {"error": str(e)}
+        except Exception:
+            log.exception("%s %s failed", method, route)  # Details stay in the server log
+            status, payload = 500, {"error": "Internal error."}
+        finally:
+            metrics.API_REQUEST_SECONDS.observe(time.perf_counter() - started, route=route, status=status)
+        self._send(status, payload)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+class ApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, db_path="scheduler.db", pool_size=8, verbose=False):
+        init_db(db_path).close()
+        self.pool = ConnectionPool(db_path, pool_size)
+        self.writer = get_writer(db_path)
+        self.verbose = verbose
+        super().__init__(address, ApiHandler)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SkillForgeAI HTTP API.")
+    parser.add_argument("--db", default="scheduler.db")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="Run the API server")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--pool", type=int, default=8, help="Database connections shared by request threads")
+    serve.add_argument("--verbose", action="store_true", help="Log every request")
+    token = commands.add_parser("token", help="Issue an API token for a user")
+    token.add_argument("username")
+    token.add_argument("--name", help="Label for the token, e.g. the client using it")
+    args = parser.parse_args()
+
+    if args.command == "token":
+        init_db(args.db).close()
+        print(get_writer(args.db).write(issue_token, args.username, args.name))
+    else:
+        server = ApiServer((args.host, args.port), args.db, args.pool, args.verbose)
+        print(f"Serving on http://{args.host}:{args.port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
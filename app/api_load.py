@@ -0,0 +1,175 @@
+"""Load-test the HTTP API and report per-endpoint latency and throughput.
+
+    python app/seed.py --db bench.db --scale small
+    python app/api_load.py --db bench.db --concurrency 8 --requests 2000 [--out api.json] [--compare old.json]
+
+With --db an API server is started in-process on a free port against that database, with a token
+for each of the first --users users; --url and --token target a running server instead.
+"""
+import argparse
+import http.client
+import json
+import random
+import statistics
+import threading
+import time
+from datetime import date, datetime, timedelta
+from urllib.parse import urlsplit
+from api import ApiServer, issue_token
+from benchmark import _percentile
+from db import connect_readonly
+from services import format_slot
+from writer import get_writer
+
+# Relative weight of each request kind in the mix
+MIX = {"list_topics": 40, "list_schedules": 25, "bulk_slots": 20, "bulk_topics": 5, "bulk_complete": 10}
+BATCH_SIZE = 50
+
+def _request(client, method, path, token, body=None):
+    payload = json.dumps(body).encode("utf-8") if body is not None else None
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+    client.request(method, path, body=payload, headers=headers)
+    response = client.getresponse()
+    data = response.read()
+    return response.status, data
+
+def _make_request(kind, rng, topic_ids, schedule_ids):
+    """Return (method, path, body) for one request of `kind`."""
+    if kind == "list_topics":
+        return "GET", "/topics?limit=25", None
+    if kind == "list_schedules":
+        return "GET", "/schedules", None
+    if kind == "bulk_slots":
+        start = date.today() + timedelta(days=rng.randint(0, 365))
+        return "POST", "/slots", {"slots": [
+            {
+                "topic_id": rng.choice(topic_ids),
+                "date": (start + timedelta(days=i // 8)).isoformat(),
+                "time_slot": format_slot(datetime(2000, 1, 1, rng.randint(6, 21), rng.choice([0, 30])), 30),
+            }
+            for i in range(BATCH_SIZE)
+        ]}
+    if kind == "bulk_topics":
+        start = date.today()
+        return "POST", "/topics", {"topics": [
+            {
+                "title": f"Load test topic {rng.randint(1, 10 ** 6)}", "from_date": start.isoformat(),
+                "due_date": (start + timedelta(days=30)).isoformat(), "priority": "Medium",
+                "category": "Programming", "tags": "Load, Test",
+            }
+            for _ in range(BATCH_SIZE // 5)
+        ]}
+    return "POST", "/schedules/complete", {"schedule_ids": rng.sample(schedule_ids, min(len(schedule_ids), BATCH_SIZE // 5)) or [0]}
+
+def run_load(base_url, users, concurrency=8, requests=2000, seed=7):
+    """Send `requests` requests from `concurrency` keep-alive clients.
+
+    `users` is a list of (token, topic_ids, schedule_ids). Returns the report dict.
+    """
+    url = urlsplit(base_url)
+    kinds, weights = list(MIX), list(MIX.values())
+    timings, statuses = {}, {}
+    lock = threading.Lock()
+    remaining = iter(range(requests))
+
+    def client_loop(worker):
+        rng = random.Random(seed + worker)
+        client = http.client.HTTPConnection(url.hostname, url.port, timeout=60)
+        for _ in remaining:  # Shared iterator; each worker takes the next request number
+            token, topic_ids, schedule_ids = rng.choice(users)
+            kind = rng.choices(kinds, weights)[0]
+            if kind == "bulk_slots" and not topic_ids:
+                kind = "list_topics"
+            method, path, body = _make_request(kind, rng, topic_ids, schedule_ids)
+            started = time.perf_counter()
+            status, _ = _request(client, method, path, token, body)
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                timings.setdefault(kind, []).append(elapsed)
+                statuses[status] = statuses.get(status, 0) + 1
+        client.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client_loop, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - started
+
+    return {
+        "meta": {"url": base_url, "concurrency": concurrency, "requests": requests, "seconds": round(duration, 2)},
+        "throughput_rps": round(requests / duration, 1),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "results": {
+            kind: {
+                "count": len(values),
+                "p50_ms": round(_percentile(values, 50), 3),
+                "p95_ms": round(_percentile(values, 95), 3),
+                "mean_ms": round(statistics.fmean(values), 3),
+                "max_ms": round(max(values), 3),
+            }
+            for kind, values in timings.items()
+        },
+    }
+
+def prepare_users(db_path, count):
+    """Issue tokens for the first `count` users that have topics; returns [(token, topic_ids, schedule_ids)]."""
+    conn = connect_readonly(db_path)
+    writer = get_writer(db_path)
+    users = []
+    for user_id, username in conn.execute(
+        "SELECT user_id, username FROM user WHERE user_id IN (SELECT user_id FROM topic) ORDER BY user_id LIMIT ?", (count,)
+    ).fetchall():
+        topic_ids = [row[0] for row in conn.execute("SELECT topic_id FROM topic WHERE user_id = ?", (user_id,))]
+        schedule_ids = [row[0] for row in conn.execute("SELECT schedule_id FROM schedule WHERE user_id = ? LIMIT 200", (user_id,))]
+        users.append((writer.write(issue_token, username, name="api_load"), topic_ids, schedule_ids))
+    conn.close()
+    return users
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the SkillForgeAI HTTP API.")
+    parser.add_argument("--db", help="Start an in-process server against this database")
+    parser.add_argument("--url", help="Target a running server instead")
+    parser.add_argument("--token", help="Token for --url")
+    parser.add_argument("--users", type=int, default=20, help="Users to spread requests over (with --db)")
+    parser.add_argument("--pool", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Previous JSON report to compare against")
+    args = parser.parse_args()
+
+    server = None
+    if args.db:
+        users = prepare_users(args.db, args.users)
+        server = ApiServer(("127.0.0.1", 0), args.db, args.pool)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    elif args.url and args.token:
+        users, base_url = [(args.token, [], [])], args.url
+    else:
+        parser.error("Pass --db, or --url with --token.")
+
+    try:
+        report = run_load(base_url, users, args.concurrency, args.requests, args.seed)
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+            # Load-test tokens are not kept around
+            get_writer(args.db).write(lambda conn: conn.execute("DELETE FROM api_token WHERE name = 'api_load'"))
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        print(f"throughput: {old['throughput_rps']} -> {report['throughput_rps']} req/s")
+        for kind, result in report["results"].items():
+            before = old["results"].get(kind, {})
+            print(f"{kind:<16} p95 {before.get('p95_ms', '-'):>9} -> {result['p95_ms']:>9} ms")
+    else:
+        print(json.dumps({key: report[key] for key in ("throughput_rps", "statuses", "results")}, indent=2))
@@ -0,0 +1,122 @@
+import os
+from db import transaction
+import queries
+
+# Completed work untouched for this many days moves to the archive tables
+ARCHIVE_AFTER_DAYS = int(os.getenv("SKILLFORGE_ARCHIVE_AFTER_DAYS", "30"))
+
+def archive_completed(conn, older_than_days=ARCHIVE_AFTER_DAYS):
+    """Move completed topics and finished schedule rows older than `older_than_days` into the archive.
+
+    An archived topic takes its schedule rows, time-tracking sessions, daily time totals and quiz results
+    along; its slots, tag links and search entries are dropped by the ON DELETE CASCADE / triggers on topic.
+    Returns {table: rows_archived}.
+    """
+    cutoff = f"-{int(older_than_days)} days"
+    with transaction(conn):
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS archive_topic_ids (topic_id INTEGER PRIMARY KEY)")
+        conn.execute("DELETE FROM archive_topic_ids")
+        conn.execute(
+            """
+            INSERT INTO archive_topic_ids (topic_id)
+            SELECT topic_id FROM topic
+            WHERE status = 'Completed' AND updated_at < datetime('now', ?)
+            """,
+            (cutoff,)
+        )
+
+        topics = conn.execute(
+            """
+            INSERT INTO topic_archive (topic_id, user_id, title, description, from_date, due_date, status,
+                                       priority, progress, category, tags, recurrence, created_at, updated_at)
+            SELECT topic_id, user_id, title, description, from_date, due_date, status,
+                   priority, progress, category, tags, recurrence, created_at, updated_at
+            FROM topic
+            WHERE topic_id IN (SELECT topic_id FROM archive_topic_ids)
+            """
+        ).rowcount
+
+        # Whole plan of archived topics, plus finished rows of topics that stay active
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS archive_schedule_ids (schedule_id INTEGER PRIMARY KEY)")
+        conn.execute("DELETE FROM archive_schedule_ids")
+        conn.execute(
+            """
+            INSERT INTO archive_schedule_ids (schedule_id)
+            SELECT schedule_id FROM schedule
+            WHERE topic_id IN (SELECT topic_id FROM archive_topic_ids)
+               OR (is_completed AND updated_at < datetime('now', ?))
+            """,
+            (cutoff,)
+        )
+        schedules = conn.execute(
+            """
+            INSERT INTO schedule_archive (schedule_id, user_id, date, time_slot, topic_id, title, subtopics,
+                                          reminder, is_completed, created_at, updated_at)
+            SELECT s.schedule_id, s.user_id, s.date, s.time_slot, s.topic_id, t.title, s.subtopics,
+                   s.reminder, s.is_completed, s.created_at, s.updated_at
+            FROM schedule s
+            JOIN topic t ON s.topic_id = t.topic_id
+            WHERE s.schedule_id IN (SELECT schedule_id FROM archive_schedule_ids)
+            """
+        ).rowcount
+        conn.execute("DELETE FROM schedule WHERE schedule_id IN (SELECT schedule_id FROM archive_schedule_ids)")
+
+        sessions = conn.execute(
+            """
+            INSERT INTO time_tracking_archive (time_tracking_id, user_id, topic_id, start_time, end_time,
+                                               time_spent, notes, created_at, updated_at)
+            SELECT time_tracking_id, user_id, topic_id, start_time, end_time, time_spent, notes, created_at, updated_at
+            FROM time_tracking
+            WHERE topic_id IN (SELECT topic_id FROM archive_topic_ids)
+            """
+        ).rowcount
+
+        conn.execute(
+            """
+            INSERT INTO time_tracking_daily_archive (user_id, topic_id, day, time_spent, sessions)
+            SELECT user_id, topic_id, day, time_spent, sessions
+            FROM time_tracking_daily
+            WHERE topic_id IN (SELECT topic_id FROM archive_topic_ids)
+            """
+        )
+
+        quizzes = conn.execute(
+            """
+            INSERT INTO quiz_result_archive (quiz_result_id, user_id, topic_id, subtopics, num_questions, score,
+                                             total_questions, timestamp)
+            SELECT quiz_result_id, user_id, topic_id, subtopics, num_questions, score, total_questions, timestamp
+            FROM quiz_result
+            WHERE topic_id IN (SELECT topic_id FROM archive_topic_ids)
+            """
+        ).rowcount
+
+        # Cascades remove the remaining dependent rows
+        conn.execute("DELETE FROM topic WHERE topic_id IN (SELECT topic_id FROM archive_topic_ids)")
+        conn.execute("DELETE FROM archive_topic_ids")
+        conn.execute("DELETE FROM archive_schedule_ids")
+
+    return {"topic": topics, "schedule": schedules, "time_tracking": sessions, "quiz_result": quizzes}
+
+def fetch_schedule_history(conn, user_id, include_archived=False):
+    """Fetch the user's schedule rows as (schedule_id, date, time_slot, title, subtopics, is_completed, archived).
+
+    Archived rows are only read when `include_archived` is set.
+    """
+    query = queries.SCHEDULE_HISTORY
+    params = [user_id]
+    if include_archived:
+        query += " UNION ALL " + queries.ARCHIVED_SCHEDULE_HISTORY
+        params.append(user_id)
+    return conn.execute(query, params).fetchall()
+
+def fetch_archived_topics(conn, user_id):
+    """Fetch the user's archived topics, most recently archived first."""
+    return conn.execute(
+        """
+        SELECT topic_id, title, category, from_date, due_date, archived_at
+        FROM topic_archive
+        WHERE user_id = ?
+        ORDER BY archived_at DESC
+        """,
+        (user_id,)
+    ).fetchall()
@@ -0,0 +1,187 @@
+"""Password hashing, login and signed session tokens.
+
+Passwords are hashed with bcrypt (or scrypt) at a configurable cost. Hashing is deliberately slow, so
+it runs on a small bounded pool rather than the Streamlit script thread, and a burst of logins queues
+there instead of stalling every session. Records in the old `salt:sha256` format still verify and are
+rehashed on the next successful login, as are hashes made with a different scheme or cost.
+
+After a successful login the app keeps a session token, signed with HMAC, in the session state only;
+checking it is one hash and a primary-key lookup, so reruns never verify the password again. Tokens
+carry the user's session generation, which logout bumps, so a token revoked by logging out stops
+working at once.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+import metrics
+import queries
+from writer import get_writer
+
+PASSWORD_SCHEME = os.getenv("SKILLFORGE_PASSWORD_SCHEME", "bcrypt")  # bcrypt | scrypt
+BCRYPT_ROUNDS = int(os.getenv("SKILLFORGE_BCRYPT_ROUNDS", "12"))
+SCRYPT_N = int(os.getenv("SKILLFORGE_SCRYPT_N", str(2 ** 15)))  # CPU/memory cost; r=8, p=1
+SCRYPT_R, SCRYPT_P = 8, 1
+BCRYPT_MAX_BYTES = 72  # bcrypt refuses longer input
+AUTH_WORKERS = int(os.getenv("SKILLFORGE_AUTH_WORKERS", "4"))  # Concurrent hash computations
+AUTH_MAX_PENDING = int(os.getenv("SKILLFORGE_AUTH_MAX_PENDING", "64"))  # Queued + running before logins are refused
+SESSION_TTL_SECONDS = int(os.getenv("SKILLFORGE_SESSION_TTL_HOURS", "12")) * 3600
+# Without a configured secret tokens are signed with a per-process key and end with the server
+SESSION_SECRET = os.getenv("SKILLFORGE_SESSION_SECRET", "").encode("utf-8") or secrets.token_bytes(32)
+
+class AuthBusy(Exception):
+    """Too many password hashes are already queued; the caller should ask the user to retry."""
+
+_pool = None
+_pool_lock = threading.Lock()
+_pending = threading.BoundedSemaphore(AUTH_MAX_PENDING)
+_dummy_hash = None
+
+def _executor():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(AUTH_WORKERS, thread_name_prefix="auth")
+        return _pool
+
+def _run(fn, *args):
+    """Run a hashing job on the auth pool and wait for it; raises AuthBusy at once when the pool is saturated."""
+    if not _pending.acquire(blocking=False):
+        raise AuthBusy("Too many logins in progress; please try again in a moment.")
+    try:
+        future = _executor().submit(fn, *args)
+    except BaseException:
+        _pending.release()
+        raise
+    future.add_done_callback(lambda _: _pending.release())
+    return future.result()
+
+# Hashing (pure functions; safe to call on any thread)
+
+def _bcrypt_secret(password):
+    """The bytes bcrypt hashes: the password, or for passwords over 72 bytes the base64 of their SHA-256."""
+    secret = password.encode("utf-8")
+    if len(secret) > BCRYPT_MAX_BYTES:
+        secret = base64.b64encode(hashlib.sha256(secret).digest())
+    return secret
+
+def hash_password(password, scheme=None):
+    """A new hash of `password` with the configured scheme and cost."""
+    scheme = scheme or PASSWORD_SCHEME
+    if scheme == "bcrypt":
+        return bcrypt.hashpw(_bcrypt_secret(password), bcrypt.gensalt(BCRYPT_ROUNDS)).decode("ascii")
+    if scheme == "scrypt":
+        salt = secrets.token_bytes(16)
+        digest = hashlib.scrypt(password.encode("utf-8"), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P,
+                                maxmem=256 * SCRYPT_N * SCRYPT_R)
+        return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${salt.hex()}${digest.hex()}"
+    raise ValueError(f"Unknown password scheme: {scheme}")
+
+def verify_password(stored, password):
+    """Whether `password` matches a stored bcrypt, scrypt or legacy `salt:sha256` hash."""
+    if stored.startswith("$2"):
+        if bcrypt.checkpw(_bcrypt_secret(password), stored.encode("ascii")):
+            return True
+        # bcrypt releases before 5.0 silently hashed only the first 72 bytes of longer passwords
+        encoded = password.encode("utf-8")
+        return len(encoded) > BCRYPT_MAX_BYTES and bcrypt.checkpw(encoded[:BCRYPT_MAX_BYTES], stored.encode("ascii"))
+    if stored.startswith("scrypt$"):
+        _, n, r, p, salt, digest = stored.split("$")
+        computed = hashlib.scrypt(password.encode("utf-8"), salt=bytes.fromhex(salt), n=int(n), r=int(r), p=int(p),
+                                  maxmem=256 * int(n) * int(r))
+        return hmac.compare_digest(computed.hex(), digest)
+    salt, _, digest = stored.partition(":")
+    computed = hashlib.sha256((salt + password).encode("utf-8")).hexdigest()
+    return hmac.compare_digest(computed, digest)
+
+def needs_rehash(stored):
+    """Whether a stored hash is legacy or was made with another scheme or cost than configured now."""
+    if PASSWORD_SCHEME == "bcrypt":
+        return not stored.startswith("$2") or int(stored.split("$")[2]) != BCRYPT_ROUNDS
+    return not stored.startswith(f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}$")
+
+def _check(stored, password):
+    """(matches, replacement hash or None); runs on the auth pool.
+
+    Without a stored hash a throwaway one is checked, so unknown names cost as much as wrong passwords
+    and response times do not reveal which names exist.
+    """
+    global _dummy_hash
+    if stored is None:
+        if _dummy_hash is None:
+            _dummy_hash = hash_password(secrets.token_hex(8))
+        verify_password(_dummy_hash, password)
+        return False, None
+    if not verify_password(stored, password):
+        return False, None
+    return True, hash_password(password) if needs_rehash(stored) else None
+
+# Accounts
+
+def _insert_user(conn, username, hashed):
+    conn.execute(queries.INSERT_USER, (username, hashed))
+
+def _replace_hash(conn, user_id, old, new):
+    # Only if the record is unchanged, so a concurrent rehash or password change wins
+    conn.execute(queries.REPLACE_PASSWORD_HASH, (new, user_id, old))
+
+def register(username, password, db_path=None):
+    """Create a user; raises sqlite3.IntegrityError if the name is taken, AuthBusy if hashing is saturated."""
+    if not username or not password:
+        raise ValueError("Username and password are required.")
+    get_writer(db_path).write(_insert_user, username, _run(hash_password, password))
+
+def authenticate(conn, username, password, db_path=None):
+    """user_id if the credentials match, else None. Outdated hashes are replaced on success."""
+    with metrics.timed(metrics.LOGIN_SECONDS):
+        row = conn.execute(queries.USER_CREDENTIALS, (username,)).fetchone()
+        user_id, stored = row or (None, None)
+        matches, rehashed = _run(_check, stored, password)
+        if not matches:
+            metrics.LOGINS.inc(outcome="failed")
+            return None
+        if rehashed:
+            get_writer(db_path).write(_replace_hash, user_id, stored, rehashed)
+        metrics.LOGINS.inc(outcome="rehashed" if rehashed else "ok")
+        return user_id
+
+# Session tokens
+
+def _sign(payload):
+    return hmac.new(SESSION_SECRET, payload, hashlib.sha256).hexdigest()
+
+def issue_session_token(conn, user_id, username, now=None):
+    """A token naming the user and their current session generation, valid for SESSION_TTL_SECONDS."""
+    generation = conn.execute(queries.SESSION_GENERATION, (user_id,)).fetchone()[0]
+    expires = int((now or time.time()) + SESSION_TTL_SECONDS)
+    payload = base64.urlsafe_b64encode(json.dumps([user_id, username, generation, expires]).encode("utf-8"))
+    return f"{payload.decode('ascii')}.{_sign(payload)}"
+
+def verify_session_token(conn, token, now=None):
+    """(user_id, username) of a valid, unexpired and unrevoked token, else None."""
+    payload, _, signature = (token or "").partition(".")
+    if not hmac.compare_digest(_sign(payload.encode("ascii", "replace")).encode("ascii"), signature.encode("utf-8")):
+        return None
+    try:
+        user_id, username, generation, expires = json.loads(base64.urlsafe_b64decode(payload))
+    except ValueError:
+        return None
+    if expires < (now or time.time()):
+        return None
+    current = conn.execute(queries.SESSION_GENERATION, (user_id,)).fetchone()
+    if current is None or current[0] != generation:
+        return None
+    return user_id, username
+
+def _revoke_sessions(conn, user_id):
+    conn.execute(queries.REVOKE_SESSIONS, (user_id,))
+
+def revoke_sessions(user_id, db_path=None):
+    """Invalidate every session token issued to the user so far (logout)."""
+    get_writer(db_path).write(_revoke_sessions, user_id)
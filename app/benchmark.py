@@ -0,0 +1,185 @@
+"""Time the SQL paths the pages run and write a JSON report that can be diffed between commits.
+
+    python app/seed.py --db bench.db --scale medium
+    python app/benchmark.py --db bench.db --out bench.json [--compare previous.json]
+"""
+import argparse
+import json
+import random
+import sqlite3
+import statistics
+import subprocess
+import time
+from datetime import date, datetime, timedelta
+import queries
+from db import connect
+from search import search
+from services import is_overlap
+from tags import fetch_tag_counts
+from timer import fetch_daily_totals
+
+def _sample_params(conn, rng, samples):
+    """Pick realistic (user_id, topic_id, date) triples from existing slots."""
+    max_slot = conn.execute("SELECT MAX(slot_id) FROM slot").fetchone()[0] or 0
+    params = []
+    while len(params) < samples and max_slot:
+        row = conn.execute(
+            "SELECT user_id, topic_id, date FROM slot WHERE slot_id >= ? LIMIT 1", (rng.randint(1, max_slot),)
+        ).fetchone()
+        if row:
+            params.append(row)
+    return params
+
+def _percentile(timings, pct):
+    return statistics.quantiles(timings, n=100, method="inclusive")[pct - 1] if len(timings) > 1 else timings[0]
+
+def benchmark_paths(conn, user_id, topic_id, day):
+    """Return {path: callable} for one sampled user/topic/date; each callable runs one page's SQL."""
+    first = date.fromisoformat(day)
+    last = (first + timedelta(days=30)).isoformat()
+
+    def dashboard():
+        conn.execute(queries.OPEN_TASKS, (user_id,)).fetchall()
+        fetch_tag_counts(conn, user_id)
+        fetch_daily_totals(conn, user_id, date.today() - timedelta(days=365))
+
+    def display_tasks():
+        sql, params = queries.build_tasks_page(user_id, limit=26)
+        rows = conn.execute(sql, params).fetchall()
+        if rows:
+            sql, params = queries.build_tasks_page(user_id, after=(rows[-1][3], rows[-1][0]), limit=26)
+            conn.execute(sql, params).fetchall()
+            conn.execute(queries.TASK_DESCRIPTION, (rows[0][0], user_id)).fetchone()
+
+    def display_tasks_filtered():
+        sql, params = queries.build_tasks_page(user_id, {"status": ["In Progress"], "tags": ["Python", "Math"]}, limit=26)
+        conn.execute(sql, params).fetchall()
+
+    def slot_generation():
+        # One day of 30-minute slots as get_time_slot writes them; rolled back to keep the data fixed
+        conn.execute("SAVEPOINT bench")
+        try:
+            current = datetime.combine(first, datetime.min.time()) + timedelta(hours=6)
+            for _ in range(8):
+                slot = f"{current.strftime('%I:%M %p')} - {(current + timedelta(minutes=30)).strftime('%I:%M %p')}"
+                existing = [s[0] for s in conn.execute(queries.SLOT_TIMES_ON_DATE, (topic_id, day))]
+                if not any(is_overlap(slot, other) for other in existing):
+                    conn.execute("INSERT OR IGNORE INTO slot (user_id, topic_id, date, time_slot) VALUES (?, ?, ?, ?)", (user_id, topic_id, day, slot))
+                current += timedelta(minutes=30)
+        finally:
+            conn.execute("ROLLBACK TO bench")
+            conn.execute("RELEASE bench")
+
+    def conflict_check():
+        existing = [s[0] for s in conn.execute(queries.SLOT_TIMES_IN_RANGE, (topic_id, day, last))]
+        any(is_overlap("10:00 AM - 11:00 AM", other) for other in existing)
+
+    def view_slots():
+        conn.execute(queries.SLOTS_IN_RANGE, (topic_id, day, last)).fetchall()
+        conn.execute(queries.SLOTS_ON_DATE, (topic_id, day)).fetchall()
+
+    def schedule_page():
+        conn.execute(queries.SCHEDULABLE_TASKS, (user_id,)).fetchall()
+        conn.execute(queries.TASK_DETAILS, (topic_id, user_id)).fetchall()
+        conn.execute(queries.AVAILABLE_SLOTS, (user_id, day)).fetchall()
+
+    def saved_schedules():
+        conn.execute(queries.SCHEDULE_HISTORY, (user_id,)).fetchall()
+
+    def saved_schedules_with_archive():
+        conn.execute(queries.SCHEDULE_HISTORY + " UNION ALL " + queries.ARCHIVED_SCHEDULE_HISTORY, (user_id, user_id)).fetchall()
+
+    def search_box():
+        search(conn, user_id, "pyth intro")
+
+    return {
+        "dashboard": dashboard,
+        "display_tasks": display_tasks,
+        "display_tasks_filtered": display_tasks_filtered,
+        "slot_generation": slot_generation,
+        "conflict_check": conflict_check,
+        "view_slots": view_slots,
+        "schedule_page": schedule_page,
+        "saved_schedules": saved_schedules,
+        "saved_schedules_with_archive": saved_schedules_with_archive,
+        "search": search_box,
+    }
+
+def run_benchmark(db_path, iterations=200, seed=7, warmup=10):
+    """Run every path `iterations` times with sampled parameters and return the report dict."""
+    conn = connect(db_path)
+    rng = random.Random(seed)
+    samples = _sample_params(conn, rng, iterations + warmup)
+    if not samples:
+        raise ValueError(f"No slots in {db_path}; populate it with seed.py first.")
+
+    timings = {}
+    for i, (user_id, topic_id, day) in enumerate(samples):
+        for path, run in benchmark_paths(conn, user_id, topic_id, day).items():
+            started = time.perf_counter()
+            run()
+            elapsed = (time.perf_counter() - started) * 1000
+            if i >= warmup:
+                timings.setdefault(path, []).append(elapsed)
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    report = {
+        "meta": {
+            "db": db_path,
+            "commit": commit,
+            "sqlite_version": sqlite3.sqlite_version,
+            "iterations": len(samples) - warmup,
+            "ran_at": datetime.now().isoformat(timespec="seconds"),
+            "rows": {
+                table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("user", "topic", "slot", "schedule", "time_tracking")
+            },
+        },
+        "results": {
+            path: {
+                "p50_ms": round(_percentile(values, 50), 3),
+                "p95_ms": round(_percentile(values, 95), 3),
+                "mean_ms": round(statistics.fmean(values), 3),
+                "max_ms": round(max(values), 3),
+            }
+            for path, values in timings.items()
+        },
+    }
+    conn.close()
+    return report
+
+def compare_reports(old, new):
+    """Format a p50/p95 comparison of two reports."""
+    lines = [f"{'path':<30} {'p50 old':>9} {'p50 new':>9} {'p95 old':>9} {'p95 new':>9} {'p95 Δ':>8}"]
+    for path, result in new["results"].items():
+        before = old["results"].get(path)
+        if not before:
+            lines.append(f"{path:<30} {'-':>9} {result['p50_ms']:>9} {'-':>9} {result['p95_ms']:>9}")
+            continue
+        change = (result["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100 if before["p95_ms"] else 0
+        lines.append(
+            f"{path:<30} {before['p50_ms']:>9} {result['p50_ms']:>9} {before['p95_ms']:>9} {result['p95_ms']:>9} {change:>7.1f}%"
+        )
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the SkillForgeAI SQL paths.")
+    parser.add_argument("--db", default="bench.db")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Previous JSON report to compare against")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.db, iterations=args.iterations, seed=args.seed)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            print(compare_reports(json.load(f), report))
+    else:
+        print(json.dumps(report["results"], indent=2))
@@ -0,0 +1,323 @@
+"""Stream topics, slots and schedules in and out of the database as CSV, JSONL or Parquet.
+
+    python app/bulk_io.py import topics cohort.csv                    # rows carry a username column
+    python app/bulk_io.py import slots slots.jsonl --user alice       # every row goes to alice
+    python app/bulk_io.py export schedules backup.parquet [--user alice]
+
+Files are read and written CHUNK_SIZE rows at a time, so memory stays flat whatever the file size.
+Slots and schedules name their task by title, so an export imports into another database as long as
+its users and topics exist there. Parquet needs pyarrow.
+"""
+import argparse
+import json
+import os
+import pandas as pd
+import queries
+from db import init_db, transaction
+from services.slots import SLOT_FORMAT
+from services.tasks import TASK_PRIORITIES, TASK_RECURRENCES, TASK_STATUSES
+from tags import set_topic_tags
+
+CHUNK_SIZE = 10000
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".parquet": "parquet"}
+MAX_REPORTED_ERRORS = 100
+
+EXPORT_COLUMNS = {
+    "topics": ["username", "topic_id", "title", "description", "from_date", "due_date", "status",
+               "priority", "progress", "category", "tags", "recurrence"],
+    "slots": ["username", "title", "date", "time_slot"],
+    "schedules": ["username", "title", "date", "time_slot", "subtopic", "is_completed"],
+}
+INTEGER_COLUMNS = {"topic_id", "progress"}
+BOOLEAN_COLUMNS = {"is_completed"}
+
+EXPORT_SQL = {
+    "topics": """
+        SELECT u.username, t.topic_id, t.title, t.description, t.from_date, t.due_date, t.status,
+               t.priority, t.progress, t.category, t.tags, t.recurrence
+        FROM topic t
+        JOIN user u ON u.user_id = t.user_id
+    """,
+    "slots": """
+        SELECT u.username, t.title, s.date, s.time_slot
+        FROM slot s
+        JOIN topic t ON t.topic_id = s.topic_id
+        JOIN user u ON u.user_id = s.user_id
+    """,
+    "schedules": """
+        SELECT u.username, t.title, s.date, s.time_slot, s.subtopics, s.is_completed
+        FROM schedule s
+        JOIN topic t ON t.topic_id = s.topic_id
+        JOIN user u ON u.user_id = s.user_id
+    """,
+}
+EXPORT_ORDER = {"topics": "t.user_id, t.topic_id", "slots": "s.user_id, s.slot_id", "schedules": "s.user_id, s.schedule_id"}
+
+def _format(path):
+    fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"Unsupported file type: {path} (use {', '.join(FORMATS)})")
+    return fmt
+
+def _parquet():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet files need pyarrow: pip install pyarrow") from None
+    return pa, pq
+
+# Export
+def export_chunks(conn, kind, user_id=None, chunk_size=CHUNK_SIZE):
+    """Yield DataFrames of at most `chunk_size` rows (EXPORT_COLUMNS[kind]) for one user or everyone."""
+    alias = EXPORT_ORDER[kind].split(".")[0]
+    sql = EXPORT_SQL[kind] + (f" WHERE {alias}.user_id = ?" if user_id is not None else "") + f" ORDER BY {EXPORT_ORDER[kind]}"
+    cursor = conn.execute(sql, () if user_id is None else (user_id,))
+    columns = EXPORT_COLUMNS[kind]
+    while rows := cursor.fetchmany(chunk_size):
+        chunk = pd.DataFrame.from_records(rows, columns=columns)
+        for column in INTEGER_COLUMNS.intersection(columns):
+            chunk[column] = chunk[column].astype("Int64")
+        for column in BOOLEAN_COLUMNS.intersection(columns):
+            chunk[column] = chunk[column].astype(bool)
+        yield chunk
+
+def _arrow_schema(pa, kind):
+    return pa.schema([
+        (column, pa.int64() if column in INTEGER_COLUMNS else pa.bool_() if column in BOOLEAN_COLUMNS else pa.string())
+        for column in EXPORT_COLUMNS[kind]
+    ])
+
+def export_file(conn, kind, path, user_id=None, chunk_size=CHUNK_SIZE):
+    """Write a user's (or everyone's) `kind` rows to `path`, format chosen by extension; returns rows written."""
+    fmt = _format(path)
+    written = 0
+    if fmt == "parquet":
+        pa, pq = _parquet()
+        schema = _arrow_schema(pa, kind)
+        with pq.ParquetWriter(path, schema) as writer:
+            for chunk in export_chunks(conn, kind, user_id, chunk_size):
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                written += len(chunk)
+        return written
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        for chunk in export_chunks(conn, kind, user_id, chunk_size):
+            if fmt == "csv":
+                chunk.to_csv(f, header=written == 0, index=False)
+            else:
+                f.write(chunk.to_json(orient="records", lines=True, force_ascii=False).rstrip("\n") + "\n")
+            written += len(chunk)
+        if fmt == "csv" and written == 0:
+            f.write(",".join(EXPORT_COLUMNS[kind]) + "\n")
+    return written
+
+# Import
+def read_chunks(path, chunk_size=CHUNK_SIZE):
+    """Yield the file as DataFrames of at most `chunk_size` rows, every value a string ('' when missing)."""
+    fmt = _format(path)
+    if fmt == "csv":
+        chunks = pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=False)
+    elif fmt == "jsonl":
+        chunks = pd.read_json(path, lines=True, chunksize=chunk_size, dtype=False, convert_dates=False)
+    else:
+        _, pq = _parquet()
+        chunks = (batch.to_pandas() for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size))
+    for chunk in chunks:
+        chunk = chunk.astype(object).where(chunk.notna(), "")
+        yield chunk.map(lambda value: value if isinstance(value, str) else str(value)).reset_index(drop=True)
+
+class _Rejects:
+    """Tracks which rows of a chunk failed validation, first reason wins."""
+
+    def __init__(self, chunk, first_row):
+        self.rows = pd.Series(range(first_row, first_row + len(chunk)), index=chunk.index)
+        self.bad = pd.Series(False, index=chunk.index)
+        self.errors = []
+
+    def add(self, mask, reason):
+        new = mask & ~self.bad
+        self.errors.extend((row, reason) for row in self.rows[new])
+        self.bad |= new
+
+def _column(chunk, name, default=""):
+    values = chunk[name].str.strip() if name in chunk else pd.Series("", index=chunk.index, dtype=object)
+    return values.where(values != "", default)
+
+def _resolve_users(conn, chunk, rejects, user_id):
+    if user_id is not None:
+        return pd.Series(user_id, index=chunk.index)
+    usernames = _column(chunk, "username")
+    found = dict(conn.execute(
+        "SELECT username, user_id FROM user WHERE username IN (SELECT value FROM json_each(?))",
+        (json.dumps(usernames.unique().tolist()),)
+    ).fetchall())
+    user_ids = usernames.map(found)
+    rejects.add(user_ids.isna(), "unknown username")
+    return user_ids
+
+def _resolve_topics(conn, chunk, rejects, user_ids):
+    titles = _column(chunk, "title")
+    rejects.add(titles == "", "title is required")
+    pairs = pd.DataFrame({"user_id": user_ids, "title": titles})[~rejects.bad].drop_duplicates()
+    found = {
+        (user_id, title): topic_id
+        for user_id, title, topic_id in conn.execute(
+            """
+            SELECT user_id, title, MIN(topic_id) FROM topic
+            WHERE user_id IN (SELECT value FROM json_each(?)) AND title IN (SELECT value FROM json_each(?))
+            GROUP BY user_id, title
+            """,
+            (json.dumps(pairs["user_id"].astype(int).unique().tolist()), json.dumps(pairs["title"].unique().tolist()))
+        )
+    }
+    topic_ids = pd.Series(
+        [found.get((user_id, title)) if ok else None for user_id, title, ok in zip(user_ids, titles, ~rejects.bad)],
+        index=chunk.index, dtype=object
+    )
+    rejects.add(topic_ids.isna(), "no topic with that title for the user")
+    return topic_ids
+
+def _parse_dates(values):
+    return pd.to_datetime(values, format="%Y-%m-%d", errors="coerce")
+
+def _valid_time_slots(values):
+    parts = values.str.split(" - ", n=1, expand=True).reindex(columns=[0, 1])
+    return pd.concat(
+        [pd.to_datetime(parts[i].str.strip(), format=SLOT_FORMAT, errors="coerce").notna() for i in (0, 1)], axis=1
+    ).all(axis=1)
+
+def _topic_rows(conn, chunk, rejects, user_id):
+    user_ids = _resolve_users(conn, chunk, rejects, user_id)
+    title = _column(chunk, "title")
+    from_date, due_date = _parse_dates(_column(chunk, "from_date")), _parse_dates(_column(chunk, "due_date"))
+    status = _column(chunk, "status", "Not Started")
+    priority = _column(chunk, "priority", "Medium")
+    recurrence = _column(chunk, "recurrence", "None")
+    progress = pd.to_numeric(_column(chunk, "progress", "0"), errors="coerce")
+
+    # Mirrors the CHECK constraints on topic, so one bad row does not abort its chunk
+    rejects.add(title == "", "title is required")
+    rejects.add(from_date.isna(), "from_date must be YYYY-MM-DD")
+    rejects.add(due_date.isna(), "due_date must be YYYY-MM-DD")
+    rejects.add(from_date > due_date, "from_date is later than due_date")
+    rejects.add(~status.isin(TASK_STATUSES), f"status must be one of {', '.join(TASK_STATUSES)}")
+    rejects.add(~priority.isin(TASK_PRIORITIES), f"priority must be one of {', '.join(TASK_PRIORITIES)}")
+    rejects.add(~recurrence.isin(TASK_RECURRENCES), f"recurrence must be one of {', '.join(TASK_RECURRENCES)}")
+    rejects.add(~progress.between(0, 100) | (progress % 1 != 0), "progress must be a whole number from 0 to 100")
+
+    ok = ~rejects.bad
+    return list(zip(
+        user_ids[ok].astype(int), title[ok], _column(chunk, "description")[ok],
+        from_date[ok].dt.strftime("%Y-%m-%d"), due_date[ok].dt.strftime("%Y-%m-%d"),
+        status[ok], priority[ok], progress[ok].astype(int), _column(chunk, "category")[ok],
+        recurrence[ok], _column(chunk, "tags")[ok],
+    ))
+
+def _write_topics(conn, rows):
+    conn.executemany(queries.INSERT_TASK, rows)
+    # AUTOINCREMENT hands out consecutive ids within one write transaction
+    last_id = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'topic'").fetchone()[0]
+    by_user = {}
+    for topic_id, row in zip(range(last_id - len(rows) + 1, last_id + 1), rows):
+        if row[-1]:
+            by_user.setdefault(row[0], []).append((topic_id, row[-1]))
+    for user_id, topics in by_user.items():
+        set_topic_tags(conn, user_id, topics)
+    return len(rows)
+
+def _slot_rows(conn, chunk, rejects, user_id):
+    user_ids = _resolve_users(conn, chunk, rejects, user_id)
+    topic_ids = _resolve_topics(conn, chunk, rejects, user_ids)
+    on_date = _parse_dates(_column(chunk, "date"))
+    time_slot = _column(chunk, "time_slot")
+    rejects.add(on_date.isna(), "date must be YYYY-MM-DD")
+    rejects.add(~_valid_time_slots(time_slot), "time_slot must look like '10:00 AM - 11:00 AM'")
+    ok = ~rejects.bad
+    return list(zip(user_ids[ok].astype(int), topic_ids[ok].astype(int), on_date[ok].dt.strftime("%Y-%m-%d"), time_slot[ok]))
+
+def _write_slots(conn, rows):
+    before = conn.total_changes
+    conn.executemany(queries.INSERT_SLOT_IF_FREE, rows)  # Slots already booked are skipped, not failed
+    return conn.total_changes - before
+
+def _schedule_rows(conn, chunk, rejects, user_id):
+    user_ids = _resolve_users(conn, chunk, rejects, user_id)
+    topic_ids = _resolve_topics(conn, chunk, rejects, user_ids)
+    on_date = _parse_dates(_column(chunk, "date"))
+    time_slot, subtopic = _column(chunk, "time_slot"), _column(chunk, "subtopic")
+    completed = _column(chunk, "is_completed", "false").str.lower()
+    rejects.add(on_date.isna(), "date must be YYYY-MM-DD")
+    rejects.add(time_slot == "", "time_slot is required")
+    rejects.add(subtopic == "", "subtopic is required")
+    rejects.add(~completed.isin(["true", "false", "1", "0"]), "is_completed must be true or false")
+    ok = ~rejects.bad
+    return list(zip(
+        user_ids[ok].astype(int), topic_ids[ok].astype(int), on_date[ok].dt.strftime("%Y-%m-%d"),
+        time_slot[ok], subtopic[ok], completed[ok].isin(["true", "1"]),
+    ))
+
+def _write_schedules(conn, rows):
+    conn.executemany(queries.INSERT_SCHEDULE_ROW, rows)
+    return len(rows)
+
+IMPORTERS = {
+    "topics": (_topic_rows, _write_topics),
+    "slots": (_slot_rows, _write_slots),
+    "schedules": (_schedule_rows, _write_schedules),
+}
+
+def import_file(conn, kind, path, user_id=None, chunk_size=CHUNK_SIZE):
+    """Import `kind` rows from `path`, one transaction per chunk.
+
+    Rows failing validation are skipped and reported, the rest of their chunk is still written.
+    Without `user_id` each row names its user in a `username` column.
+    Returns {"read", "imported", "skipped", "rejected", "errors"}; errors holds the first
+    MAX_REPORTED_ERRORS (row number, reason) pairs, counting data rows from 1.
+    """
+    to_rows, write = IMPORTERS[kind]
+    report = {"read": 0, "imported": 0, "skipped": 0, "rejected": 0, "errors": []}
+    for chunk in read_chunks(path, chunk_size):
+        rejects = _Rejects(chunk, report["read"] + 1)
+        rows = to_rows(conn, chunk, rejects, user_id)
+        if rows:
+            with transaction(conn):
+                written = write(conn, rows)
+            report["imported"] += written
+            report["skipped"] += len(rows) - written
+        report["read"] += len(chunk)
+        report["rejected"] += len(rejects.errors)
+        report["errors"].extend(sorted(rejects.errors)[:MAX_REPORTED_ERRORS - len(report["errors"])])
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import/export of SkillForgeAI data.")
+    parser.add_argument("--db", default="scheduler.db", help="Path to the SQLite database")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Rows per chunk/transaction")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("kind", choices=list(IMPORTERS))
+    parser.add_argument("path", help="File to read or write (.csv, .jsonl or .parquet)")
+    parser.add_argument("--user", help="Only this user's rows (export), or the user every row belongs to (import)")
+    args = parser.parse_args()
+    try:
+        _format(args.path)
+    except ValueError as e:
+        parser.error(str(e))
+
+    conn = init_db(args.db)
+    user_id = None
+    if args.user:
+        row = conn.execute("SELECT user_id FROM user WHERE username = ?", (args.user,)).fetchone()
+        if row is None:
+            parser.error(f"No such user: {args.user}")
+        user_id = row[0]
+
+    if args.action == "export":
+        print(f"Exported {export_file(conn, args.kind, args.path, user_id, args.chunk_size)} {args.kind} to {args.path}")
+    else:
+        report = import_file(conn, args.kind, args.path, user_id, args.chunk_size)
+        print(f"Read {report['read']}, imported {report['imported']}, skipped {report['skipped']} already present, "
+              f"rejected {report['rejected']}")
+        for row, reason in report["errors"]:
+            print(f"  row {row}: {reason}")
+    conn.close()
@@ -0,0 +1,84 @@
+import pandas as pd
+from collections import namedtuple
+from datetime import date, datetime
+from db import transaction
+
+# Rows inserted in the editor, rows whose values changed, and keys of rows that were removed
+ChangeSet = namedtuple("ChangeSet", ["inserted", "updated", "deleted"])
+
+def diff_frames(original, edited, key):
+    """Compare an edited frame with the original it was built from, matching rows on `key`.
+
+    New editor rows have no key yet and count as inserts; the comparison of kept rows is vectorized.
+    """
+    has_key = edited[key].notna()
+    inserted = edited[~has_key]
+
+    base = original.set_index(key)
+    kept = edited[has_key].set_index(key)
+    kept.index = kept.index.astype(base.index.dtype)  # Dynamic editors turn int keys into floats
+
+    deleted = base.index.difference(kept.index).tolist()
+    common = base.index.intersection(kept.index)
+    columns = [column for column in base.columns if column in kept.columns]
+    old = base.loc[common, columns]
+    new = kept.loc[common, columns]
+    changed = (old != new) & ~(old.isna() & new.isna())
+    updated = new[changed.any(axis=1)].reset_index()
+
+    return ChangeSet(inserted, updated, deleted)
+
+def has_changes(changes):
+    return bool(len(changes.inserted) or len(changes.updated) or len(changes.deleted))
+
+def _to_sql(value):
+    """Convert a frame cell to a value sqlite3 can bind."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        value = value.to_pydatetime()
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S") if value.time() != datetime.min.time() else value.strftime("%Y-%m-%d")
+    if isinstance(value, date):
+        return value.strftime("%Y-%m-%d")
+    if hasattr(value, "item"):  # numpy scalar
+        return value.item()
+    return value
+
+def apply_changes(conn, table, changes, key, columns, scope=None):
+    """Write a change set to `table` in one transaction, with one executemany per kind of change.
+
+    `columns` maps frame columns (including `key`) to table columns. `scope` holds fixed column
+    values (e.g. user_id) that are added to inserted rows and to the WHERE clause of updates and deletes.
+    """
+    scope = scope or {}
+    table_key = columns[key]
+    frame_columns = [column for column in columns if column != key]
+    table_columns = [columns[column] for column in frame_columns]
+    scope_clause = "".join(f" AND {column} = ?" for column in scope)
+    scope_values = tuple(scope.values())
+
+    with transaction(conn):
+        if len(changes.inserted):
+            insert_columns = table_columns + list(scope)
+            conn.executemany(
+                f"INSERT INTO {table} ({', '.join(insert_columns)}) VALUES ({', '.join('?' * len(insert_columns))})",
+                [
+                    tuple(_to_sql(value) for value in row) + scope_values
+                    for row in changes.inserted[frame_columns].itertuples(index=False)
+                ]
+            )
+        if len(changes.updated):
+            assignments = ", ".join(f"{column} = ?" for column in table_columns)
+            conn.executemany(
+                f"UPDATE {table} SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE {table_key} = ?{scope_clause}",
+                [
+                    tuple(_to_sql(value) for value in row[1:]) + (_to_sql(row[0]),) + scope_values
+                    for row in changes.updated[[key] + frame_columns].itertuples(index=False)
+                ]
+            )
+        if changes.deleted:
+            conn.executemany(
+                f"DELETE FROM {table} WHERE {table_key} = ?{scope_clause}",
+                [(_to_sql(row_key),) + scope_values for row_key in changes.deleted]
+            )
@@ -1,7 +1,13 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from datetime import datetime, timedelta
+from timer import fetch_daily_totals
+from tags import fetch_tag_counts
+import queries
+from metrics import track_page
 
+@track_page("dashboard")
 def show_dashboard(conn, user_id):
     """
     Display the user's dashboard with task summaries, visualizations, and progress tracking.
@@ -11,15 +17,7 @@ def show_dashboard(conn, user_id):
 
     try:
         # Fetch tasks for the logged-in user
-        tasks = conn.execute(
-            """
-            SELECT topic_id, title, status, progress, priority, category 
-            FROM topic 
-            WHERE user_id = ? AND status != 'Completed'
-            ORDER BY priority DESC
-            """,
-            (user_id,)
-        ).fetchall()
+        tasks = conn.execute(queries.OPEN_TASKS, (user_id,)).fetchall()
 
         if tasks:
             # Summary Card
@@ -68,28 +66,28 @@ def show_dashboard(conn, user_id):
                 fig2 = px.bar(category_counts, x="Category", y="Count", title="Tasks by Category", color="Category")
                 st.plotly_chart(fig2)
 
-            # # Progress Over Time Visualization
-            # st.write("### Progress Over Time")
-            # try:
-            #     progress_data = conn.execute(
-            #         """
-            #         SELECT date, AVG(progress) as avg_progress
-            #         FROM time_tracking
-            #         WHERE user_id = ?
-            #         GROUP BY date
-            #         ORDER BY date
-            #         """,
-            #         (user_id,)
-            #     ).fetchall()
+            # Tag facets come from the topic_tag index, not from parsing topic.tags
+            tag_counts = fetch_tag_counts(conn, user_id)
+            if tag_counts:
+                tag_df = pd.DataFrame(tag_counts[:20], columns=["Tag", "Count"])
+                fig_tags = px.bar(tag_df, x="Tag", y="Count", title="Tasks by Tag")
+                st.plotly_chart(fig_tags)
 
-            #     if progress_data:
-            #         progress_df = pd.DataFrame(progress_data, columns=["Date", "Average Progress"])
-            #         fig3 = px.line(progress_df, x="Date", y="Average Progress", title="Average Progress Over Time")
-            #         st.plotly_chart(fig3)
-            #     else:
-            #         st.info("No progress data available.")
-            # except Exception as e:
-            #     st.error(f"Error fetching progress data: {str(e)}")
+            # Progress Over Time Visualization (read from the daily rollup, not raw sessions)
+            st.write("### Progress Over Time")
+            try:
+                since = datetime.now().date() - timedelta(days=365)
+                progress_data = fetch_daily_totals(conn, user_id, since)
+
+                if progress_data:
+                    progress_df = pd.DataFrame(progress_data, columns=["Date", "Seconds", "Sessions"])
+                    progress_df["Minutes Studied"] = progress_df["Seconds"] / 60
+                    fig3 = px.line(progress_df, x="Date", y="Minutes Studied", title="Study Time Over Time", markers=True)
+                    st.plotly_chart(fig3)
+                else:
+                    st.info("No progress data available. Use the Study Timer to track your sessions.")
+            except Exception as e:
+                st.error(f"Error fetching progress data: {str(e)}")
 
         else:
             st.info("🎉 No tasks for today. Add a task to get started!")
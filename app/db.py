@@ -1,14 +1,90 @@
+import os
+import pathlib
 import sqlite3
+import itertools
+from contextlib import contextmanager
+import sqltrace
+from tags import migrate_topic_tags
 
-def init_db():
-    conn = sqlite3.connect('scheduler.db', check_same_thread=False)
+# Database used when no path is passed; the load harness points the app at a seeded copy
+DB_PATH = os.getenv("SKILLFORGE_DB", "scheduler.db")
+
+_savepoint_ids = itertools.count()
+
+@contextmanager
+def transaction(conn):
+    """Run a block of writes atomically.
+
+    Uses a savepoint, so an enclosing transaction keeps control of the final commit.
+    """
+    name = f"sp_{next(_savepoint_ids)}"
+    conn.execute(f"SAVEPOINT {name}")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute(f"ROLLBACK TO {name}")
+        conn.execute(f"RELEASE {name}")
+        raise
+    conn.execute(f"RELEASE {name}")
+
+def _table_exists(c, name):
+    return c.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+def _column_exists(c, table, column):
+    return any(row[1] == column for row in c.execute(f"PRAGMA table_info({table})"))
+
+def _count_sessions(row, sign):
+    """UPDATE adding (sign 1) or removing (sign -1) one schedule row to its topic's session counters."""
+    return f"""
+        UPDATE topic SET sessions_total = sessions_total + {sign}, sessions_done = sessions_done + {sign} * ({row}.is_completed IS TRUE)
+        WHERE topic_id = {row}.topic_id
+    """
+
+def _recount_sessions():
+    """UPDATE setting every topic's session counters from its schedule rows, archived ones included."""
+    return """
+        UPDATE topic SET sessions_total = counts.total, sessions_done = counts.done
+        FROM (
+            SELECT topic_id, COUNT(*) AS total, SUM(is_completed IS TRUE) AS done
+            FROM (SELECT topic_id, is_completed FROM schedule UNION ALL SELECT topic_id, is_completed FROM schedule_archive)
+            GROUP BY topic_id
+        ) AS counts
+        WHERE topic.topic_id = counts.topic_id
+          AND (topic.sessions_total IS NOT counts.total OR topic.sessions_done IS NOT counts.done)
+    """
+
+def connect(db_path=None):
+    """Open a connection with the settings every connection needs."""
+    db_path = db_path or DB_PATH
+    if sqltrace.SQL_TRACE:
+        conn = sqlite3.connect(db_path, check_same_thread=False, factory=sqltrace.TracedConnection)
+    else:
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA foreign_keys = ON")  # Off by default in SQLite; needed for ON DELETE CASCADE
+    return conn
+
+def connect_readonly(db_path=None):
+    """Open a connection that can only read; writes go through writer.py."""
+    uri = f"{pathlib.Path(db_path or DB_PATH).absolute().as_uri()}?mode=ro"
+    if sqltrace.SQL_TRACE:
+        return sqlite3.connect(uri, uri=True, check_same_thread=False, factory=sqltrace.TracedConnection)
+    return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+def init_db(db_path=None):
+    conn = connect(db_path)
     c = conn.cursor()
     
+    # Only takes effect on a new database; maintenance.py converts existing ones
+    c.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    # Persistent; readers keep reading while the writer commits
+    c.execute("PRAGMA journal_mode = WAL")
+    
     # Create tables if they don't exist
     c.execute('''CREATE TABLE IF NOT EXISTS user (
                     user_id INTEGER PRIMARY KEY AUTOINCREMENT,
                     username TEXT UNIQUE NOT NULL,
                     password TEXT NOT NULL,
+                    session_generation INTEGER NOT NULL DEFAULT 0,  -- Bumped on logout; older session tokens stop working
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )''')
@@ -28,8 +104,19 @@ def init_db():
                     recurrence TEXT CHECK(recurrence IN ('None', 'Daily', 'Weekly', 'Monthly')),
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    sessions_total INTEGER NOT NULL DEFAULT 0,  -- Schedule rows, archived ones included; kept by triggers
+                    sessions_done INTEGER NOT NULL DEFAULT 0,  -- Of which completed
+                    status_pinned INTEGER NOT NULL DEFAULT 0,  -- Set when the user picks the status; the roll-up then keeps it
                     FOREIGN KEY(user_id) REFERENCES user(user_id) ON DELETE CASCADE
                 )''')
+    session_counters_exist = _column_exists(c, 'topic', 'sessions_total')
+    if not session_counters_exist:
+        c.execute("ALTER TABLE topic ADD COLUMN sessions_total INTEGER NOT NULL DEFAULT 0")
+        c.execute("ALTER TABLE topic ADD COLUMN sessions_done INTEGER NOT NULL DEFAULT 0")
+        c.execute("ALTER TABLE topic ADD COLUMN status_pinned INTEGER NOT NULL DEFAULT 0")
+        # The old roll-up triggers recounted every row of the topic; replaced by the counters below
+        for trigger in ('trg_schedule_progress_insert', 'trg_schedule_progress_update', 'trg_schedule_progress_delete'):
+            c.execute(f"DROP TRIGGER IF EXISTS {trigger}")
     
     c.execute('''CREATE TABLE IF NOT EXISTS slot (
                     slot_id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -51,13 +138,22 @@ def init_db():
                     time_slot TEXT NOT NULL,
                     topic_id INTEGER NOT NULL,
                     subtopics TEXT NOT NULL,
-                    reminder TEXT,
+                    reminder TEXT,  -- Minutes before the session to remind the learner
                     is_completed BOOLEAN DEFAULT FALSE,  -- Renamed from 'completed' to 'is_completed'
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    next_fire_at TEXT,  -- When the reminder is due ('YYYY-MM-DD HH:MM:SS'); NULL once fired
+                    slot_id INTEGER,  -- The slot the session occupies, when it matched one
                     FOREIGN KEY(user_id) REFERENCES user(user_id) ON DELETE CASCADE,
-                    FOREIGN KEY(topic_id) REFERENCES topic(topic_id) ON DELETE CASCADE
+                    FOREIGN KEY(topic_id) REFERENCES topic(topic_id) ON DELETE CASCADE,
+                    FOREIGN KEY(slot_id) REFERENCES slot(slot_id) ON DELETE SET NULL
                 )''')
+    if not _column_exists(c, 'user', 'session_generation'):
+        c.execute("ALTER TABLE user ADD COLUMN session_generation INTEGER NOT NULL DEFAULT 0")
+    if not _column_exists(c, 'schedule', 'next_fire_at'):
+        c.execute("ALTER TABLE schedule ADD COLUMN next_fire_at TEXT")
+    if not _column_exists(c, 'schedule', 'slot_id'):
+        c.execute("ALTER TABLE schedule ADD COLUMN slot_id INTEGER REFERENCES slot(slot_id) ON DELETE SET NULL")
     
     c.execute('''CREATE TABLE IF NOT EXISTS time_tracking (
                     time_tracking_id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -73,6 +169,23 @@ def init_db():
                     FOREIGN KEY(topic_id) REFERENCES topic(topic_id) ON DELETE CASCADE
                 )''')
     
+    # Created without the topic foreign key before; the rows are copied over once the archive tables exist
+    daily_needs_rebuild = _table_exists(c, 'time_tracking_daily') and not any(
+        fk[2] == 'topic' for fk in c.execute("PRAGMA foreign_key_list(time_tracking_daily)")
+    )
+    if daily_needs_rebuild:
+        c.execute("ALTER TABLE time_tracking_daily RENAME TO time_tracking_daily_old")
+    c.execute('''CREATE TABLE IF NOT EXISTS time_tracking_daily (
+                    user_id INTEGER NOT NULL,
+                    topic_id INTEGER NOT NULL,
+                    day TEXT NOT NULL,  -- YYYY-MM-DD of the session start
+                    time_spent INTEGER NOT NULL DEFAULT 0 CHECK(time_spent >= 0),  -- Seconds summed over the day
+                    sessions INTEGER NOT NULL DEFAULT 0 CHECK(sessions >= 0),
+                    PRIMARY KEY(user_id, day, topic_id),
+                    FOREIGN KEY(user_id) REFERENCES user(user_id) ON DELETE CASCADE,
+                    FOREIGN KEY(topic_id) REFERENCES topic(topic_id) ON DELETE CASCADE
+                ) WITHOUT ROWID''')
+    
     c.execute('''CREATE TABLE IF NOT EXISTS quiz_result (
                     quiz_result_id INTEGER PRIMARY KEY AUTOINCREMENT,
                     user_id INTEGER NOT NULL,
@@ -86,12 +199,294 @@ def init_db():
                     FOREIGN KEY(topic_id) REFERENCES topic(topic_id) ON DELETE CASCADE
                 )''')
     
+    # Normalized tags; topic.tags keeps the text the user typed
+    topic_tag_exists = _table_exists(c, 'topic_tag')
+    c.execute('''CREATE TABLE IF NOT EXISTS tag (
+                    tag_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT UNIQUE NOT NULL COLLATE NOCASE,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )''')
+    
+    c.execute('''CREATE TABLE IF NOT EXISTS topic_tag (
+                    user_id INTEGER NOT NULL,
+                    tag_id INTEGER NOT NULL,
+                    topic_id INTEGER NOT NULL,
+                    PRIMARY KEY(user_id, tag_id, topic_id),  -- Tag filters and per-user facet counts
+                    FOREIGN KEY(user_id) REFERENCES user(user_id) ON DELETE CASCADE,
+                    FOREIGN KEY(tag_id) REFERENCES tag(tag_id) ON DELETE CASCADE,
+                    FOREIGN KEY(topic_id) REFERENCES topic(topic_id) ON DELETE CASCADE
+                ) WITHOUT ROWID''')
+    
+    # Archive tier: completed work moves here so the hot tables track active work (see archive.py)
+    c.execute('''CREATE TABLE IF NOT EXISTS topic_archive (
+                    topic_id INTEGER PRIMARY KEY,
+                    user_id INTEGER NOT NULL,
+                    title TEXT NOT NULL,
+                    description TEXT,
+                    from_date TEXT NOT NULL,
+                    due_date TEXT NOT NULL,
+                    status TEXT,
+                    priority TEXT,
+                    progress INTEGER,
+                    category TEXT,
+                    tags TEXT,
+                    recurrence TEXT,
+                    created_at TIMESTAMP,
+                    updated_at TIMESTAMP,
+                    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY(user_id) REFERENCES user(user_id) ON DELETE CASCADE
+                )''')
+    
+    c.execute('''CREATE TABLE IF NOT EXISTS schedule_archive (
+                    schedule_id INTEGER PRIMARY KEY,
+                    user_id INTEGER NOT NULL,
+                    date TEXT NOT NULL,
+                    time_slot TEXT NOT NULL,
+                    topic_id INTEGER NOT NULL,  -- May point at topic or topic_archive
+                    title TEXT NOT NULL,  -- Topic title at archive time
+                    subtopics TEXT NOT NULL,
+                    reminder TEXT,
+                    is_completed BOOLEAN DEFAULT FALSE,
+                    created_at TIMESTAMP,
+                    updated_at TIMESTAMP,
+                    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY(user_id) REFERENCES user(user_id) ON DELETE CASCADE
+                )''')
+    
+    c.execute('''CREATE TABLE IF NOT EXISTS time_tracking_archive (
+                    time_tracking_id INTEGER PRIMARY KEY,
+                    user_id INTEGER NOT NULL,
+                    topic_id INTEGER NOT NULL,
+                    start_time TEXT NOT NULL,
+                    end_time TEXT NOT NULL,
+                    time_spent INTEGER NOT NULL,
+                    notes TEXT,
+                    created_at TIMESTAMP,
+                    updated_at TIMESTAMP,
+                    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY(user_id) REFERENCES user(user_id) ON DELETE CASCADE
+                )''')
+    
+    c.execute('''CREATE TABLE IF NOT EXISTS time_tracking_daily_archive (
+                    user_id INTEGER NOT NULL,
+                    topic_id INTEGER NOT NULL,  -- Points at topic_archive
+                    day TEXT NOT NULL,
+                    time_spent INTEGER NOT NULL,
+                    sessions INTEGER NOT NULL,
+                    PRIMARY KEY(user_id, day, topic_id),
+                    FOREIGN KEY(user_id) REFERENCES user(user_id) ON DELETE CASCADE
+                ) WITHOUT ROWID''')
+    if daily_needs_rebuild:
+        daily_columns = "user_id, topic_id, day, time_spent, sessions"
+        c.execute(f'''INSERT INTO time_tracking_daily ({daily_columns}) SELECT {daily_columns} FROM time_tracking_daily_old
+                     WHERE topic_id IN (SELECT topic_id FROM topic)''')
+        c.execute(f'''INSERT INTO time_tracking_daily_archive ({daily_columns}) SELECT {daily_columns} FROM time_tracking_daily_old
+                     WHERE topic_id IN (SELECT topic_id FROM topic_archive)''')
+        c.execute("DROP TABLE time_tracking_daily_old")  # Rows of deleted topics go with it
+    
+    c.execute('''CREATE TABLE IF NOT EXISTS quiz_result_archive (
+                    quiz_result_id INTEGER PRIMARY KEY,
+                    user_id INTEGER NOT NULL,
+                    topic_id INTEGER NOT NULL,  -- Points at topic_archive
+                    subtopics TEXT,
+                    num_questions INTEGER NOT NULL,
+                    score INTEGER NOT NULL,
+                    total_questions INTEGER NOT NULL,
+                    timestamp TIMESTAMP,
+                    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY(user_id) REFERENCES user(user_id) ON DELETE CASCADE
+                )''')
+    
     # Create indexes for faster queries
-    c.execute('''CREATE INDEX IF NOT EXISTS idx_topic_user_id ON topic(user_id)''')
-    c.execute('''CREATE INDEX IF NOT EXISTS idx_slot_user_id ON slot(user_id)''')
-    c.execute('''CREATE INDEX IF NOT EXISTS idx_schedule_user_id ON schedule(user_id)''')
+    # Shaped after the statements in queries.py; query_plans.py checks that each one is used
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_topic_user_status ON topic(user_id, status)''')  # Open-task lists
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_topic_user_due ON topic(user_id, due_date)''')  # Keyset pagination in display_tasks
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_slot_topic_date ON slot(topic_id, date, time_slot)''')  # Covers slot lookups per task
+    # Covers per-task completion counts (GROUP BY topic_id) and the progress roll-up triggers
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_schedule_user_topic_completed ON schedule(user_id, topic_id, is_completed)''')
     c.execute('''CREATE INDEX IF NOT EXISTS idx_time_tracking_user_id ON time_tracking(user_id)''')
-    c.execute('''CREATE INDEX IF NOT EXISTS idx_quiz_result_user_id ON quiz_result(user_id)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_quiz_result_user_topic ON quiz_result(user_id, topic_id)''')  # Per-topic quiz stats
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_topic_tag_topic ON topic_tag(topic_id, tag_id)''')
+    # Child-side indexes so ON DELETE CASCADE doesn't scan the child tables
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_schedule_topic_id ON schedule(topic_id)''')
+    # Sessions in a slot; ON DELETE SET NULL. Partial, so ANALYZE does not count the unbooked (NULL) rows as one huge key
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_schedule_slot_booked ON schedule(slot_id) WHERE slot_id IS NOT NULL''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_time_tracking_topic_id ON time_tracking(topic_id)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_time_tracking_daily_topic_id ON time_tracking_daily(topic_id)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_quiz_result_topic_id ON quiz_result(topic_id)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_topic_archive_user_id ON topic_archive(user_id)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_schedule_archive_user_topic ON schedule_archive(user_id, topic_id)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_time_tracking_archive_user_id ON time_tracking_archive(user_id)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_quiz_result_archive_user_topic ON quiz_result_archive(user_id, topic_id)''')
+    
+    # Superseded by the composite indexes above (slot(user_id, ...) is served by UNIQUE(user_id, date, time_slot));
+    # schedule(user_id, subtopics) only served the old completion by subtopic name
+    for index in ('idx_topic_user_id', 'idx_slot_user_id', 'idx_slot_topic_id', 'idx_schedule_user_id', 'idx_quiz_result_user_id',
+                  'idx_schedule_user_subtopics', 'idx_schedule_slot'):
+        c.execute(f"DROP INDEX IF EXISTS {index}")
+    
+    c.execute('''CREATE TABLE IF NOT EXISTS maintenance_log (
+                    maintenance_log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ran_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    orphans_deleted INTEGER NOT NULL DEFAULT 0,
+                    pages_reclaimed INTEGER NOT NULL DEFAULT 0,
+                    duration_ms INTEGER NOT NULL DEFAULT 0
+                )''')
+    
+    # Bearer tokens for the HTTP API; only a SHA-256 of the token is stored
+    c.execute('''CREATE TABLE IF NOT EXISTS api_token (
+                    token_hash TEXT PRIMARY KEY,
+                    user_id INTEGER NOT NULL,
+                    name TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY(user_id) REFERENCES user(user_id) ON DELETE CASCADE
+                ) WITHOUT ROWID''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_api_token_user_id ON api_token(user_id)''')
+    
+    # Reminders: only pending ones are indexed, so the index stays as small as the reminder heap
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_schedule_next_fire ON schedule(next_fire_at) WHERE next_fire_at IS NOT NULL''')
+    c.execute('''CREATE TABLE IF NOT EXISTS reminder_inbox (
+                    reminder_inbox_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    schedule_id INTEGER,
+                    message TEXT NOT NULL,
+                    fired_at TIMESTAMP NOT NULL,
+                    read_at TIMESTAMP,
+                    FOREIGN KEY(user_id) REFERENCES user(user_id) ON DELETE CASCADE,
+                    FOREIGN KEY(schedule_id) REFERENCES schedule(schedule_id) ON DELETE SET NULL
+                )''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_reminder_inbox_unread ON reminder_inbox(user_id) WHERE read_at IS NULL''')
+
+    # Recurring slot patterns; their slot rows are only created up to a rolling horizon
+    c.execute('''CREATE TABLE IF NOT EXISTS slot_rule (
+                    slot_rule_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    topic_id INTEGER NOT NULL,
+                    first_date TEXT NOT NULL,
+                    until_date TEXT,  -- Last possible date (inclusive); NULL repeats forever
+                    frequency TEXT NOT NULL CHECK(frequency IN ('Daily', 'Weekly', 'Monthly')),
+                    interval INTEGER NOT NULL DEFAULT 1 CHECK(interval >= 1),
+                    start_time TEXT NOT NULL,  -- 'HH:MM'
+                    end_time TEXT NOT NULL,
+                    slot_minutes INTEGER NOT NULL CHECK(slot_minutes > 0),
+                    materialized_until TEXT NOT NULL,  -- Slots exist for occurrences up to this date
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY(user_id) REFERENCES user(user_id) ON DELETE CASCADE,
+                    FOREIGN KEY(topic_id) REFERENCES topic(topic_id) ON DELETE CASCADE
+                )''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_slot_rule_materialized ON slot_rule(materialized_until)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_slot_rule_topic ON slot_rule(topic_id)''')  # ON DELETE CASCADE lookups
+
+    # Quiz question banks, shared by every schedule row with the same task title and subtopic
+    c.execute('''CREATE TABLE IF NOT EXISTS quiz_bank (
+                    quiz_bank_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bank_key TEXT UNIQUE NOT NULL,  -- SHA-1 of the normalised title and subtopic
+                    title TEXT NOT NULL,
+                    subtopic TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending' CHECK(status IN ('pending', 'ready', 'failed')),
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )''')
+    c.execute('''CREATE TABLE IF NOT EXISTS quiz_question (
+                    quiz_question_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    quiz_bank_id INTEGER NOT NULL,
+                    question TEXT NOT NULL,
+                    choices TEXT NOT NULL,  -- JSON array of the answer options
+                    answer INTEGER NOT NULL,  -- Index of the correct choice
+                    question_hash TEXT NOT NULL,  -- SHA-1 of the normalised question; repeats are dropped
+                    UNIQUE(quiz_bank_id, question_hash),
+                    FOREIGN KEY(quiz_bank_id) REFERENCES quiz_bank(quiz_bank_id) ON DELETE CASCADE
+                )''')
+
+    if not topic_tag_exists:
+        # Split the tag strings of existing topics
+        migrate_topic_tags(conn)
+    
+    # Full-text search over topics and scheduled subtopics.
+    # rowid encodes the source row: topic_id * 2 for topics, schedule_id * 2 + 1 for schedule rows.
+    # 'owner' holds a per-user token (e.g. 'u42') so MATCH narrows to one user's documents.
+    search_index_exists = _table_exists(c, 'search_index')
+    c.execute('''CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+                    owner, title, body, tags,
+                    tokenize = 'unicode61 remove_diacritics 2',
+                    prefix = '2 3'
+                )''')
+    
+    c.execute('''CREATE TRIGGER IF NOT EXISTS trg_topic_search_insert AFTER INSERT ON topic BEGIN
+                    INSERT INTO search_index (rowid, owner, title, body, tags)
+                    VALUES (new.topic_id * 2, 'u' || new.user_id, new.title, new.description, new.tags);
+                END''')
+    c.execute('''CREATE TRIGGER IF NOT EXISTS trg_topic_search_update AFTER UPDATE OF title, description, tags ON topic BEGIN
+                    UPDATE search_index SET title = new.title, body = new.description, tags = new.tags
+                    WHERE rowid = new.topic_id * 2;
+                END''')
+    c.execute('''CREATE TRIGGER IF NOT EXISTS trg_topic_search_delete AFTER DELETE ON topic BEGIN
+                    DELETE FROM search_index WHERE rowid = old.topic_id * 2;
+                END''')
+    c.execute('''CREATE TRIGGER IF NOT EXISTS trg_schedule_search_insert AFTER INSERT ON schedule BEGIN
+                    INSERT INTO search_index (rowid, owner, title)
+                    VALUES (new.schedule_id * 2 + 1, 'u' || new.user_id, new.subtopics);
+                END''')
+    c.execute('''CREATE TRIGGER IF NOT EXISTS trg_schedule_search_update AFTER UPDATE OF subtopics ON schedule BEGIN
+                    UPDATE search_index SET title = new.subtopics WHERE rowid = new.schedule_id * 2 + 1;
+                END''')
+    c.execute('''CREATE TRIGGER IF NOT EXISTS trg_schedule_search_delete AFTER DELETE ON schedule BEGIN
+                    DELETE FROM search_index WHERE rowid = old.schedule_id * 2 + 1;
+                END''')
+    
+    # topic.progress/status follow the completion of the topic's schedule rows, archived ones included.
+    # Each row change moves the topic's counters by one, so bulk inserts stay linear.
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_schedule_progress_insert AFTER INSERT ON schedule BEGIN
+                    {_count_sessions("new", 1)};
+                END''')
+    if not _table_exists(c, 'trg_schedule_progress_move'):
+        c.execute("DROP TRIGGER IF EXISTS trg_schedule_progress_update")  # Created before moves were counted
+    c.execute('''CREATE TRIGGER IF NOT EXISTS trg_schedule_progress_update AFTER UPDATE OF is_completed ON schedule
+                 WHEN old.topic_id IS new.topic_id AND (old.is_completed IS TRUE) IS NOT (new.is_completed IS TRUE) BEGIN
+                    UPDATE topic SET sessions_done = sessions_done + (new.is_completed IS TRUE) - (old.is_completed IS TRUE)
+                    WHERE topic_id = new.topic_id;
+                END''')
+    # A row moved to another task leaves one topic's counters and joins the other's
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_schedule_progress_move AFTER UPDATE OF topic_id ON schedule
+                 WHEN old.topic_id IS NOT new.topic_id BEGIN
+                    {_count_sessions("old", -1)};
+                    {_count_sessions("new", 1)};
+                END''')
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_schedule_progress_delete AFTER DELETE ON schedule BEGIN
+                    {_count_sessions("old", -1)};
+                END''')
+    # Archiving moves rows from schedule to schedule_archive; they keep counting
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_schedule_archive_progress_insert AFTER INSERT ON schedule_archive BEGIN
+                    {_count_sessions("new", 1)};
+                END''')
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_schedule_archive_progress_delete AFTER DELETE ON schedule_archive BEGIN
+                    {_count_sessions("old", -1)};
+                END''')
+    # Status is only derived for topics with sessions whose status the user has not set.
+    # Unchanged topics keep their updated_at, which archiving goes by.
+    progress = "100 * new.sessions_done / new.sessions_total"
+    status = """CASE
+                    WHEN new.status_pinned THEN new.status
+                    WHEN new.sessions_done = new.sessions_total THEN 'Completed'
+                    WHEN new.sessions_done > 0 THEN 'In Progress'
+                    WHEN new.status IN ('Completed', 'In Progress') THEN 'Not Started'
+                    ELSE new.status
+                END"""
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_topic_progress AFTER UPDATE OF sessions_total, sessions_done ON topic
+                 WHEN new.sessions_total > 0 BEGIN
+                    UPDATE topic SET progress = {progress}, status = {status}, updated_at = CURRENT_TIMESTAMP
+                    WHERE topic_id = new.topic_id AND (progress IS NOT {progress} OR status IS NOT {status});
+                END''')
+    if not session_counters_exist:
+        # Count the schedules of existing topics; trg_topic_progress brings their progress in line
+        c.execute(_recount_sessions())
+
+    if not search_index_exists:
+        # Index rows written before search existed
+        c.execute('''INSERT INTO search_index (rowid, owner, title, body, tags)
+                     SELECT topic_id * 2, 'u' || user_id, title, description, tags FROM topic''')
+        c.execute('''INSERT INTO search_index (rowid, owner, title)
+                     SELECT schedule_id * 2 + 1, 'u' || user_id, subtopics FROM schedule''')
     
     conn.commit()
     return conn
\ No newline at end of file
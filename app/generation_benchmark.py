@@ -0,0 +1,149 @@
+"""Benchmark schedule generation end to end against recorded Groq/DuckDuckGo traffic, with no network.
+
+    SKILLFORGE_REPLAY=record SKILLFORGE_FIXTURE_DIR=fixtures/demo streamlit run app/skillforgeAi.py   # generate a few schedules
+    python app/generation_benchmark.py --db bench.db --fixtures fixtures/demo --runs 50 [--latency 0] [--failure-rate 0.1]
+
+Each run picks an open task of a random seeded user and runs services.generate_schedule with replaying
+clients, then saves the result through the writer. Its time is split into search, LLM, parsing,
+the rest of generation (task lookup, free slots, prompt) and the DB write; the saved rows are deleted
+again afterwards. Injected failures are counted per kind and the run goes on.
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import date, timedelta
+import queries
+import replay
+import services
+from benchmark import _percentile
+from db import connect_readonly, transaction
+from writer import get_writer
+
+PHASES = ["search", "llm", "parse", "prepare", "db_write", "total"]
+
+def _timed(client, spent, phase):
+    """Wrap a client so the time of each call is added to spent[phase]."""
+    def call(request):
+        started = time.perf_counter()
+        try:
+            return client(request)
+        finally:
+            spent[phase] += time.perf_counter() - started
+    return call
+
+def _sample_tasks(conn, rng, runs):
+    """(user_id, topic_id, category) of `runs` random open tasks."""
+    max_topic = conn.execute("SELECT MAX(topic_id) FROM topic").fetchone()[0] or 0
+    tasks = []
+    for _ in range(runs * 20):
+        if len(tasks) == runs or not max_topic:
+            break
+        row = conn.execute(
+            f"SELECT user_id, topic_id, category FROM topic WHERE topic_id >= ? AND status IN {queries.OPEN_STATUSES} LIMIT 1",
+            (rng.randint(1, max_topic),)
+        ).fetchone()
+        if row:
+            tasks.append(row)
+    return tasks
+
+def run_benchmark(db_path, fixture_dir, runs=50, profile=replay.ReplayProfile(latency=0.0), seed=7):
+    """Generate and save `runs` schedules from the fixtures; returns the report dict."""
+    completion_path, search_path = replay.fixture_paths(fixture_dir)
+    complete, search = replay.replaying(completion_path, profile), replay.replaying(search_path, profile)
+    conn = connect_readonly(db_path)
+    writer = get_writer(db_path)
+    timings = {phase: [] for phase in PHASES}
+    failures, items_saved, saved_ids = {}, 0, []
+
+    for user_id, topic_id, category in _sample_tasks(conn, random.Random(seed), runs):
+        spent = dict.fromkeys(PHASES, 0.0)
+        replies = []
+
+        def answer(prompt):
+            replies.append(complete(prompt))
+            return replies[-1]
+
+        started = time.perf_counter()
+        try:
+            items = services.generate_schedule(
+                conn, user_id, topic_id, date.today(), date.today() + timedelta(days=30), category,
+                complete=_timed(answer, spent, "llm"),
+                search=_timed(search, spent, "search"),
+            )
+            generated = time.perf_counter()
+            # Parsing happened inside generate_schedule; it is pure, so time it again on the same reply
+            services.parse_schedule(replies[-1])
+            spent["parse"] = time.perf_counter() - generated
+            spent["prepare"] = generated - started - spent["search"] - spent["llm"] - spent["parse"]
+            if not items:
+                raise ValueError("The reply had no schedule rows.")
+            written = time.perf_counter()
+            saved_ids += writer.write(_save, user_id, topic_id, items)
+            spent["db_write"] = time.perf_counter() - written
+            items_saved += len(items)
+        except Exception as e:
+            kind = type(e).__name__
+            failures[kind] = failures.get(kind, 0) + 1
+            continue
+        spent["total"] = time.perf_counter() - started
+        for phase in PHASES:
+            timings[phase].append(spent[phase] * 1000)
+    conn.close()
+    writer.write(_undo, saved_ids)
+
+    succeeded = len(timings["total"])
+    return {
+        "meta": {"runs": runs, "succeeded": succeeded, "items_saved": items_saved, "profile": profile._asdict()},
+        "failures": failures,
+        "results": {
+            phase: {
+                "p50_ms": round(_percentile(values, 50), 2),
+                "p95_ms": round(_percentile(values, 95), 2),
+                "mean_ms": round(statistics.fmean(values), 2),
+            }
+            for phase, values in timings.items() if values
+        },
+    }
+
+def _save(conn, user_id, topic_id, items):
+    """save_schedule, returning the new schedule_ids so the run can be undone."""
+    last = conn.execute("SELECT COALESCE(MAX(schedule_id), 0) FROM schedule").fetchone()[0]
+    services.save_schedule(conn, user_id, topic_id, date.today(), items)
+    return [row[0] for row in conn.execute("SELECT schedule_id FROM schedule WHERE schedule_id > ?", (last,))]
+
+def _undo(conn, schedule_ids):
+    with transaction(conn):
+        conn.execute("DELETE FROM schedule WHERE schedule_id IN (SELECT value FROM json_each(?))", (json.dumps(schedule_ids),))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline benchmark of schedule generation against recorded fixtures.")
+    parser.add_argument("--db", default="bench.db")
+    parser.add_argument("--fixtures", default=replay.FIXTURE_DIR, help="Directory with completion.jsonl and search.jsonl")
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--latency", type=float, help="Seconds per LLM/search call; default replays the recorded times")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplies the latency")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random +/- fraction of the latency")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--failure", choices=replay.FAILURES, default="error")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds an injected timeout takes")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Previous JSON report to compare against")
+    args = parser.parse_args()
+
+    profile = replay.ReplayProfile(args.latency, args.scale, args.jitter, args.failure_rate, args.failure, args.timeout, args.seed)
+    report = run_benchmark(args.db, args.fixtures, args.runs, profile, args.seed)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        for phase, result in report["results"].items():
+            before = old["results"].get(phase, {})
+            print(f"{phase:<9} p50 {before.get('p50_ms', '-'):>9} -> {result['p50_ms']:>9} ms   "
+                  f"p95 {before.get('p95_ms', '-'):>9} -> {result['p95_ms']:>9} ms")
+    else:
+        print(json.dumps(report, indent=2))
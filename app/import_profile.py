@@ -0,0 +1,91 @@
+"""Profile cold-start imports with `python -X importtime` and write a JSON report that can be diffed.
+
+    python app/import_profile.py --out startup.json [--compare previous.json]
+
+"landing" runs skillforgeAi.py in Streamlit's bare mode, which renders the landing page; each
+"page:<name>" target imports that page's module on top of it, i.e. the cost of first navigation.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pages import PAGES
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+LANDING = f"import runpy, sys; sys.path.insert(0, {APP_DIR!r}); runpy.run_path({os.path.join(APP_DIR, 'skillforgeAi.py')!r})"
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+def parse_importtime(stderr):
+    """Return (total_us, {top_level_package: cumulative_us}) from -X importtime output."""
+    packages = {}
+    for match in IMPORT_LINE.finditer(stderr):
+        _, cumulative, indent, name = match.groups()
+        if len(indent) == 1:  # Imported by the profiled code itself, not by another module
+            top = name.split(".")[0]
+            packages[top] = packages.get(top, 0) + int(cumulative)
+    return sum(packages.values()), packages
+
+def profile(code, runs=5):
+    """Run `code` in fresh interpreters and return median wall/import times and the slowest packages."""
+    walls, imports, packages = [], [], {}
+    with tempfile.TemporaryDirectory() as cwd:  # The app creates scheduler.db in its working directory
+        for _ in range(runs):
+            started = time.perf_counter()
+            result = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", code],
+                cwd=cwd, capture_output=True, text=True, env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+            )
+            walls.append((time.perf_counter() - started) * 1000)
+            if result.returncode:
+                raise RuntimeError(result.stderr.strip().splitlines()[-1])
+            total, packages = parse_importtime(result.stderr)
+            imports.append(total / 1000)
+    return {
+        "wall_ms": round(statistics.median(walls), 1),
+        "import_ms": round(statistics.median(imports), 1),
+        "top_imports_ms": {
+            name: round(us / 1000, 1) for name, us in sorted(packages.items(), key=lambda item: -item[1])[:10]
+        },
+    }
+
+def run_profile(runs=5):
+    targets = {"landing": LANDING}
+    for name, (module, _, _) in PAGES.items():
+        targets[f"page:{name}"] = f"{LANDING}; import {module}"
+    return {
+        "meta": {"python": sys.version.split()[0], "runs": runs},
+        "results": {target: profile(code, runs) for target, code in targets.items()},
+    }
+
+def compare_reports(old, new):
+    """Format a wall/import time comparison of two reports."""
+    lines = [f"{'target':<26} {'wall old':>9} {'wall new':>9} {'import old':>11} {'import new':>11}"]
+    for target, result in new["results"].items():
+        before = old["results"].get(target, {})
+        lines.append(
+            f"{target:<26} {before.get('wall_ms', '-'):>9} {result['wall_ms']:>9} "
+            f"{before.get('import_ms', '-'):>11} {result['import_ms']:>11}"
+        )
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile SkillForgeAI cold-start imports.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--out", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Previous JSON report to compare against")
+    args = parser.parse_args()
+
+    report = run_profile(args.runs)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            print(compare_reports(json.load(f), report))
+    else:
+        print(json.dumps(report["results"], indent=2))
@@ -0,0 +1,125 @@
+"""Measure login throughput and latency through auth's hashing pool.
+
+    python app/login_load.py --db bench.db --users 50 --logins 200 --concurrency 1,4,16 [--rounds 10] [--out login.json]
+
+Temporary users are created with legacy `salt:sha256` records. Each concurrency level runs three
+phases against them: `legacy` (first logins, which verify and rehash), `current` (logins against the
+new hashes) and `failed` (wrong passwords). The users are deleted afterwards.
+"""
+import argparse
+import hashlib
+import json
+import secrets
+import statistics
+import threading
+import time
+import uuid
+import auth
+from benchmark import _percentile
+from db import connect, connect_readonly
+
+PASSWORD = "load-test"
+PHASES = ("legacy", "current", "failed")
+
+def _legacy_hash(password):
+    salt = secrets.token_hex(16)
+    return f"{salt}:{hashlib.sha256((salt + password).encode('utf-8')).hexdigest()}"
+
+def create_users(db_path, prefix, count):
+    """Insert `count` users with legacy password records; returns their names."""
+    names = [f"{prefix}_{index}" for index in range(count)]
+    conn = connect(db_path)
+    conn.executemany("INSERT INTO user (username, password) VALUES (?, ?)", [(name, _legacy_hash(PASSWORD)) for name in names])
+    conn.commit()
+    conn.close()
+    return names
+
+def run_phase(db_path, names, logins, concurrency, password):
+    """Log in `logins` times from `concurrency` threads, cycling through `names`; returns the result dict."""
+    timings, outcomes = [], {}
+    lock = threading.Lock()
+    remaining = iter(range(logins))
+
+    def client_loop():
+        conn = connect_readonly(db_path)
+        while True:
+            with lock:
+                index = next(remaining, None)
+            if index is None:
+                break
+            started = time.perf_counter()
+            try:
+                outcome = "ok" if auth.authenticate(conn, names[index % len(names)], password, db_path) else "rejected"
+            except auth.AuthBusy:
+                outcome = "busy"
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with lock:
+                timings.append(elapsed_ms)
+                outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        conn.close()
+
+    threads = [threading.Thread(target=client_loop) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - started
+    return {
+        "logins": logins,
+        "outcomes": outcomes,
+        "logins_per_second": round(logins / duration, 1),
+        "p50_ms": round(_percentile(timings, 50), 1),
+        "p95_ms": round(_percentile(timings, 95), 1),
+        "mean_ms": round(statistics.fmean(timings), 1),
+    }
+
+def run_load(db_path, users=50, logins=200, concurrency=4):
+    """Run the three phases at one concurrency level on fresh users; returns the report dict."""
+    prefix = f"login_load_{uuid.uuid4().hex[:8]}"
+    names = create_users(db_path, prefix, users)
+    try:
+        # Every user's first login is the rehash; the rest of the phase already sees current hashes
+        results = {"legacy": run_phase(db_path, names, users, concurrency, PASSWORD)}
+        results["current"] = run_phase(db_path, names, logins, concurrency, PASSWORD)
+        results["failed"] = run_phase(db_path, names, logins, concurrency, "wrong-" + PASSWORD)
+    finally:
+        conn = connect(db_path)
+        conn.execute("DELETE FROM user WHERE username LIKE ?", (f"{prefix}%",))
+        conn.commit()
+        conn.close()
+    return {
+        "meta": {"users": users, "concurrency": concurrency, "scheme": auth.PASSWORD_SCHEME,
+                 "bcrypt_rounds": auth.BCRYPT_ROUNDS, "scrypt_n": auth.SCRYPT_N, "workers": auth.AUTH_WORKERS},
+        "results": results,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Login throughput benchmark for SkillForgeAI's password hashing.")
+    parser.add_argument("--db", default="bench.db")
+    parser.add_argument("--users", type=int, default=50, help="Temporary users to create (and rehash)")
+    parser.add_argument("--logins", type=int, default=200, help="Logins per phase after the rehash phase")
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma-separated numbers of simultaneous clients")
+    parser.add_argument("--scheme", choices=["bcrypt", "scrypt"], help="Overrides SKILLFORGE_PASSWORD_SCHEME")
+    parser.add_argument("--rounds", type=int, help="bcrypt cost; overrides SKILLFORGE_BCRYPT_ROUNDS")
+    parser.add_argument("--scrypt-n", type=int, help="scrypt cost; overrides SKILLFORGE_SCRYPT_N")
+    parser.add_argument("--workers", type=int, help="Hashing pool size; overrides SKILLFORGE_AUTH_WORKERS")
+    parser.add_argument("--out", help="Write the JSON reports to this file")
+    args = parser.parse_args()
+
+    # The pool and cost settings are read when first used, so overriding the module settings is enough
+    auth.PASSWORD_SCHEME = args.scheme or auth.PASSWORD_SCHEME
+    auth.BCRYPT_ROUNDS = args.rounds or auth.BCRYPT_ROUNDS
+    auth.SCRYPT_N = args.scrypt_n or auth.SCRYPT_N
+    auth.AUTH_WORKERS = args.workers or auth.AUTH_WORKERS
+
+    reports = [run_load(args.db, args.users, args.logins, int(level)) for level in args.concurrency.split(",")]
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(reports, f, indent=2)
+    for report in reports:
+        print(f"concurrency {report['meta']['concurrency']}:")
+        for phase in PHASES:
+            result = report["results"][phase]
+            print(f"  {phase:<8} {result['logins_per_second']:>8} logins/s  p50 {result['p50_ms']:>8} ms  "
+                  f"p95 {result['p95_ms']:>8} ms  {result['outcomes']}")
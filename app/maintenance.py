@@ -0,0 +1,182 @@
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from db import connect, connect_readonly, init_db, transaction
+from archive import archive_completed, ARCHIVE_AFTER_DAYS
+from writer import get_writer
+
+MAINTENANCE_INTERVAL_HOURS = float(os.getenv("SKILLFORGE_MAINTENANCE_HOURS", "24"))
+
+_maintenance_lock = threading.Lock()
+_last_check = 0.0
+CHECK_EVERY_SECONDS = 600  # How often a process looks at maintenance_log
+
+log = logging.getLogger("skillforge.maintenance")
+
+def _foreign_keys(conn):
+    """Yield (table, column, parent_table, parent_column, on_delete) for every declared foreign key."""
+    tables = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+    )]
+    for table in tables:
+        for fk in conn.execute(f"PRAGMA foreign_key_list({table})"):
+            yield table, fk[3], fk[2], fk[4], fk[6]
+
+def purge_orphans(conn):
+    """Clean up rows whose parent row no longer exists (left behind while foreign keys were off).
+
+    Does what the key's ON DELETE action would have done: rows of CASCADE keys are deleted, SET NULL
+    keys are cleared (a session that lost its slot stays, unbooked). Keys with other actions are left
+    alone. Returns {"deleted": {table: rows}, "set_null": {"table.column": rows}}.
+    """
+    report = {"deleted": {}, "set_null": {}}
+    foreign_keys = [fk for fk in _foreign_keys(conn) if fk[4] in ("CASCADE", "SET NULL")]
+    with transaction(conn):
+        # Repeat until stable: purging orphaned topics can orphan their slots, schedules, ...
+        while True:
+            pass_changed = 0
+            for table, column, parent, parent_column, on_delete in foreign_keys:
+                orphaned = f"""
+                    WHERE {column} IS NOT NULL
+                      AND NOT EXISTS (SELECT 1 FROM {parent} p WHERE p.{parent_column} = {table}.{column})
+                """
+                if on_delete == "CASCADE":
+                    count = conn.execute(f"DELETE FROM {table} {orphaned}").rowcount
+                    counts, name = report["deleted"], table
+                else:
+                    count = conn.execute(f"UPDATE {table} SET {column} = NULL {orphaned}").rowcount
+                    counts, name = report["set_null"], f"{table}.{column}"
+                if count:
+                    counts[name] = counts.get(name, 0) + count
+                    pass_changed += count
+            if not pass_changed:
+                break
+    return report
+
+def _refresh_statistics(conn):
+    # Full ANALYZE once; afterwards PRAGMA optimize only re-analyzes tables that changed enough
+    has_stats = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone()
+    conn.execute("PRAGMA optimize" if has_stats else "ANALYZE")
+
+def _reclaim_pages(conn):
+    """Return free pages to the filesystem; returns (auto_vacuum, free_pages, pages_before, pages_after)."""
+    pages_before = conn.execute("PRAGMA page_count").fetchone()[0]
+    auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    if auto_vacuum == 2:
+        # sqlite3 steps the pragma once, which frees a single page; repeat until the freelist is empty
+        while conn.execute("PRAGMA freelist_count").fetchone()[0]:
+            conn.execute("PRAGMA incremental_vacuum")
+    return auto_vacuum, free_pages, pages_before, conn.execute("PRAGMA page_count").fetchone()[0]
+
+def _log_run(conn, pages_reclaimed, duration_ms):
+    conn.execute(
+        "INSERT INTO maintenance_log (orphans_deleted, pages_reclaimed, duration_ms) VALUES (0, ?, ?)",
+        (pages_reclaimed, duration_ms)
+    )
+
+def convert_to_incremental_vacuum(db_path=None):
+    """Switch a database created without incremental auto-vacuum over with a one-off VACUUM.
+
+    VACUUM cannot run inside the writer's transactions, so this uses its own connection: run it from
+    the command line while the app and API are stopped.
+    """
+    conn = connect(db_path)
+    try:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+def run_maintenance(db_path=None, archive_after_days=ARCHIVE_AFTER_DAYS):
+    """Archive old completed work, create recurring slots that came within the horizon,
+    refresh planner statistics and return free pages to the filesystem.
+
+    Every step is a separate job on the database's writer thread, so the app's writes queue between
+    steps instead of failing with 'database is locked'. Orphans cannot appear while foreign keys are
+    enforced, so purging them is left to the one-off `--purge-orphans`. Returns a report dict.
+    """
+    from services.slots import extend_slot_rules  # Loads pandas; keep it off the app's startup path
+
+    started = time.perf_counter()
+    writer = get_writer(db_path)
+
+    def run(fn, *args):
+        # Maintenance steps may outlast the writer's usual wait, so wait for them without a timeout
+        return writer.submit(fn, *args).result()
+
+    archived = run(archive_completed, archive_after_days)
+    slots_created = run(extend_slot_rules)
+    run(_refresh_statistics)
+    auto_vacuum, free_pages, pages_before, pages_after = run(_reclaim_pages)
+
+    page_size = run(lambda conn: conn.execute("PRAGMA page_size").fetchone()[0])
+    report = {
+        "archived": archived,
+        "recurring_slots_created": slots_created,
+        "free_pages_before": free_pages,
+        "pages_reclaimed": pages_before - pages_after,
+        "bytes_reclaimed": (pages_before - pages_after) * page_size,
+        "page_count": pages_after,
+        "auto_vacuum": {0: "none", 1: "full", 2: "incremental"}[auto_vacuum],
+        "duration_ms": int((time.perf_counter() - started) * 1000),
+    }
+    run(_log_run, report["pages_reclaimed"], report["duration_ms"])
+    return report
+
+def maintenance_due(conn, interval_hours=MAINTENANCE_INTERVAL_HOURS):
+    """Check the maintenance log for a run within the last `interval_hours`."""
+    row = conn.execute(
+        "SELECT 1 FROM maintenance_log WHERE ran_at >= datetime('now', ?) LIMIT 1",
+        (f"-{interval_hours} hours",)
+    ).fetchone()
+    return row is None
+
+def start_background_maintenance(db_path=None, interval_hours=MAINTENANCE_INTERVAL_HOURS):
+    """Run maintenance from a daemon thread, through the writer, if it is due.
+
+    Cheap to call on every rerun; at most one run happens per process at a time.
+    """
+    global _last_check
+    if _last_check and time.monotonic() - _last_check < CHECK_EVERY_SECONDS:
+        return
+    if not _maintenance_lock.acquire(blocking=False):
+        return
+    _last_check = time.monotonic()
+
+    def worker():
+        try:
+            conn = connect_readonly(db_path)
+            try:
+                due = maintenance_due(conn, interval_hours)
+            finally:
+                conn.close()
+            if due:
+                run_maintenance(db_path)
+        except Exception:
+            log.exception("Maintenance failed")
+        finally:
+            _maintenance_lock.release()
+
+    threading.Thread(target=worker, name="db-maintenance", daemon=True).start()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run database maintenance for SkillForgeAI.")
+    parser.add_argument("--db", default="scheduler.db", help="Path to the SQLite database")
+    parser.add_argument("--purge-orphans", action="store_true", help="Only clean up orphaned rows (one-off, e.g. after importing an old database)")
+    parser.add_argument("--archive-days", type=int, default=ARCHIVE_AFTER_DAYS, help="Archive completed work older than this many days")
+    parser.add_argument("--convert", action="store_true", help="Enable incremental auto-vacuum with a one-off VACUUM")
+    args = parser.parse_args()
+
+    init_db(args.db).close()
+    if args.convert:
+        convert_to_incremental_vacuum(args.db)
+    if args.purge_orphans:
+        result = get_writer(args.db).submit(purge_orphans).result()
+    else:
+        result = run_maintenance(args.db, archive_after_days=args.archive_days)
+    print(json.dumps(result, indent=2))
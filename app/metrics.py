@@ -0,0 +1,220 @@
+"""Process-wide counters and histograms exported in the Prometheus text format.
+
+Export with either (or both):
+    SKILLFORGE_METRICS_PORT=9464            # serves http://127.0.0.1:9464/metrics
+    SKILLFORGE_METRICS_TEXTFILE=/var/lib/node_exporter/textfile/skillforge.prom
+"""
+import functools
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_PORT = os.getenv("SKILLFORGE_METRICS_PORT", "")
+METRICS_TEXTFILE = os.getenv("SKILLFORGE_METRICS_TEXTFILE", "")
+TEXTFILE_INTERVAL_SECONDS = 15
+
+log = logging.getLogger("skillforge.metrics")
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+EXTERNAL_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+_registry = []
+_registry_lock = threading.Lock()
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+def _format_value(value):
+    return repr(float(value)) if value != float("inf") else "+Inf"
+
+class Counter:
+    """Monotonic counter, optionally split by labels."""
+
+    kind = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        with _registry_lock:
+            _registry.append(self)
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        with self._lock:
+            values = dict(self._values)
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in values.items()]
+
+class Histogram:
+    """Cumulative-bucket histogram, optionally split by labels."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}  # {label_values: [bucket_counts..., +Inf count, sum]}
+        self._lock = threading.Lock()
+        with _registry_lock:
+            _registry.append(self)
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def render(self):
+        with self._lock:
+            values = {key: list(counts) for key, counts in self._values.items()}
+        lines = []
+        for key, counts in values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', _format_value(bound))])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(counts[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+def render():
+    """Return every registered metric in the Prometheus text exposition format."""
+    with _registry_lock:
+        metrics = list(_registry)
+    lines = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+# Application metrics
+RERUN_SECONDS = Histogram("skillforge_rerun_seconds", "Wall time of a full Streamlit script run.", ["page"])
+PAGE_RENDER_SECONDS = Histogram("skillforge_page_render_seconds", "Time spent rendering a page function.", ["page", "outcome"])
+LLM_REQUEST_SECONDS = Histogram(
+    "skillforge_llm_request_seconds", "Latency of LLM completion calls.", ["provider", "model", "outcome"], EXTERNAL_BUCKETS
+)
+LLM_TOKENS = Counter("skillforge_llm_tokens_total", "Tokens used by LLM calls.", ["provider", "model", "kind"])
+SEARCH_REQUEST_SECONDS = Histogram(
+    "skillforge_search_request_seconds", "Latency of web search calls.", ["provider", "outcome"], EXTERNAL_BUCKETS
+)
+API_REQUEST_SECONDS = Histogram("skillforge_api_request_seconds", "Latency of HTTP API requests.", ["route", "status"])
+WRITE_QUEUE_SECONDS = Histogram("skillforge_write_queue_seconds", "Time a write job waited for the writer thread.")
+WRITE_COMMIT_SECONDS = Histogram("skillforge_write_commit_seconds", "Time to run and commit one group of write jobs.")
+WRITE_GROUP_JOBS = Histogram("skillforge_write_group_jobs", "Write jobs committed together.", buckets=(1, 2, 4, 8, 16, 32, 64))
+QUIZ_BANKS_GENERATED = Counter("skillforge_quiz_banks_generated_total", "Quiz banks generated in the background.", ["outcome"])
+REMINDERS_FIRED = Counter("skillforge_reminders_fired_total", "Reminders handed to a delivery sink.", ["sink", "outcome"])
+LOGINS = Counter("skillforge_logins_total", "Password logins by outcome (ok, rehashed, failed).", ["outcome"])
+LOGIN_SECONDS = Histogram("skillforge_login_seconds", "Time to check a password login, including queueing for the hash pool.")
+
+@contextmanager
+def timed(histogram, **labels):
+    """Observe the block's duration; `outcome` is ok, error, or interrupted (st.rerun/st.stop)."""
+    outcome = "interrupted"
+    started = time.perf_counter()
+    try:
+        yield
+        outcome = "ok"
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        if "outcome" in histogram.labelnames:
+            labels["outcome"] = outcome
+        histogram.observe(time.perf_counter() - started, **labels)
+
+def track_page(page):
+    """Decorator timing a page function into skillforge_page_render_seconds."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(PAGE_RENDER_SECONDS, page=page):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def record_llm_usage(provider, model, usage):
+    """Count prompt/completion tokens from an OpenAI-style `usage` object (Groq returns one)."""
+    if usage is None:
+        return
+    for kind in ("prompt", "completion"):
+        tokens = getattr(usage, f"{kind}_tokens", None)
+        if tokens:
+            LLM_TOKENS.inc(tokens, provider=provider, model=model, kind=kind)
+
+# Exporters
+_exporters_lock = threading.Lock()
+_exporters_started = False
+
+def write_textfile(path):
+    """Write the metrics atomically, as node_exporter's textfile collector expects."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(render())
+    os.replace(tmp_path, path)
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scrapes every few seconds would flood the console
+
+def start_exporters(port=METRICS_PORT, textfile=METRICS_TEXTFILE):
+    """Start the configured exporters once per process; cheap to call on every rerun."""
+    global _exporters_started
+    if _exporters_started or not (port or textfile):
+        return
+    with _exporters_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+
+    if port:
+        try:
+            server = ThreadingHTTPServer(("127.0.0.1", int(port)), _MetricsHandler)
+            threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        except OSError as e:
+            log.warning("Metrics endpoint not started: %s", e)
+
+    if textfile:
+        def writer():
+            failing = False  # A failure repeats every interval; log it when it starts and when it ends
+            while True:
+                try:
+                    write_textfile(textfile)
+                except OSError as e:
+                    if not failing:
+                        log.warning("Writing metrics to %s failed: %s", textfile, e)
+                    failing = True
+                else:
+                    if failing:
+                        log.info("Writing metrics to %s works again", textfile)
+                    failing = False
+                time.sleep(TEXTFILE_INTERVAL_SECONDS)
+
+        threading.Thread(target=writer, name="metrics-textfile", daemon=True).start()
@@ -1,17 +1,18 @@
-from langchain_groq import ChatGroq
-from langchain_openai import ChatOpenAI
-from langchain_community.llms import Ollama
-from langchain.memory import ConversationBufferMemory
 import streamlit as st
 
 def llm_model(provider="groq"):
     """Initialize the LLM model and memory based on the specified provider."""
+    # langchain and the provider SDKs take seconds to import; only load the one requested
+    from langchain.memory import ConversationBufferMemory
+
     try:
         # Initialize memory
         memory = ConversationBufferMemory(memory_key="chat_history")
         
         # Initialize the LLM based on the provider
         if provider == "groq":
+            from langchain_groq import ChatGroq
+
             llm = ChatGroq(
                 model="llama-3.1-8b-instant",
                 temperature=0,
@@ -21,12 +22,16 @@ def llm_model(provider="groq"):
                 api_key=st.secrets["general"]["groq_api_key"]  # Fetch API key from Streamlit Secrets
             )
         elif provider == "openai":
+            from langchain_openai import ChatOpenAI
+
             llm = ChatOpenAI(
                 model="gpt-3.5-turbo",
                 temperature=0,
                 api_key=st.secrets["general"]["openai_api_key"]    # Fetch API key from Streamlit Secrets
             )
         elif provider == "ollama":
+            from langchain_community.llms import Ollama
+
             llm = Ollama(
                 model="llama2",  # Replace with your desired Ollama model
                 temperature=0
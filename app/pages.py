@@ -0,0 +1,25 @@
+"""Sidebar pages, imported on first navigation.
+
+Page modules pull in pandas, plotly and the LLM clients; importing them lazily keeps the landing
+and login pages from paying for that on a cold start.
+"""
+import importlib
+
+# Sidebar label -> (module, page function, whether the function takes user_id)
+PAGES = {
+    "Dashboard": ("dashboard", "show_dashboard", True),
+    "Task": ("add_task", "add_task", True),
+    "Time Slots": ("slots", "get_time_slot", False),
+    "Generate Schedule": ("schedule", "generate_schedule", False),
+    "Study Timer": ("timer", "show_timer", True),
+    "Quiz": ("quiz", "show_quiz", True),
+}
+
+def render_page(name, conn, user_id):
+    """Import the page's module (cached by Python after the first time) and render it."""
+    module_name, function_name, takes_user_id = PAGES[name]
+    page = getattr(importlib.import_module(module_name), function_name)
+    if takes_user_id:
+        page(conn, user_id)
+    else:
+        page(conn)
@@ -0,0 +1,301 @@
+# SQL for the pages' hot paths, kept in one place so query_plans.py can check every
+# statement against EXPLAIN QUERY PLAN and benchmarks can time exactly what the pages run.
+
+# Users
+USER_CREDENTIALS = "SELECT user_id, password FROM user WHERE username = ?"
+
+INSERT_USER = "INSERT INTO user (username, password) VALUES (?, ?)"
+
+# Only replaces the hash it was computed from, so a concurrent change is never overwritten
+REPLACE_PASSWORD_HASH = "UPDATE user SET password = ? WHERE user_id = ? AND password = ?"
+
+SESSION_GENERATION = "SELECT session_generation FROM user WHERE user_id = ?"
+
+REVOKE_SESSIONS = "UPDATE user SET session_generation = session_generation + 1 WHERE user_id = ?"
+
+# Topics. Open tasks are matched with IN rather than status != 'Completed' so (user_id, status) can seek.
+OPEN_STATUSES = "('Not Started', 'Pending', 'In Progress')"
+
+OPEN_TASKS = f"""
+    SELECT topic_id, title, status, progress, priority, category
+    FROM topic
+    WHERE user_id = ? AND status IN {OPEN_STATUSES}
+    ORDER BY priority DESC
+"""
+
+SCHEDULABLE_TASKS = f"""
+    SELECT topic_id, title, due_date, category, status, progress, priority
+    FROM topic
+    WHERE status IN {OPEN_STATUSES} AND user_id = ?
+    ORDER BY priority DESC
+"""
+
+TASK_DETAILS = f"""
+    SELECT title, due_date, status, progress, priority, category, from_date, recurrence
+    FROM topic
+    WHERE topic_id = ? AND user_id = ? AND status IN {OPEN_STATUSES}
+"""
+
+TASK_TITLES = "SELECT topic_id, title FROM topic WHERE user_id = ?"
+
+OPEN_TASK_TITLES = f"SELECT topic_id, title FROM topic WHERE user_id = ? AND status IN {OPEN_STATUSES}"
+
+TASK_DESCRIPTION = "SELECT description FROM topic WHERE topic_id = ? AND user_id = ?"
+
+UPDATE_TASK_DESCRIPTION = """
+    UPDATE topic SET description = ?, updated_at = CURRENT_TIMESTAMP WHERE topic_id = ? AND user_id = ?
+"""
+
+INSERT_TASK = """
+    INSERT INTO topic (user_id, title, description, from_date, due_date, status, priority, progress, category, recurrence, tags)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+DELETE_TASK = "DELETE FROM topic WHERE topic_id = ? AND user_id = ?"
+
+# A status the user picks is kept; the progress roll-up stops deriving it (see db.py)
+PIN_TASK_STATUS = "UPDATE topic SET status_pinned = 1 WHERE topic_id = ? AND user_id = ? AND status IS NOT ?"
+
+# Which of a JSON array of topic ids belong to the user; json_each avoids the bound-parameter limit
+OWNED_TOPIC_IDS = "SELECT topic_id FROM topic WHERE user_id = ? AND topic_id IN (SELECT value FROM json_each(?))"
+
+# Columns shown in the task editor; the long description is loaded on demand per task
+TASK_COLUMNS = [
+    "topic_id", "title", "from_date", "due_date", "status", "priority",
+    "progress", "category", "recurrence", "tags"
+]
+TASK_FILTERS = ["status", "category", "priority"]
+
+def build_tasks_page(user_id, filters=None, after=None, limit=25):
+    """Build the keyset-paginated task editor query as (sql, params).
+
+    Rows are ordered by (due_date, topic_id); `after` is the cursor of the previous page's last row.
+    """
+    clauses = ["user_id = ?"]
+    params = [user_id]
+    for column in TASK_FILTERS:
+        values = (filters or {}).get(column)
+        if values:
+            clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+    if (filters or {}).get("tags"):
+        # Resolved through the (user_id, tag_id, topic_id) key of topic_tag
+        clauses.append(
+            f"""topic_id IN (
+                SELECT topic_id FROM topic_tag
+                WHERE user_id = ? AND tag_id IN (SELECT tag_id FROM tag WHERE name IN ({', '.join('?' * len(filters["tags"]))}))
+            )"""
+        )
+        params.extend([user_id, *filters["tags"]])
+    if after:
+        clauses.append("(due_date, topic_id) > (?, ?)")
+        params.extend(after)
+
+    sql = f"""
+        SELECT {', '.join(TASK_COLUMNS)}
+        FROM topic
+        WHERE {' AND '.join(clauses)}
+        ORDER BY due_date, topic_id
+        LIMIT ?
+    """
+    return sql, (*params, limit)
+
+# Slots
+SLOTS_IN_RANGE = "SELECT slot_id, date, time_slot FROM slot WHERE topic_id = ? AND date BETWEEN ? AND ?"
+
+SLOT_TIMES_IN_RANGE = "SELECT time_slot FROM slot WHERE topic_id = ? AND date BETWEEN ? AND ?"
+
+SLOT_TIMES_ON_DATE = "SELECT time_slot FROM slot WHERE topic_id = ? AND date = ?"
+
+SLOTS_ON_DATE = "SELECT slot_id, time_slot FROM slot WHERE topic_id = ? AND date = ?"
+
+AVAILABLE_SLOTS = """
+    SELECT date, time_slot
+    FROM slot
+    WHERE user_id = ? AND date = ?
+    ORDER BY time_slot DESC
+"""
+
+INSERT_SLOT_IF_FREE = "INSERT OR IGNORE INTO slot (user_id, topic_id, date, time_slot) VALUES (?, ?, ?, ?)"
+
+DELETE_SLOT = "DELETE FROM slot WHERE slot_id = ? AND user_id = ?"
+
+INSERT_SLOT_RULE = """
+    INSERT INTO slot_rule (user_id, topic_id, first_date, until_date, frequency, interval,
+                           start_time, end_time, slot_minutes, materialized_until)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Rules with occurrences not yet turned into slots; fully expanded rules are skipped by the range scan
+SLOT_RULES_TO_EXTEND = """
+    SELECT slot_rule_id, user_id, topic_id, first_date, until_date, frequency, interval,
+           start_time, end_time, slot_minutes, materialized_until
+    FROM slot_rule
+    WHERE materialized_until < ? AND (until_date IS NULL OR materialized_until < until_date)
+"""
+
+SET_SLOT_RULE_MATERIALIZED = "UPDATE slot_rule SET materialized_until = ? WHERE slot_rule_id = ?"
+
+# Schedules
+INSERT_SCHEDULE_ROW = """
+    INSERT INTO schedule (user_id, topic_id, date, time_slot, subtopics, is_completed)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_SCHEDULE_ROW_IN_SLOT = """
+    INSERT INTO schedule (user_id, topic_id, date, time_slot, subtopics, is_completed, slot_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Re-planning: open sessions of slots about to be deleted, the topic's unbooked slots, and moves
+SESSIONS_IN_SLOTS = """
+    SELECT schedule_id, topic_id, date, time_slot
+    FROM schedule
+    WHERE slot_id IN (SELECT slot_id FROM slot WHERE slot_id IN (SELECT value FROM json_each(?)) AND user_id = ?)
+      AND NOT is_completed
+"""
+
+FREE_TOPIC_SLOTS = """
+    SELECT sl.slot_id, sl.date, sl.time_slot
+    FROM slot sl
+    WHERE sl.topic_id = ? AND sl.date >= ?
+      AND NOT EXISTS (SELECT 1 FROM schedule s WHERE s.slot_id = sl.slot_id AND NOT s.is_completed)
+"""
+
+MOVE_SESSION = """
+    UPDATE schedule SET slot_id = ?, date = ?, time_slot = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE schedule_id = ?
+"""
+
+# Open sessions follow their slot when it is edited
+FOLLOW_EDITED_SLOTS = """
+    UPDATE schedule SET date = sl.date, time_slot = sl.time_slot, updated_at = CURRENT_TIMESTAMP
+    FROM slot sl
+    WHERE schedule.slot_id = sl.slot_id AND sl.slot_id IN (SELECT value FROM json_each(?)) AND sl.user_id = ?
+      AND NOT schedule.is_completed AND (schedule.date != sl.date OR schedule.time_slot != sl.time_slot)
+    RETURNING schedule.schedule_id
+"""
+
+REMINDERS_OF_SESSIONS = """
+    SELECT schedule_id, reminder FROM schedule
+    WHERE schedule_id IN (SELECT value FROM json_each(?)) AND reminder IS NOT NULL
+"""
+
+SCHEDULE_HISTORY = """
+    SELECT s.schedule_id, s.date, s.time_slot, t.title, s.subtopics, s.is_completed, 0 AS archived
+    FROM schedule s
+    JOIN topic t ON s.topic_id = t.topic_id
+    WHERE s.user_id = ?
+"""
+
+ARCHIVED_SCHEDULE_HISTORY = """
+    SELECT schedule_id, date, time_slot, title, subtopics, is_completed, 1 AS archived
+    FROM schedule_archive
+    WHERE user_id = ?
+"""
+
+# Ids are passed as a JSON array; rows of other users and already completed ones are left alone.
+# The unary + keeps the planner on the primary key rather than scanning the user's whole schedule.
+MARK_SESSIONS_COMPLETED = """
+    UPDATE schedule
+    SET is_completed = TRUE, updated_at = CURRENT_TIMESTAMP
+    WHERE schedule_id IN (SELECT value FROM json_each(?)) AND +user_id = ? AND NOT is_completed
+"""
+
+# Served from idx_schedule_user_topic_completed without touching the table
+COMPLETION_BY_TOPIC = """
+    SELECT s.topic_id, t.title, COUNT(*) AS sessions, SUM(s.is_completed) AS completed,
+           100 * SUM(s.is_completed) / COUNT(*) AS percent
+    FROM schedule s
+    JOIN topic t ON s.topic_id = t.topic_id
+    WHERE s.user_id = ?
+    GROUP BY s.topic_id
+"""
+
+# Reminders
+REMINDER_TARGET = "SELECT date, time_slot, slot_id FROM schedule WHERE schedule_id = ? AND user_id = ?"
+
+SET_REMINDER = "UPDATE schedule SET reminder = ?, next_fire_at = ? WHERE schedule_id = ? AND user_id = ?"
+
+# Served by the partial index idx_schedule_next_fire; `<` implies next_fire_at IS NOT NULL
+PENDING_REMINDERS = "SELECT next_fire_at, schedule_id FROM schedule WHERE next_fire_at < ?"
+
+# Only succeeds while the reminder is still set for that time, so moved or fired reminders are skipped
+CLAIM_REMINDER = "UPDATE schedule SET next_fire_at = NULL WHERE schedule_id = ? AND next_fire_at = ?"
+
+REMINDER_DETAILS = """
+    SELECT s.schedule_id, s.user_id, t.title, s.subtopics, s.date, s.time_slot
+    FROM schedule s
+    JOIN topic t ON s.topic_id = t.topic_id
+    WHERE s.schedule_id IN (SELECT value FROM json_each(?)) AND NOT s.is_completed
+"""
+
+INSERT_INBOX_REMINDER = """
+    INSERT INTO reminder_inbox (user_id, schedule_id, message, fired_at)
+    VALUES (?, ?, ?, ?)
+"""
+
+UNREAD_REMINDERS = """
+    SELECT reminder_inbox_id, message FROM reminder_inbox
+    WHERE user_id = ? AND read_at IS NULL
+    ORDER BY reminder_inbox_id
+"""
+
+MARK_REMINDERS_READ = """
+    UPDATE reminder_inbox SET read_at = CURRENT_TIMESTAMP
+    WHERE user_id = ? AND reminder_inbox_id IN (SELECT value FROM json_each(?))
+"""
+
+# Quizzes
+CLAIM_QUIZ_BANK = """
+    INSERT INTO quiz_bank (bank_key, title, subtopic) VALUES (?, ?, ?)
+    ON CONFLICT(bank_key) DO UPDATE SET status = 'pending', updated_at = CURRENT_TIMESTAMP
+    WHERE status = 'failed' OR (status = 'pending' AND updated_at < datetime('now', '-10 minutes'))  -- Abandoned
+    RETURNING quiz_bank_id
+"""
+
+SET_QUIZ_BANK_STATUS = "UPDATE quiz_bank SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE quiz_bank_id = ?"
+
+INSERT_QUIZ_QUESTION = """
+    INSERT OR IGNORE INTO quiz_question (quiz_bank_id, question, choices, answer, question_hash)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+QUIZ_SUBTOPICS = """
+    SELECT DISTINCT s.topic_id, t.title, s.subtopics
+    FROM schedule s
+    JOIN topic t ON s.topic_id = t.topic_id
+    WHERE s.user_id = ?
+    ORDER BY t.title, s.subtopics
+"""
+
+QUIZ_BANK_STATUS = "SELECT quiz_bank_id, status FROM quiz_bank WHERE bank_key = ?"
+
+SAMPLE_QUIZ_QUESTIONS = """
+    SELECT quiz_question_id, question, choices FROM quiz_question
+    WHERE quiz_bank_id = ?
+    ORDER BY random()
+    LIMIT ?
+"""
+
+QUIZ_ANSWERS = """
+    SELECT quiz_question_id, choices, answer FROM quiz_question
+    WHERE quiz_question_id IN (SELECT value FROM json_each(?))
+"""
+
+INSERT_QUIZ_RESULT = """
+    INSERT INTO quiz_result (user_id, topic_id, subtopics, num_questions, score, total_questions)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+QUIZ_STATS_BY_TOPIC = """
+    SELECT t.title, COUNT(*) AS attempts,
+           ROUND(100.0 * SUM(q.score) / MAX(SUM(q.total_questions), 1), 1) AS average_pct,
+           ROUND(MAX(100.0 * q.score / MAX(q.total_questions, 1)), 1) AS best_pct,
+           MAX(q.timestamp) AS last_taken
+    FROM quiz_result q
+    JOIN topic t ON t.topic_id = q.topic_id
+    WHERE q.user_id = ?
+    GROUP BY q.topic_id
+    ORDER BY last_taken DESC
+"""
@@ -0,0 +1,91 @@
+"""Check that every hot-path statement in queries.py is served by an index.
+
+Run `python app/query_plans.py [--db scheduler.db]` (exit status 1 on a regression); the test suite
+checks a fresh schema (tests/test_query_plans.py).
+"""
+import argparse
+import re
+import sys
+import queries
+from db import init_db
+
+# (name, sql, params, index the plan must use); None only asserts that no table is fully scanned
+PLAN_CASES = [
+    ("user credentials", queries.USER_CREDENTIALS, ("alice",), "sqlite_autoindex_user_1"),
+    ("replace password hash", queries.REPLACE_PASSWORD_HASH, ("x", 1, "y"), "INTEGER PRIMARY KEY"),
+    ("session generation", queries.SESSION_GENERATION, (1,), "INTEGER PRIMARY KEY"),
+    ("revoke sessions", queries.REVOKE_SESSIONS, (1,), "INTEGER PRIMARY KEY"),
+    ("dashboard open tasks", queries.OPEN_TASKS, (1,), "idx_topic_user_status"),
+    ("timer open task titles", queries.OPEN_TASK_TITLES, (1,), "idx_topic_user_status"),
+    ("scheduler open tasks", queries.SCHEDULABLE_TASKS, (1,), "idx_topic_user_status"),
+    ("task details", queries.TASK_DETAILS, (1, 1), "INTEGER PRIMARY KEY"),
+    ("task titles", queries.TASK_TITLES, (1,), None),
+    ("task description", queries.TASK_DESCRIPTION, (1, 1), "INTEGER PRIMARY KEY"),
+    ("update task description", queries.UPDATE_TASK_DESCRIPTION, ("", 1, 1), "INTEGER PRIMARY KEY"),
+    ("delete task", queries.DELETE_TASK, (1, 1), "INTEGER PRIMARY KEY"),
+    ("pin task status", queries.PIN_TASK_STATUS, (1, 1, "Completed"), "INTEGER PRIMARY KEY"),
+    ("owned topic ids", queries.OWNED_TOPIC_IDS, (1, "[1, 2]"), "idx_topic_user_due"),
+    ("tasks page", *queries.build_tasks_page(1), "idx_topic_user_due"),
+    ("tasks page after cursor", *queries.build_tasks_page(1, after=("2025-01-01", 1)), "idx_topic_user_due"),
+    (
+        "tasks page filtered by tag",
+        *queries.build_tasks_page(1, {"status": ["Pending"], "tags": ["Python"]}),
+        "topic_tag"
+    ),
+    ("slots in range", queries.SLOTS_IN_RANGE, (1, "2025-01-01", "2025-01-31"), "COVERING INDEX idx_slot_topic_date"),
+    ("slot times in range", queries.SLOT_TIMES_IN_RANGE, (1, "2025-01-01", "2025-01-31"), "COVERING INDEX idx_slot_topic_date"),
+    ("slot times on date", queries.SLOT_TIMES_ON_DATE, (1, "2025-01-01"), "COVERING INDEX idx_slot_topic_date"),
+    ("slots on date", queries.SLOTS_ON_DATE, (1, "2025-01-01"), "COVERING INDEX idx_slot_topic_date"),
+    ("available slots", queries.AVAILABLE_SLOTS, (1, "2025-01-01"), "COVERING INDEX sqlite_autoindex_slot_1"),
+    ("delete slot", queries.DELETE_SLOT, (1, 1), "INTEGER PRIMARY KEY"),
+    ("slot rules to extend", queries.SLOT_RULES_TO_EXTEND, ("2025-01-01",), "idx_slot_rule_materialized"),
+    ("schedule history", queries.SCHEDULE_HISTORY, (1,), "idx_schedule_user_topic_completed"),
+    ("archived schedule history", queries.ARCHIVED_SCHEDULE_HISTORY, (1,), "idx_schedule_archive_user_topic"),
+    ("sessions in slots", queries.SESSIONS_IN_SLOTS, ("[1, 2]", 1), "idx_schedule_slot_booked"),
+    ("free topic slots", queries.FREE_TOPIC_SLOTS, (1, "2025-01-01"), "idx_slot_topic_date"),
+    ("move session", queries.MOVE_SESSION, (1, "2025-01-01", "10:00 AM - 11:00 AM", 1), "INTEGER PRIMARY KEY"),
+    ("follow edited slots", queries.FOLLOW_EDITED_SLOTS, ("[1, 2]", 1), "idx_schedule_slot_booked"),
+    ("reminders of sessions", queries.REMINDERS_OF_SESSIONS, ("[1, 2]",), "INTEGER PRIMARY KEY"),
+    ("mark sessions completed", queries.MARK_SESSIONS_COMPLETED, ("[1, 2]", 1), "INTEGER PRIMARY KEY"),
+    ("completion by topic", queries.COMPLETION_BY_TOPIC, (1,), "COVERING INDEX idx_schedule_user_topic_completed"),
+    ("pending reminders", queries.PENDING_REMINDERS, ("2025-01-01 00:00:00",), "idx_schedule_next_fire"),
+    ("claim reminder", queries.CLAIM_REMINDER, (1, "2025-01-01 00:00:00"), "INTEGER PRIMARY KEY"),
+    ("reminder details", queries.REMINDER_DETAILS, ("[1, 2]",), "INTEGER PRIMARY KEY"),
+    ("quiz subtopics", queries.QUIZ_SUBTOPICS, (1,), "idx_schedule_user_topic_completed"),
+    ("quiz bank status", queries.QUIZ_BANK_STATUS, ("abc",), "sqlite_autoindex_quiz_bank_1"),
+    ("sample quiz questions", queries.SAMPLE_QUIZ_QUESTIONS, (1, 5), "sqlite_autoindex_quiz_question_1"),
+    ("quiz answers", queries.QUIZ_ANSWERS, ("[1, 2]",), "INTEGER PRIMARY KEY"),
+    ("quiz stats by topic", queries.QUIZ_STATS_BY_TOPIC, (1,), "idx_quiz_result_user_topic"),
+    ("unread reminders", queries.UNREAD_REMINDERS, (1,), "idx_reminder_inbox_unread"),
+]
+
+def explain(conn, sql, params):
+    """Return the detail lines of EXPLAIN QUERY PLAN for a statement."""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+def check_query_plans(conn, cases=PLAN_CASES):
+    """Return a list of (name, problem, plan) for every case whose plan regressed."""
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    failures = []
+    for name, sql, params, expected in cases:
+        plan = explain(conn, sql, params)
+        # SCAN of a real table (with or without a covering index) reads every row
+        scanned = [line for line in plan if (match := re.match(r"SCAN (\w+)", line)) and match.group(1) in tables]
+        if scanned:
+            failures.append((name, f"full scan: {scanned[0]}", plan))
+        elif expected and not any(expected in line for line in plan):
+            failures.append((name, f"expected {expected}", plan))
+    return failures
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check query plans of the hot SQL paths.")
+    parser.add_argument("--db", default=":memory:", help="Database to check (defaults to a fresh in-memory schema)")
+    args = parser.parse_args()
+
+    failures = check_query_plans(init_db(args.db))
+    for name, problem, plan in failures:
+        print(f"FAIL {name}: {problem}")
+        for line in plan:
+            print(f"    {line}")
+    print(f"{len(PLAN_CASES) - len(failures)}/{len(PLAN_CASES)} query plans use an index")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,69 @@
+import streamlit as st
+import pandas as pd
+import quiz_bank
+import services
+from metrics import track_page
+from util import notify
+from writer import write
+
+@track_page("quiz")
+def show_quiz(conn, user_id):
+    """Quiz the user on a scheduled subtopic from its pre-generated question bank."""
+    st.title("🧠 Quiz")
+
+    subtopics = services.list_quiz_subtopics(conn, user_id)
+    if not subtopics:
+        st.info("ℹ️ Quizzes are prepared for the subtopics of your schedules. Generate a schedule first!")
+        return
+
+    topic_id, title, subtopic = st.selectbox(
+        "📚 Subtopic", subtopics, format_func=lambda row: f"{row[1]} · {row[2]}"
+    )
+    bank = services.quiz_bank_status(conn, title, subtopic)
+
+    if bank is None or bank[1] == "failed":
+        st.warning("⚠️ No questions are available for this subtopic yet.")
+        if st.button("✨ Generate Questions"):
+            complete = services.groq_completion(st.secrets["general"]["groq_api_key"], quiz_bank.QUIZ_MODEL)
+            try:
+                with st.spinner("⏳ Generating questions..."):
+                    for future in quiz_bank.pregenerate(title, [subtopic], complete):
+                        future.result()
+                st.rerun()
+            except Exception as e:
+                st.error(f"❗ Error generating questions: {str(e)}")
+    elif bank[1] == "pending":
+        st.info("⏳ Questions for this subtopic are still being prepared.")
+        if st.button("🔄 Refresh"):
+            st.rerun()
+    else:
+        quiz = st.session_state.get('quiz')
+        if st.button("🎲 New Quiz") or not quiz or quiz["quiz_bank_id"] != bank[0]:
+            quiz = st.session_state['quiz'] = {"quiz_bank_id": bank[0], "questions": services.sample_quiz(conn, bank[0])}
+
+        with st.form("quiz_form"):
+            answers = {}
+            for number, (question_id, question, choices) in enumerate(quiz["questions"], start=1):
+                answers[question_id] = st.radio(f"{number}. {question}", choices, index=None, key=f"quiz_{question_id}")
+            submitted = st.form_submit_button("✅ Submit Answers")
+
+        if submitted:
+            try:
+                score, total = write(services.record_quiz_result, user_id, topic_id, subtopic, answers)
+            except ValueError as e:
+                st.error(f"❌ {str(e)}")
+            else:
+                del st.session_state['quiz']  # The next visit gets a fresh sample
+                notify(f"You scored {score}/{total} on '{subtopic}'!", icon="🏆" if score == total else "📝")
+                st.rerun()
+
+    st.divider()
+    st.subheader("📈 Quiz Results by Task")
+    stats = services.quiz_stats_by_topic(conn, user_id)
+    if stats:
+        st.dataframe(
+            pd.DataFrame(stats, columns=["Task", "Attempts", "Average %", "Best %", "Last Taken"]),
+            hide_index=True, use_container_width=True
+        )
+    else:
+        st.info("ℹ️ Take a quiz to see your results here.")
@@ -0,0 +1,48 @@
+"""Generate quiz question banks in the background, so taking a quiz never waits for the LLM.
+
+Saving a schedule calls pregenerate() with the subtopics just planned. Banks nobody has requested yet
+are claimed on the writer thread and generated on a small thread pool; banks that already exist (for
+the same task title and subtopic, from any learner) cost nothing.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import metrics
+import services
+from writer import get_writer
+
+QUIZ_WORKERS = int(os.getenv("SKILLFORGE_QUIZ_WORKERS", "2"))  # Concurrent LLM calls for question banks
+QUIZ_MODEL = os.getenv("SKILLFORGE_QUIZ_MODEL", "mixtral-8x7b-32768")
+
+log = logging.getLogger("skillforge.quiz")
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _executor():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(QUIZ_WORKERS, thread_name_prefix="quiz")
+        return _pool
+
+def _generate(db_path, quiz_bank_id, title, subtopic, complete):
+    writer = get_writer(db_path)
+    try:
+        questions = services.generate_quiz_bank(title, subtopic, complete)
+    except Exception:
+        log.exception("Generating the quiz bank for %r / %r failed", title, subtopic)
+        writer.write(services.fail_quiz_bank, quiz_bank_id)
+        metrics.QUIZ_BANKS_GENERATED.inc(outcome="error")
+        return 0
+    metrics.QUIZ_BANKS_GENERATED.inc(outcome="ok" if questions else "empty")
+    return writer.write(services.store_quiz_bank, quiz_bank_id, questions)
+
+def pregenerate(title, subtopics, complete, db_path=None):
+    """Queue generation of the subtopics' banks that do not exist yet; returns a Future per queued bank.
+
+    Each Future resolves to the number of questions stored.
+    """
+    claimed = get_writer(db_path).write(services.claim_quiz_banks, title, subtopics)
+    return [_executor().submit(_generate, db_path, quiz_bank_id, title, subtopic, complete) for quiz_bank_id, subtopic in claimed]
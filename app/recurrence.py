@@ -0,0 +1,68 @@
+"""Lazy expansion of Daily/Weekly/Monthly recurrences (a small subset of iCalendar RRULE).
+
+    list(occurrences(date(2025, 1, 31), "Monthly", until=date(2025, 5, 1)))
+    # [2025-01-31, 2025-02-28, 2025-03-31, 2025-04-30]
+
+Occurrences are generated one at a time, so an open-ended rule costs nothing until it is iterated and
+a window far into the future is reached by arithmetic rather than by walking every earlier occurrence.
+Monthly rules keep the day of month of their first date, clamped to shorter months.
+"""
+import calendar
+from collections.abc import Iterator
+from datetime import date, timedelta
+from itertools import islice
+
+FREQUENCIES = ("Daily", "Weekly", "Monthly")
+_DAYS = {"Daily": 1, "Weekly": 7}
+
+def add_months(start: date, months: int, day: int | None = None) -> date:
+    """`start` moved by `months`, on `day` (default start.day) or the month's last day if it is shorter."""
+    month_index = start.year * 12 + start.month - 1 + months
+    year, month = divmod(month_index, 12)
+    month += 1
+    return date(year, month, min(day or start.day, calendar.monthrange(year, month)[1]))
+
+def _first_index(start: date, frequency: str, interval: int, not_before: date) -> int:
+    """Index of the first occurrence on or after `not_before`."""
+    if not_before <= start:
+        return 0
+    if frequency == "Monthly":
+        months = (not_before.year - start.year) * 12 + not_before.month - start.month
+        index = months // interval
+        return index if add_months(start, index * interval) >= not_before else index + 1
+    return -(-(not_before - start).days // (_DAYS[frequency] * interval))
+
+def occurrences(start: date, frequency: str, interval: int = 1, until: date | None = None,
+                count: int | None = None, not_before: date | None = None) -> Iterator[date]:
+    """Yield the dates of a recurrence from `start`: through `until` (inclusive), at most `count` of them
+    counted from `start`, skipping those before `not_before`. Without `until` or `count` it never ends.
+
+    Frequency "None" yields just `start`. Raises ValueError on an unknown frequency or interval < 1.
+    """
+    if frequency == "None":
+        frequency, count = "Daily", 1
+    if frequency not in FREQUENCIES:
+        raise ValueError(f"Unknown recurrence: {frequency}")
+    if interval < 1:
+        raise ValueError("Recurrence interval must be at least 1.")
+
+    index = _first_index(start, frequency, interval, not_before) if not_before else 0
+    while count is None or index < count:
+        if frequency == "Monthly":
+            current = add_months(start, index * interval)
+        else:
+            current = start + timedelta(days=index * _DAYS[frequency] * interval)
+        if until is not None and current > until:
+            return
+        yield current
+        index += 1
+
+def between(start: date, frequency: str, window_start: date, window_end: date, interval: int = 1,
+            until: date | None = None) -> Iterator[date]:
+    """Yield the occurrences falling in [window_start, window_end]."""
+    last = min(window_end, until) if until else window_end
+    return occurrences(start, frequency, interval, until=last, not_before=window_start)
+
+def next_occurrences(start: date, frequency: str, after: date, limit: int, until: date | None = None) -> list[date]:
+    """The first `limit` occurrences on or after `after`."""
+    return list(islice(occurrences(start, frequency, until=until, not_before=after), limit))
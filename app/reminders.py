@@ -0,0 +1,249 @@
+"""Fire schedule reminders from an in-process min-heap instead of polling the schedule table.
+
+A reminder is a schedule row with `next_fire_at` set. The dispatcher loads the reminders due within
+the next HORIZON hours from the partial index idx_schedule_next_fire into a heap of (fire_at, schedule_id)
+and sleeps until the earliest one; new reminders are pushed in O(log n) with `schedule()`. Due reminders
+are claimed by clearing `next_fire_at` on the writer thread, so each fires at most once even with several
+dispatchers on one database, and a heap entry whose reminder was moved or cleared is skipped when it comes up.
+Reminders set from another process are not pushed, so they are picked up when the next window loads.
+
+Fired reminders go to every sink, a callable taking a list of Reminder: the in-app inbox, the log and,
+with SKILLFORGE_REMINDER_WEBHOOK_FILE set, a JSON-lines file standing in for a webhook.
+"""
+import heapq
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from typing import NamedTuple
+import db
+import metrics
+import queries
+from writer import get_writer
+
+FIRE_FORMAT = "%Y-%m-%d %H:%M:%S"
+SLOT_DATE = re.compile(r"\d{1,2}-[A-Za-z]{3}-\d{4}")  # '16-Mar-2025', as the LLM writes dates into time slots
+HORIZON = timedelta(hours=float(os.getenv("SKILLFORGE_REMINDER_HORIZON_HOURS", "6")))
+WEBHOOK_FILE = os.getenv("SKILLFORGE_REMINDER_WEBHOOK_FILE", "")
+# Upper bound on one sleep, so a wall-clock jump is noticed; the database is not read on these wake-ups
+MAX_SLEEP_SECONDS = 300
+
+log = logging.getLogger("skillforge.reminders")
+
+_dispatchers = {}
+_dispatchers_lock = threading.Lock()
+
+class Reminder(NamedTuple):
+    schedule_id: int
+    user_id: int
+    title: str
+    subtopic: str
+    date: str
+    time_slot: str
+    fire_at: str
+
+    @property
+    def message(self):
+        return f"⏰ {self.title}: {self.subtopic} at {self.time_slot} on {self.date}"
+
+def session_start(on_date, time_slot):
+    """Start of a scheduled session, from its date and a '10:00 AM - 11:00 AM' slot.
+
+    A date written in the slot itself, as the LLM does ('16-Mar-2025 10:00 AM - ...'), wins over `on_date`.
+    """
+    match = re.search(r"(\d{1,2}):(\d{2})\s*([AP]M)", time_slot, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid time slot: {time_slot}")
+    slot_date = SLOT_DATE.search(time_slot[:match.start()])
+    if slot_date:
+        on_date = datetime.strptime(slot_date[0], "%d-%b-%Y").strftime("%Y-%m-%d")
+    return datetime.strptime(f"{on_date} {match[1]}:{match[2]} {match[3].upper()}", "%Y-%m-%d %I:%M %p")
+
+def set_reminder(conn, user_id, schedule_id, minutes_before, now=None):
+    """Writer job: remind the user `minutes_before` a session starts (None clears it); returns the fire time.
+
+    Sessions neither booked into a slot nor dated in their time slot only carry the task's due date,
+    so they cannot have a reminder.
+    """
+    row = conn.execute(queries.REMINDER_TARGET, (schedule_id, user_id)).fetchone()
+    if not row:
+        raise ValueError("No such scheduled session.")
+    if minutes_before is None:
+        conn.execute(queries.SET_REMINDER, (None, None, schedule_id, user_id))
+        return None
+    if minutes_before < 0:
+        raise ValueError("Minutes before the session cannot be negative.")
+    on_date, time_slot, slot_id = row
+    if slot_id is None and not SLOT_DATE.search(time_slot):
+        raise ValueError("This session has no date of its own; book it into a time slot to set a reminder.")
+    now = now or datetime.now()
+    start = session_start(on_date, time_slot)
+    if start <= now:
+        raise ValueError("This session has already started.")
+    fire_at = max(start - timedelta(minutes=minutes_before), now).strftime(FIRE_FORMAT)
+    conn.execute(queries.SET_REMINDER, (str(minutes_before), fire_at, schedule_id, user_id))
+    return fire_at
+
+def claim_due(conn, entries):
+    """Writer job: clear `next_fire_at` of the (fire_at, schedule_id) entries still due then; returns their Reminders."""
+    claimed = {
+        schedule_id: fire_at for fire_at, schedule_id in entries
+        if conn.execute(queries.CLAIM_REMINDER, (schedule_id, fire_at)).rowcount
+    }
+    if not claimed:
+        return []
+    rows = conn.execute(queries.REMINDER_DETAILS, (json.dumps(list(claimed)),)).fetchall()
+    return [Reminder(*row, claimed[row[0]]) for row in rows]  # Sessions completed meanwhile are dropped
+
+def inbox_sink(db_path=None):
+    """Sink storing reminders in reminder_inbox, shown to the user on their next page load."""
+    def deliver(reminders):
+        def insert(conn):
+            conn.executemany(queries.INSERT_INBOX_REMINDER, [(r.user_id, r.schedule_id, r.message, r.fire_at) for r in reminders])
+        get_writer(db_path).write(insert)
+    deliver.__name__ = "inbox_sink"
+    return deliver
+
+def log_sink(reminders):
+    """Sink writing reminders to the skillforge.reminders logger."""
+    for r in reminders:
+        log.info("Reminder for user %s (schedule %s): %s", r.user_id, r.schedule_id, r.message)
+
+def webhook_file_sink(path):
+    """Sink appending one JSON object per reminder to `path`, a local stand-in for a webhook."""
+    def deliver(reminders):
+        with open(path, "a", encoding="utf-8") as f:
+            for r in reminders:
+                f.write(json.dumps({**r._asdict(), "message": r.message}) + "\n")
+    deliver.__name__ = "webhook_file_sink"
+    return deliver
+
+class ReminderDispatcher:
+    """Min-heap of the reminders due within `horizon`, fired on a thread that wakes only when one is due.
+
+    `clock` returns the current datetime; tests pass a fake one and call `run_due()` instead of `start()`.
+    """
+
+    def __init__(self, db_path=None, sinks=None, clock=datetime.now, horizon=HORIZON):
+        self.db_path = db_path
+        self.sinks = sinks if sinks is not None else default_sinks(db_path)
+        self.clock, self.horizon = clock, horizon
+        self._heap = []  # (fire_at, schedule_id); fire_at strings sort chronologically
+        self._window_end = ""
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = None
+        self._load_window(self.clock())
+
+    def __len__(self):
+        return len(self._heap)
+
+    def _load_window(self, now):
+        """Replace the heap with every reminder due before now + horizon."""
+        window_end = (now + self.horizon).strftime(FIRE_FORMAT)
+        conn = db.connect_readonly(self.db_path)
+        try:
+            heap = conn.execute(queries.PENDING_REMINDERS, (window_end,)).fetchall()
+        finally:
+            conn.close()
+        heapq.heapify(heap)
+        with self._cond:
+            self._heap, self._window_end = heap, window_end
+            self._cond.notify()
+
+    def schedule(self, schedule_id, fire_at):
+        """Track a reminder just set with set_reminder(); later ones are loaded with their window."""
+        if fire_at is None:
+            return  # A cleared reminder's heap entry is skipped when claimed
+        with self._cond:
+            if fire_at < self._window_end:
+                heapq.heappush(self._heap, (fire_at, schedule_id))
+                self._cond.notify()
+
+    def run_due(self, now=None):
+        """Fire every reminder due at `now` (default: the clock); returns how many were delivered."""
+        now = now or self.clock()
+        if now.strftime(FIRE_FORMAT) >= self._window_end:
+            self._load_window(now)
+        cutoff = now.strftime(FIRE_FORMAT)
+        with self._cond:
+            due = []
+            while self._heap and self._heap[0][0] <= cutoff:
+                due.append(heapq.heappop(self._heap))
+        if not due:
+            return 0
+        reminders = get_writer(self.db_path).write(claim_due, due)
+        for sink in self.sinks:
+            name = getattr(sink, "__name__", "sink")
+            try:
+                if reminders:
+                    sink(reminders)
+                metrics.REMINDERS_FIRED.inc(len(reminders), sink=name, outcome="ok")
+            except Exception:
+                # One broken sink must not keep the others from delivering
+                log.exception("Reminder sink %s failed", name)
+                metrics.REMINDERS_FIRED.inc(len(reminders), sink=name, outcome="error")
+        return len(reminders)
+
+    def _seconds_to_next(self):
+        with self._cond:
+            next_at = self._heap[0][0] if self._heap else self._window_end
+        delay = (datetime.strptime(next_at, FIRE_FORMAT) - self.clock()).total_seconds()
+        return min(max(delay, 0), MAX_SLEEP_SECONDS)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+            delay = self._seconds_to_next()
+            if delay > 0:
+                with self._cond:
+                    # schedule() and stop() notify, so an earlier reminder or shutdown cuts the wait short
+                    self._cond.wait(delay)
+                    if self._stopped:
+                        return
+                continue
+            try:
+                self.run_due()
+            except Exception:
+                log.exception("Firing reminders failed")
+                with self._cond:
+                    self._cond.wait(1)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="reminders", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+
+def default_sinks(db_path=None):
+    sinks = [inbox_sink(db_path), log_sink]
+    if WEBHOOK_FILE:
+        sinks.append(webhook_file_sink(WEBHOOK_FILE))
+    return sinks
+
+def start_dispatcher(db_path=None):
+    """The process's running dispatcher for `db_path` (default db.DB_PATH); cheap to call on every rerun."""
+    db_path = os.path.abspath(db_path or db.DB_PATH)
+    with _dispatchers_lock:
+        if db_path not in _dispatchers:
+            _dispatchers[db_path] = ReminderDispatcher(db_path).start()
+        return _dispatchers[db_path]
+
+def fetch_unread_reminders(conn, user_id):
+    """Return (reminder_inbox_id, message) of the user's unread reminders, oldest first."""
+    return conn.execute(queries.UNREAD_REMINDERS, (user_id,)).fetchall()
+
+def mark_reminders_read(conn, user_id, inbox_ids):
+    """Writer job: mark inbox reminders as read."""
+    conn.execute(queries.MARK_REMINDERS_READ, (user_id, json.dumps(list(inbox_ids))))
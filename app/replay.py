@@ -0,0 +1,119 @@
+"""Record live LLM and search traffic to fixture files and replay it offline.
+
+    SKILLFORGE_REPLAY=record SKILLFORGE_FIXTURE_DIR=fixtures/demo streamlit run app/skillforgeAi.py
+    SKILLFORGE_REPLAY=replay SKILLFORGE_FIXTURE_DIR=fixtures/demo streamlit run app/skillforgeAi.py
+
+A fixture directory holds completion.jsonl and search.jsonl, one {"key", "request", "response",
+"seconds"} object per call. Recording wraps the real clients and appends every call. Replaying answers
+from the file. An exact request is matched by its key; a request never seen (prompts carry today's
+date and the free slots) gets the recorded responses in turn unless `strict`. A ReplayProfile decides
+how long each answer takes and how often the provider "fails", so runs are reproducible and need no
+network.
+"""
+import hashlib
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from typing import NamedTuple
+
+REPLAY_MODE = os.getenv("SKILLFORGE_REPLAY", "")  # record | replay
+FIXTURE_DIR = os.getenv("SKILLFORGE_FIXTURE_DIR", "fixtures")
+FAILURES = ("error", "timeout", "garbage")
+GARBAGE_RESPONSE = "Sorry, I can't help with that right now."
+
+class ReplayError(Exception):
+    """A provider failure injected by a ReplayProfile, or a request with no recording in strict mode."""
+
+class ReplayProfile(NamedTuple):
+    latency: float | None = None  # Seconds per call; None replays each call's recorded time
+    scale: float = 1.0  # Multiplies the latency
+    jitter: float = 0.0  # Up to this fraction of the latency is added or removed at random
+    failure_rate: float = 0.0  # Share of calls that fail
+    failure: str = "error"  # error (raise), timeout (wait timeout_seconds, then raise) or garbage (unparseable reply)
+    timeout_seconds: float = 30.0
+    seed: int = 7
+
+def _key(request):
+    return hashlib.sha1(request.encode("utf-8")).hexdigest()
+
+def load_fixture(path):
+    """The recorded calls of a fixture file, in order."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def recording(client, path):
+    """Wrap a Completion or SearchClient so every call is appended to the fixture file at `path`."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    lock = threading.Lock()
+
+    def call(request):
+        started = time.perf_counter()
+        response = client(request)
+        record = {"key": _key(request), "request": request, "response": response,
+                  "seconds": round(time.perf_counter() - started, 4)}
+        with lock, open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        return response
+
+    return call
+
+def replaying(path, profile=ReplayProfile(), strict=False):
+    """A Completion or SearchClient answering from the fixture file at `path` under `profile`."""
+    if profile.failure not in FAILURES:
+        raise ValueError(f"Unknown failure kind: {profile.failure}")
+    records = load_fixture(path)
+    if not records:
+        raise ValueError(f"No recordings in {path}")
+    by_key = {record["key"]: record for record in records}
+    rng = random.Random(profile.seed)
+    lock = threading.Lock()
+    turn = itertools.count()
+
+    def call(request):
+        record = by_key.get(_key(request))
+        with lock:
+            if record is None:
+                if strict:
+                    raise ReplayError(f"No recording for request {_key(request)} in {path}")
+                record = records[next(turn) % len(records)]
+            fails = rng.random() < profile.failure_rate
+            wobble = rng.uniform(-profile.jitter, profile.jitter)
+        seconds = (record["seconds"] if profile.latency is None else profile.latency) * profile.scale * (1 + wobble)
+        if fails and profile.failure == "timeout":
+            time.sleep(profile.timeout_seconds)
+            raise ReplayError(f"Injected timeout after {profile.timeout_seconds}s")
+        time.sleep(max(0.0, seconds))
+        if fails and profile.failure == "error":
+            raise ReplayError("Injected provider error")
+        return GARBAGE_RESPONSE if fails else record["response"]
+
+    return call
+
+def fixture_paths(fixture_dir=FIXTURE_DIR):
+    """(completion.jsonl, search.jsonl) paths in a fixture directory."""
+    return os.path.join(fixture_dir, "completion.jsonl"), os.path.join(fixture_dir, "search.jsonl")
+
+def install(mode=REPLAY_MODE, fixture_dir=FIXTURE_DIR, profile=ReplayProfile()):
+    """Point services.groq_completion and services.duckduckgo_search at recording or replaying clients.
+
+    Pages build their clients through services, so this covers schedule and quiz generation. Does
+    nothing unless `mode` is 'record' or 'replay'.
+    """
+    if not mode:
+        return
+    import services  # Loads pandas; only when recording or replaying
+
+    completion_path, search_path = fixture_paths(fixture_dir)
+    if mode == "record":
+        live_completion, live_search = services.groq_completion, services.duckduckgo_search
+        services.groq_completion = lambda api_key, model: recording(live_completion(api_key, model), completion_path)
+        services.duckduckgo_search = lambda max_results=3: recording(live_search(max_results), search_path)
+    elif mode == "replay":
+        complete, search = replaying(completion_path, profile), replaying(search_path, profile)
+        services.groq_completion = lambda api_key, model: complete
+        services.duckduckgo_search = lambda max_results=3: search
+    else:
+        raise ValueError(f"SKILLFORGE_REPLAY must be 'record' or 'replay', not {mode!r}")
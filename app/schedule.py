@@ -2,124 +2,53 @@ import streamlit as st
 import datetime
 import sqlite3
 import pandas as pd
-from groq import Groq
-from langchain_community.tools import DuckDuckGoSearchRun
 import os
 from dotenv import load_dotenv
+from archive import fetch_schedule_history
+import metrics
+import quiz_bank
+import reminders
+import services
+from util import notify
+from writer import write
 
 # Load environment variables
 load_dotenv()
 
 # Helper functions
 def search_duckduckgo(query, max_results=3):
-    """Search DuckDuckGo for relevant resources."""
+    """Search DuckDuckGo for relevant resources; errors are shown and the schedule is built without them."""
     try:
-        search = DuckDuckGoSearchRun()
-        results = search.invoke(query, max_results=max_results)
-        return results
+        return services.duckduckgo_search(max_results)(query)
     except Exception as e:
         st.error(f"❌ Error searching DuckDuckGo: {str(e)}")
         return []
 
-def fetch_task_details(conn, topic_id):
-    """Fetch details of a specific task from the database."""
-    query = """
-        SELECT title, due_date, status, progress, priority, category 
-        FROM topic 
-        WHERE topic_id = ? AND status in ('Not Started', 'Pending', 'In Progress')
-        ORDER BY priority DESC
-    """
-    return conn.execute(query, (topic_id,)).fetchall()
-
-def fetch_available_slots(conn, date):
-    """Fetch available slots for a specific date from the database."""
-    query_slot = """
-        SELECT date, time_slot 
-        FROM slot 
-        WHERE date = ? 
-        ORDER BY time_slot DESC
-    """
-    return conn.execute(query_slot, (date,)).fetchall()
-
-def generate_schedule_prompt(category, task_name, from_date, due_date, search_results, available_slots):
-    """Generate the prompt for the LLM."""
-    return f"""
-    Create a detailed breakdown of the {category} - '{task_name}' with subtopics.
-    Assign estimated durations to each subtopic, and create a schedule to complete it between {from_date} and {due_date}.
-    Check the available slots - {available_slots} for the day.
-
-    Here are some relevant resources from DuckDuckGo:
-    {search_results}
-
-    Format the output as a table with exactly 3 columns:
-    1. Subtopic: The name of the subtopic.
-    2. Duration: The estimated duration (e.g., 30 minutes, 1 hour).
-    3. Suggested Time Slot: A suggested time slot (e.g., 10:00 AM - 10:30 AM).
-
-    Separate columns using the '|' symbol. For example:
-    Subtopic | Duration | Suggested Time Slot
-    ---------|----------|--------------------
-    Introduction | 30 minutes | 16-Mar-2025  10:00 AM - 10:30 AM
-    Practice Problems | 1 hour | 16-Mar-2025  10:30 AM - 11:30 AM
-    Review | 30 minutes | 17-Mar-2025  11:30 AM - 12:00 PM
-    """
-
-def save_schedule_to_db(conn, df, due_date, selected_task_id):
-    """Save the generated schedule to the database."""
-    try:
-        # Check if user is logged in
-        if 'user_id' not in st.session_state:
-            st.error("❌ User not logged in. Please log in to save the schedule.")
-            return
-
-        # Check if DataFrame is empty
-        if df.empty:
-            st.warning("⚠️ No data to save. The schedule is empty.")
-            return
-
-        cursor = conn.cursor()
-        for row in df.itertuples(index=False):
-            date_str = str(due_date)
-            time_slot = row[2]
-            subtopic = row[0]
-            completed = row[3] if len(row) > 3 else False
-
-            # Insert into the database
-            cursor.execute("""
-                INSERT INTO schedule (user_id, topic_id, date, time_slot, subtopics, is_completed)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (st.session_state['user_id'], selected_task_id, date_str, time_slot, subtopic, completed))
-
-        # Commit the transaction
-        conn.commit()
-        st.success("📁 Schedule saved to database!")
-
-    except sqlite3.Error as e:
-        st.error(f"❗ Error saving schedule to database: {str(e)}")
-    except Exception as e:
-        st.error(f"❗ An unexpected error occurred: {str(e)}")
-
 def display_saved_schedules(conn):
     """Display saved schedules from the database."""
     st.markdown("### 🗂 Saved Schedules")
-    cur = conn.cursor()
-    cur.execute("""
-        SELECT s.date, s.time_slot, t.title, s.subtopics, s.is_completed 
-        FROM schedule s
-        JOIN topic t ON s.topic_id = t.topic_id
-        WHERE s.user_id = ?
-    """, (st.session_state['user_id'],))
-    saved_schedules = cur.fetchall()
+    include_archived = st.checkbox("🗄️ Include archived schedules", value=False)
+    saved_schedules = fetch_schedule_history(conn, st.session_state['user_id'], include_archived)
 
     if saved_schedules:
-        saved_df = pd.DataFrame(saved_schedules, columns=["Date", "Time Slot", "Task", "Subtopics", "Completed"])
+        saved_df = pd.DataFrame(saved_schedules, columns=["ID", "Date", "Time Slot", "Task", "Subtopics", "Completed", "Archived"])
+        upcoming = saved_df[(saved_df["Archived"] == 0) & ~saved_df["Completed"].astype(bool)]
+        open_sessions = {f"{row['Date']} {row['Time Slot']} · {row['Subtopics']}": row["ID"] for _, row in upcoming.iterrows()}
+        reminder_options = open_sessions
+        saved_df = saved_df.drop(columns=["ID"] if include_archived else ["ID", "Archived"])
         
-        # Calculate percentage completed
-        total_subtopics = len(saved_df)
-        completed_subtopics = saved_df['Completed'].sum()
-        completion_percentage = (completed_subtopics / total_subtopics) * 100 if total_subtopics > 0 else 0
+        # Completion per task is counted by SQL over the active schedule
+        completion = services.completion_by_topic(conn, st.session_state['user_id'])
+        total_sessions = sum(row[2] for row in completion)
+        completed_sessions = sum(row[3] for row in completion)
+        completion_percentage = (completed_sessions / total_sessions) * 100 if total_sessions > 0 else 0
 
         st.write(f"### 📊 Completion Status: {completion_percentage:.2f}%")
+        if completion:
+            st.dataframe(
+                pd.DataFrame([row[1:] for row in completion], columns=["Task", "Sessions", "Completed", "Completion %"]),
+                hide_index=True, use_container_width=True
+            )
 
         # Display the DataFrame with colourful styling
         st.dataframe(
@@ -128,30 +57,42 @@ def display_saved_schedules(conn):
             .apply(lambda x: ['background-color: #f0f4c3' if x.name % 2 == 0 else '' for i in x], axis=1)
         )
 
-        # Add a button to mark subtopics as completed
-        subtopic_to_mark = st.selectbox("Mark a subtopic as completed", saved_df['Subtopics'].tolist())
-        if st.button("Mark as Completed"):
-            cur.execute("""
-                UPDATE schedule 
-                SET is_completed = TRUE 
-                WHERE subtopics = ? AND user_id = ?
-            """, (subtopic_to_mark, st.session_state['user_id']))
-            conn.commit()
-            st.success(f"✅ Subtopic '{subtopic_to_mark}' marked as completed!")
+        # Mark any number of open sessions completed in one write
+        sessions_to_mark = st.multiselect("Mark sessions as completed", list(open_sessions))
+        if st.button("Mark as Completed", disabled=not sessions_to_mark):
+            updated = write(
+                services.complete_sessions, st.session_state['user_id'], [int(open_sessions[s]) for s in sessions_to_mark]
+            )
+            notify(f"{updated} session(s) marked as completed!", icon="✅")
             st.rerun()
 
+        if reminder_options:
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                session_to_remind = st.selectbox("⏰ Remind me about", list(reminder_options))
+            with col2:
+                minutes_before = st.number_input("Minutes before", min_value=0, max_value=10080, value=15, step=5)
+            if st.button("⏰ Set Reminder"):
+                schedule_id = int(reminder_options[session_to_remind])
+                try:
+                    fire_at = write(reminders.set_reminder, st.session_state['user_id'], schedule_id, int(minutes_before))
+                except ValueError as e:
+                    st.error(f"❌ {str(e)}")
+                else:
+                    reminders.start_dispatcher().schedule(schedule_id, fire_at)
+                    notify(f"Reminder set for {fire_at}.", icon="⏰")
+                    st.rerun()
+
     else:
         st.info("ℹ️ No saved schedules yet. Generate one above!")
 
+@metrics.track_page("generate_schedule")
 def generate_schedule(conn):
     st.title("📅 SkillForgeAI- Task Scheduler ")
     col1, col2  = st.columns([1, 1 ])
     
     # Input: Task details
-    tasks = conn.execute(
-        "SELECT topic_id, title, due_date, category, status, progress, priority FROM topic WHERE status != 'Completed' AND user_id = ? ORDER BY priority DESC",
-        (st.session_state['user_id'],)
-    ).fetchall()
+    tasks = services.list_schedulable_tasks(conn, st.session_state['user_id'])
 
     task_options = {task[1]: task[0] for task in tasks}  # Ensure the dictionary is correctly populated
     
@@ -168,21 +109,19 @@ def generate_schedule(conn):
             return
         
         # Fetch task details for the selected task
-        task_details = fetch_task_details(conn, selected_task_id)
+        task_details = services.get_task_details(conn, st.session_state['user_id'], selected_task_id)
         if not task_details:
             st.error("❌ No task details found for the selected task.")
             return
         
-        category = st.text_input("🏷️ Category", value=task_details[0][5])
+        category = st.text_input("🏷️ Category", value=task_details[5])
     
     with col2:
         # Set default due_date to today if task_details is empty
-        due_date = datetime.datetime.now().date() if not task_details else datetime.datetime.strptime(task_details[0][1], "%Y-%m-%d").date()
+        due_date = datetime.datetime.now().date() if not task_details else datetime.datetime.strptime(task_details[1], "%Y-%m-%d").date()
         from_date = st.date_input("📅 Select From Date", value=datetime.datetime.now().date())
         due_date = st.date_input("📅 Select Due Date", value=due_date)
     
-    # Fetch available slots
-    available_slots = fetch_available_slots(conn, due_date)
     st.divider()
     # LLM Selection
     col1, col2, col3 = st.columns([1, 1, 1])
@@ -198,7 +137,7 @@ def generate_schedule(conn):
     if st.button("🚀 Generate Schedule") and selected_task_name:
         # Initialize the selected LLM
         if llm_provider == "Groq":
-            llm = Groq(api_key=st.secrets["general"]["groq_api_key"])
+            complete = services.groq_completion(st.secrets["general"]["groq_api_key"], model_name)
         
         # elif llm_provider == "Hugging Face":
         #     llm = HuggingFacePipeline.from_model_id(model_id=model_name, task="text-generation")
@@ -212,45 +151,20 @@ def generate_schedule(conn):
             st.error("❌ Invalid LLM provider selected.")
             return
 
-        # Store the LLM in session state
-        st.session_state['llm'] = llm
-
-        # Search DuckDuckGo for relevant resources
-        search_query = f"{category} {selected_task_name} resources"
-        search_results = search_duckduckgo(search_query, max_results=3)
-
-        # Prepare the prompt for the LLM
-        prompt = generate_schedule_prompt(category, selected_task_name, from_date, due_date, search_results, available_slots)
-
         try:
             with st.spinner("⏳ Generating schedule..."):   
-                # Use the selected LLM to generate the schedule
-                if llm_provider == "Groq":
-                    response = llm.chat.completions.create(
-                        messages=[{"role": "user", "content": prompt}],
-                        model=model_name,
-                    )
-                    schedule_text = response.choices[0].message.content
-                else:
-                    response = llm.invoke(prompt)
-                    schedule_text = response
-
+                # Resources are searched on DuckDuckGo and passed to the LLM with the task and free slots
+                items = services.generate_schedule(
+                    conn, st.session_state['user_id'], selected_task_id, from_date, due_date, category,
+                    complete=complete, search=search_duckduckgo
+                )
                 st.success("✅ Schedule generated!")
 
             # Display the schedule
             st.markdown("### 📌 Your AI-Generated Schedule")
 
-            # Parse the schedule text into a table
-            schedule_lines = schedule_text.strip().split('\n')
-
-            # Skip the first two rows (header and separator) and process the rest
-            schedule_data = [line.split('|')[1:] for line in schedule_lines[2:] if '|' in line]
-
-            # Parse the schedule text into a table
-            schedule_data = [row[:3] for row in schedule_data if len(row) >= 3]
-
             # Create the DataFrame
-            df = pd.DataFrame(schedule_data, columns=["Subtopic", "Duration", "Time Slot"])
+            df = pd.DataFrame(items, columns=["Subtopic", "Duration", "Time Slot"])
             df['Subtopic'] = '🔹 ' + df['Subtopic']
 
             # Add a column for marking subtopics as completed
@@ -267,7 +181,16 @@ def generate_schedule(conn):
             st.session_state['df'] = df
 
             # Save schedule to DB
-            save_schedule_to_db(conn, df, due_date, selected_task_id)
+            if not items:
+                st.warning("⚠️ No data to save. The schedule is empty.")
+            else:
+                try:
+                    write(services.save_schedule, st.session_state['user_id'], selected_task_id, due_date, items)
+                    st.success("📁 Schedule saved to database!")
+                    # Question banks for the new subtopics are generated in the background for the Quiz page
+                    quiz_bank.pregenerate(selected_task_name, [item.subtopic for item in items], complete)
+                except (ValueError, sqlite3.Error) as e:
+                    st.error(f"❗ Error saving schedule to database: {str(e)}")
 
         except Exception as e:
             st.error(f"❗ Error generating schedule: {str(e)}")
@@ -0,0 +1,77 @@
+import re
+import streamlit as st
+
+# bm25 column weights for (owner, title, body, tags); the owner token only scopes results
+RANK_WEIGHTS = (0.0, 10.0, 3.0, 5.0)
+
+def build_match_query(user_id, text):
+    """Turn free text into an FTS5 query: every word is a prefix term, scoped to the user's documents."""
+    terms = re.findall(r"\w+", text.lower())
+    if not terms:
+        return None
+    # Quoting keeps FTS5 operators typed by the user (AND, NEAR, ^, ...) from being interpreted
+    return f'owner:"u{int(user_id)}" AND ' + " ".join(f'"{term}"*' for term in terms)
+
+def search(conn, user_id, text, limit=20):
+    """Search the user's topics and scheduled subtopics, best matches first."""
+    match_query = build_match_query(user_id, text)
+    if match_query is None:
+        return []
+
+    hits = conn.execute(
+        f"""
+        SELECT rowid, title, snippet(search_index, 2, '**', '**', '…', 12)
+        FROM search_index
+        WHERE search_index MATCH ?
+        ORDER BY bm25(search_index, {', '.join(map(str, RANK_WEIGHTS))})
+        LIMIT ?
+        """,
+        (match_query, limit)
+    ).fetchall()
+
+    # Odd rowids are schedule rows; look up their topic and slot in one query
+    schedule_ids = [rowid // 2 for rowid, _, _ in hits if rowid % 2]
+    schedule_info = {}
+    if schedule_ids:
+        schedule_info = {
+            row[0]: row[1:]
+            for row in conn.execute(
+                f"""
+                SELECT s.schedule_id, t.title, s.date, s.time_slot
+                FROM schedule s
+                JOIN topic t ON s.topic_id = t.topic_id
+                WHERE s.schedule_id IN ({', '.join('?' * len(schedule_ids))})
+                """,
+                schedule_ids
+            )
+        }
+
+    results = []
+    for rowid, title, snippet in hits:
+        if rowid % 2:
+            topic_title, date, time_slot = schedule_info.get(rowid // 2, (None, None, None))
+            results.append({
+                "kind": "subtopic", "id": rowid // 2, "title": title,
+                "context": f"{topic_title} · {date} {time_slot}"
+            })
+        else:
+            results.append({"kind": "topic", "id": rowid // 2, "title": title, "context": snippet})
+    return results
+
+def search_box(conn, user_id):
+    """Render the sidebar search box and its results."""
+    query = st.sidebar.text_input("🔍 Search", placeholder="Topics, tags, subtopics...", key="search_query")
+    if not query:
+        return
+    try:
+        results = search(conn, user_id, query)
+    except Exception as e:
+        st.sidebar.error(f"❌ Error searching: {str(e)}")
+        return
+
+    if results:
+        for result in results:
+            icon = "📋" if result["kind"] == "topic" else "🔹"
+            st.sidebar.markdown(f"{icon} **{result['title']}**  \n{result['context'] or ''}")
+    else:
+        st.sidebar.info("ℹ️ No matches found.")
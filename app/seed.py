@@ -0,0 +1,179 @@
+"""Populate a database with synthetic SkillForgeAI data for benchmarking.
+
+    python app/seed.py --db bench.db --scale production   # ~10k users, ~1M slots, ~5M schedule rows
+"""
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+from db import init_db
+from tags import migrate_topic_tags
+from timer import record_sessions
+
+# Rows generated per user at each scale: (users, topics per user, slots per topic, schedule rows per topic)
+SCALES = {
+    "small": (100, 10, 10, 50),
+    "medium": (1000, 10, 10, 50),
+    "production": (10000, 10, 10, 50),
+}
+
+STATUSES = (["Not Started", "Pending", "In Progress", "Completed"], [20, 25, 30, 25])
+PRIORITIES = (["High", "Medium", "Low"], [25, 50, 25])
+RECURRENCES = (["None", "Daily", "Weekly", "Monthly"], [60, 20, 15, 5])
+CATEGORIES = [
+    "Programming", "Mathematics", "Science", "Engineering", "Language Learning",
+    "Personal Development", "Technology", "Finance", "Design", "Music"
+]
+SUBJECTS = [
+    "Python", "Calculus", "Linear Algebra", "Statistics", "Spanish", "Public Speaking", "React",
+    "Machine Learning", "Databases", "Physics", "Guitar", "Photography", "Rust", "Accounting"
+]
+TAGS = ["Python", "Math", "Study", "Exam", "Work", "Hobby", "Career", "Daily", "Reading", "Practice"]
+STEPS = ["Introduction to", "Fundamentals of", "Practice Problems:", "Deep Dive:", "Review of", "Project:"]
+
+CHUNK_SIZE = 50000
+SEARCH_TRIGGERS = [
+    "trg_topic_search_insert", "trg_topic_search_update", "trg_topic_search_delete",
+    "trg_schedule_search_insert", "trg_schedule_search_update", "trg_schedule_search_delete",
+]
+
+def _chunks(rows, size=CHUNK_SIZE):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _time_slot(rng, minutes=None):
+    # Mostly on the half-hour grid; some quarter-hour offsets produce overlapping slots
+    start = datetime(2000, 1, 1, rng.randint(6, 21), rng.choice([0, 30, 30, 30, 15]))
+    end = start + timedelta(minutes=minutes or rng.choice([30, 30, 60, 90]))
+    return f"{start.strftime('%I:%M %p')} - {end.strftime('%I:%M %p')}"
+
+def generate(db_path, users=100, topics_per_user=10, slots_per_topic=10, schedule_per_topic=50,
+             sessions_per_topic=3, seed=42, today=None):
+    """Fill `db_path` with synthetic users, topics, slots, schedules and study sessions. Returns row counts."""
+    rng = random.Random(seed)
+    today = today or date.today()
+    conn = init_db(db_path)
+
+    # Bulk load without the per-row search triggers; init_db rebuilds the index at the end
+    for trigger in SEARCH_TRIGGERS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    conn.execute("DROP TABLE IF EXISTS search_index")
+    conn.execute("DROP TABLE IF EXISTS topic_tag")
+    conn.commit()
+
+    first_user = (conn.execute("SELECT MAX(user_id) FROM user").fetchone()[0] or 0) + 1
+    for chunk in _chunks((f"user{first_user + i}", "seed:seed") for i in range(users)):
+        conn.executemany("INSERT INTO user (username, password) VALUES (?, ?)", chunk)
+    conn.commit()
+    user_ids = range(first_user, first_user + users)
+
+    # Topics: topic count per user varies around the mean
+    def topic_rows():
+        for user_id in user_ids:
+            for _ in range(rng.randint(1, 2 * topics_per_user - 1)):
+                from_date = today - timedelta(days=rng.randint(0, 180))
+                due_date = from_date + timedelta(days=rng.randint(7, 90))
+                subject = rng.choice(SUBJECTS)
+                yield (
+                    user_id, f"Learn {subject}", f"Study plan for {subject}. " * rng.randint(1, 20),
+                    from_date.isoformat(), due_date.isoformat(),
+                    rng.choices(*STATUSES)[0], rng.choices(*PRIORITIES)[0], rng.randint(0, 100),
+                    rng.choice(CATEGORIES), rng.choices(*RECURRENCES)[0], ", ".join(rng.sample(TAGS, rng.randint(0, 3)))
+                )
+    first_topic = (conn.execute("SELECT MAX(topic_id) FROM topic").fetchone()[0] or 0) + 1
+    for chunk in _chunks(topic_rows()):
+        conn.executemany(
+            """
+            INSERT INTO topic (user_id, title, description, from_date, due_date, status, priority, progress, category, recurrence, tags)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            chunk
+        )
+        conn.commit()
+    topics = conn.execute(
+        "SELECT topic_id, user_id, from_date, due_date, status, recurrence, title FROM topic WHERE topic_id >= ?",
+        (first_topic,)
+    ).fetchall()
+
+    # Slots: recurring topics get a run of consecutive days/weeks, others scattered dates
+    def slot_rows():
+        for topic_id, user_id, from_date, due_date, _, recurrence, _ in topics:
+            start = date.fromisoformat(from_date)
+            span = max((date.fromisoformat(due_date) - start).days, 1)
+            step = {"Daily": 1, "Weekly": 7, "Monthly": 30}.get(recurrence)
+            time_slot = _time_slot(rng)
+            for i in range(rng.randint(1, 2 * slots_per_topic - 1)):
+                if step:
+                    yield user_id, topic_id, (start + timedelta(days=(i * step) % span)).isoformat(), time_slot
+                else:
+                    yield user_id, topic_id, (start + timedelta(days=rng.randint(0, span))).isoformat(), _time_slot(rng)
+    for chunk in _chunks(slot_rows()):
+        conn.executemany("INSERT OR IGNORE INTO slot (user_id, topic_id, date, time_slot) VALUES (?, ?, ?, ?)", chunk)
+        conn.commit()
+
+    # Schedules: completed topics are fully done, in-progress ones partly
+    def schedule_rows():
+        for topic_id, user_id, from_date, due_date, status, _, title in topics:
+            start = date.fromisoformat(from_date)
+            span = max((date.fromisoformat(due_date) - start).days, 1)
+            done_ratio = {"Completed": 1.0, "In Progress": rng.random(), "Pending": 0.1}.get(status, 0.0)
+            for i in range(rng.randint(1, 2 * schedule_per_topic - 1)):
+                yield (
+                    user_id, topic_id, (start + timedelta(days=rng.randint(0, span))).isoformat(),
+                    _time_slot(rng), f"{rng.choice(STEPS)} {title[6:]} part {i + 1}", rng.random() < done_ratio
+                )
+    for chunk in _chunks(schedule_rows()):
+        conn.executemany(
+            "INSERT INTO schedule (user_id, topic_id, date, time_slot, subtopics, is_completed) VALUES (?, ?, ?, ?, ?, ?)",
+            chunk
+        )
+        conn.commit()
+
+    # Study sessions go through the real ingestion path so the daily rollup is maintained
+    def session_rows():
+        for topic_id, user_id, from_date, _, _, _, _ in topics:
+            for _ in range(rng.randint(0, 2 * sessions_per_topic)):
+                start = datetime.combine(
+                    date.fromisoformat(from_date) + timedelta(days=rng.randint(0, 60)), datetime.min.time()
+                ) + timedelta(minutes=rng.randint(6 * 60, 22 * 60))
+                yield {
+                    "user_id": user_id, "topic_id": topic_id, "start_time": start,
+                    "end_time": start + timedelta(minutes=rng.randint(10, 120)), "notes": None,
+                }
+    for chunk in _chunks(session_rows()):
+        record_sessions(conn, chunk)
+
+    conn.close()
+    # Recreates the search index and tag tables and backfills them from the loaded rows
+    conn = init_db(db_path)
+    conn.execute("ANALYZE")
+    conn.commit()
+
+    counts = {
+        table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in ("user", "topic", "slot", "schedule", "time_tracking", "time_tracking_daily", "topic_tag")
+    }
+    conn.close()
+    return counts
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic SkillForgeAI data.")
+    parser.add_argument("--db", default="bench.db", help="Database to populate (created if missing)")
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--users", type=int, help="Override the number of users for the scale")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    users, topics_per_user, slots_per_topic, schedule_per_topic = SCALES[args.scale]
+    started = time.perf_counter()
+    counts = generate(
+        args.db, users=args.users or users, topics_per_user=topics_per_user,
+        slots_per_topic=slots_per_topic, schedule_per_topic=schedule_per_topic, seed=args.seed
+    )
+    print(f"Generated in {time.perf_counter() - started:.1f}s: {counts}")
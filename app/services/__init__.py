@@ -0,0 +1,25 @@
+"""UI-free API over tasks, slots and scheduling.
+
+Every function takes an open connection first and the acting user's id, validates its input
+(raising ValueError), and writes atomically through db.transaction. The Streamlit pages are thin
+callers of these; anything else (scripts, load tests, other front ends) can call them directly.
+"""
+from services.tasks import (
+    PAGE_SIZE, TASK_CATEGORIES, TASK_PRIORITIES, TASK_RECURRENCES, TASK_STATUSES,
+    create_task, create_tasks, delete_task, get_task_description, get_task_details, list_schedulable_tasks,
+    list_task_titles, list_tasks_page, update_task_description, update_tasks,
+)
+from services.slots import (
+    SLOT_HORIZON_DAYS, add_slots, delete_slots, extend_slot_rules, format_slot, generate_slots, has_conflict,
+    is_overlap, list_available_slots, list_slots, list_slots_on_date, save_slot_changes, validate_time_slot,
+)
+from services.quizzes import (
+    QUIZ_BANK_SIZE, QUIZ_LENGTH, QuizQuestion, bank_key, build_quiz_prompt, claim_quiz_banks, fail_quiz_bank,
+    generate_quiz_bank, list_quiz_subtopics, parse_questions, quiz_bank_status, quiz_stats_by_topic, record_quiz_result, sample_quiz,
+    store_quiz_bank,
+)
+from services.replanning import Replan, follow_edited_slots, link_slots, replan_sessions, sessions_in_slots
+from services.scheduling import (
+    Completion, ScheduleItem, SearchClient, build_prompt, complete_sessions, completion_by_topic, duckduckgo_search,
+    generate_schedule, groq_completion, parse_schedule, save_schedule,
+)
@@ -0,0 +1,133 @@
+"""Quiz question banks and results without Streamlit.
+
+A bank holds the multiple-choice questions for one subtopic of a task. Banks are keyed by the
+normalised task title and subtopic, so learners scheduling the same material share one bank and it
+is generated once. Questions are stored deduplicated by their normalised text; a quiz is a random
+sample of its bank, graded here and recorded in quiz_result.
+"""
+import hashlib
+import json
+import random
+import re
+import sqlite3
+from typing import NamedTuple
+import queries
+from db import transaction
+from services.scheduling import Completion
+
+QUIZ_BANK_SIZE = 10  # Questions asked of the LLM per bank
+QUIZ_LENGTH = 5  # Questions per quiz
+
+class QuizQuestion(NamedTuple):
+    question: str
+    choices: list[str]
+    answer: int  # Index into choices
+
+def _normalise(text: str) -> str:
+    return re.sub(r"[\W_]+", " ", text).strip().lower()
+
+def bank_key(title: str, subtopic: str) -> str:
+    return hashlib.sha1(f"{_normalise(title)}\n{_normalise(subtopic)}".encode("utf-8")).hexdigest()
+
+def build_quiz_prompt(title: str, subtopic: str, count: int = QUIZ_BANK_SIZE) -> str:
+    """Generate the prompt asking the LLM for a subtopic's question bank."""
+    return f"""
+    Write {count} multiple-choice questions testing the subtopic '{subtopic}' of '{title}'.
+    Each question has exactly 4 options and one correct answer.
+
+    Format the output as a table with exactly 6 columns, separated by the '|' symbol:
+    Question | A | B | C | D | Answer
+    ---------|---|---|---|---|-------
+    Which keyword defines a function in Python? | func | def | lambda | fn | B
+    """
+
+def parse_questions(text: str) -> list[QuizQuestion]:
+    """Parse the '|'-separated question table in an LLM reply; malformed rows are skipped."""
+    questions = []
+    for line in text.strip().splitlines():
+        cells = [cell.strip() for cell in line.strip().strip("|").split("|")]
+        if len(cells) < 6 or cells[0].lower() == "question" or all(set(cell) <= set("-: ") for cell in cells):
+            continue
+        letter = cells[5].strip(" .)").upper()[:1]
+        choices = cells[1:5]
+        if not letter or letter not in "ABCD" or not all(choices):
+            continue
+        questions.append(QuizQuestion(cells[0], choices, "ABCD".index(letter)))
+    return questions
+
+def claim_quiz_banks(conn: sqlite3.Connection, title: str, subtopics: list[str]) -> list[tuple[int, str]]:
+    """Register banks for the subtopics; returns (quiz_bank_id, subtopic) of those that need generating.
+
+    Banks already pending or ready are not returned, so each is generated once; failed ones, and pending
+    ones abandoned for ten minutes, are handed out again.
+    """
+    claimed = []
+    with transaction(conn):
+        for subtopic in dict.fromkeys(subtopics):
+            row = conn.execute(queries.CLAIM_QUIZ_BANK, (bank_key(title, subtopic), title, subtopic)).fetchone()
+            if row:
+                claimed.append((row[0], subtopic))
+    return claimed
+
+def store_quiz_bank(conn: sqlite3.Connection, quiz_bank_id: int, questions: list[QuizQuestion]) -> int:
+    """Add questions to a bank (repeats are ignored) and mark it ready, or failed if none parsed; returns added."""
+    with transaction(conn):
+        cursor = conn.executemany(
+            queries.INSERT_QUIZ_QUESTION,
+            [
+                (quiz_bank_id, q.question, json.dumps(q.choices), q.answer,
+                 hashlib.sha1(_normalise(q.question).encode("utf-8")).hexdigest())
+                for q in questions
+            ]
+        )
+        conn.execute(queries.SET_QUIZ_BANK_STATUS, ("ready" if questions else "failed", quiz_bank_id))
+    return cursor.rowcount
+
+def fail_quiz_bank(conn: sqlite3.Connection, quiz_bank_id: int) -> None:
+    with transaction(conn):
+        conn.execute(queries.SET_QUIZ_BANK_STATUS, ("failed", quiz_bank_id))
+
+def generate_quiz_bank(title: str, subtopic: str, complete: Completion) -> list[QuizQuestion]:
+    """Ask the LLM for a subtopic's questions. Nothing is saved."""
+    return parse_questions(complete(build_quiz_prompt(title, subtopic)))
+
+def list_quiz_subtopics(conn: sqlite3.Connection, user_id: int) -> list[tuple[int, str, str]]:
+    """(topic_id, title, subtopic) of every subtopic in the user's schedules."""
+    return conn.execute(queries.QUIZ_SUBTOPICS, (user_id,)).fetchall()
+
+def quiz_bank_status(conn: sqlite3.Connection, title: str, subtopic: str) -> tuple[int, str] | None:
+    """(quiz_bank_id, status) of a subtopic's bank, or None if none was requested."""
+    return conn.execute(queries.QUIZ_BANK_STATUS, (bank_key(title, subtopic),)).fetchone()
+
+def sample_quiz(conn: sqlite3.Connection, quiz_bank_id: int, count: int = QUIZ_LENGTH) -> list[tuple[int, str, list[str]]]:
+    """Up to `count` random questions of a bank as (quiz_question_id, question, choices), choices shuffled.
+
+    Correct answers are not returned; grade with record_quiz_result.
+    """
+    quiz = []
+    for question_id, question, choices in conn.execute(queries.SAMPLE_QUIZ_QUESTIONS, (quiz_bank_id, count)):
+        choices = json.loads(choices)
+        random.shuffle(choices)
+        quiz.append((question_id, question, choices))
+    return quiz
+
+def record_quiz_result(conn: sqlite3.Connection, user_id: int, topic_id: int, subtopic: str,
+                       answers: dict[int, str | None]) -> tuple[int, int]:
+    """Grade {quiz_question_id: chosen text or None} and store it in quiz_result; returns (score, total)."""
+    if not conn.execute(queries.OWNED_TOPIC_IDS, (user_id, json.dumps([topic_id]))).fetchone():
+        raise ValueError(f"Unknown topic: {topic_id}")
+    correct = {
+        question_id: json.loads(choices)[answer]
+        for question_id, choices, answer in conn.execute(queries.QUIZ_ANSWERS, (json.dumps(list(answers)),))
+    }
+    if len(correct) < len(answers):
+        raise ValueError("Unknown quiz question.")
+    score = sum(1 for question_id, chosen in answers.items() if chosen is not None and chosen == correct[question_id])
+    answered = sum(1 for chosen in answers.values() if chosen is not None)
+    with transaction(conn):
+        conn.execute(queries.INSERT_QUIZ_RESULT, (user_id, topic_id, subtopic, answered, score, len(answers)))
+    return score, len(answers)
+
+def quiz_stats_by_topic(conn: sqlite3.Connection, user_id: int) -> list[tuple]:
+    """(title, attempts, average %, best %, last taken) per task the user took quizzes on."""
+    return conn.execute(queries.QUIZ_STATS_BY_TOPIC, (user_id,)).fetchall()
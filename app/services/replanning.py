@@ -0,0 +1,107 @@
+"""Keep saved schedules attached to slots as the slots change, without asking the LLM again.
+
+A schedule row that matched one of its task's slots when it was saved remembers it in `slot_id`.
+When slots are edited their open sessions move with them; when slots are deleted only the sessions
+that lost their slot are moved, in order, to the task's earliest free slots from their old date on.
+Everything else in the plan, including the LLM's subtopic breakdown, is left as it is.
+"""
+import json
+import re
+import sqlite3
+from datetime import date, datetime
+from typing import NamedTuple
+import queries
+import reminders
+
+SLOT_FORMAT = "%I:%M %p"
+# 'HH:MM AM - HH:MM PM', optionally after a '16-Mar-2025' date as the LLM writes them
+ITEM_SLOT = re.compile(
+    r"(?:(\d{1,2}-[A-Za-z]{3}-\d{4})\s+)?(\d{1,2}:\d{2}\s*[AP]M)\s*-\s*(\d{1,2}:\d{2}\s*[AP]M)", re.IGNORECASE
+)
+
+class Replan(NamedTuple):
+    moved: list[int]  # schedule_ids given a new slot
+    unplaced: list[int]  # schedule_ids whose slot is gone and for which no free slot was left
+    reminders: list[tuple[int, str]]  # (schedule_id, fire_at) of reminders re-armed for moved sessions
+
+def _start(on_date: str, time_slot: str) -> tuple[str, datetime]:
+    return on_date, datetime.strptime(time_slot.split(" - ")[0].strip().upper(), SLOT_FORMAT)
+
+def match_slot(time_slot: str, on_date: date) -> tuple[str, str] | None:
+    """The (date, normalised time slot) an LLM 'Suggested Time Slot' refers to.
+
+    None if it has no times or they do not exist ('13:00 PM', '31-Feb-2025'); such items stay unbooked.
+    """
+    match = ITEM_SLOT.search(time_slot)
+    if not match:
+        return None
+    try:
+        slot_date = datetime.strptime(match[1], "%d-%b-%Y").date() if match[1] else on_date
+        start, end = (datetime.strptime(t.replace(" ", "").upper(), "%I:%M%p").strftime(SLOT_FORMAT) for t in match.group(2, 3))
+    except ValueError:
+        return None
+    return str(slot_date), f"{start} - {end}"
+
+def link_slots(conn: sqlite3.Connection, topic_id: int, on_date: date, time_slots: list[str]) -> list[int | None]:
+    """slot_id of the task's slot each suggested time slot falls in (each slot used once), else None.
+
+    The caller checks that the task is the user's (see save_schedule).
+    """
+    by_date, taken, slot_ids = {}, set(), []
+    for time_slot in time_slots:
+        target = match_slot(time_slot, on_date)
+        slot_id = None
+        if target:
+            if target[0] not in by_date:
+                by_date[target[0]] = {slot: sid for sid, slot in conn.execute(queries.SLOTS_ON_DATE, (topic_id, target[0]))}
+            slot_id = by_date[target[0]].get(target[1])
+            if slot_id in taken:
+                slot_id = None
+        if slot_id is not None:
+            taken.add(slot_id)
+        slot_ids.append(slot_id)
+    return slot_ids
+
+def _rearm_reminders(conn: sqlite3.Connection, user_id: int, schedule_ids: list[int]) -> list[tuple[int, str]]:
+    """Recompute the reminders of moved sessions; those whose session has started are cleared."""
+    rearmed = []
+    for schedule_id, minutes in conn.execute(queries.REMINDERS_OF_SESSIONS, (json.dumps(schedule_ids),)).fetchall():
+        try:
+            rearmed.append((schedule_id, reminders.set_reminder(conn, user_id, schedule_id, int(minutes))))
+        except ValueError:
+            reminders.set_reminder(conn, user_id, schedule_id, None)
+    return rearmed
+
+def sessions_in_slots(conn: sqlite3.Connection, user_id: int, slot_ids: list[int]) -> list[tuple]:
+    """(schedule_id, topic_id, date, time_slot) of the open sessions booked into the user's slots."""
+    return conn.execute(queries.SESSIONS_IN_SLOTS, (json.dumps(slot_ids), user_id)).fetchall()
+
+def replan_sessions(conn: sqlite3.Connection, user_id: int, sessions: list[tuple], today: date | None = None) -> Replan:
+    """Move sessions that lost their slot into their task's free slots, keeping their order.
+
+    Each session takes the earliest free slot on or after its old date, or failing that the earliest
+    free slot from today. Call inside the transaction that removed the slots.
+    """
+    today = str(today or date.today())
+    moved, unplaced = [], []
+    free = {}  # {topic_id: [(date, start, slot_id, time_slot), ...]} sorted by start
+    for schedule_id, topic_id, old_date, old_slot in sorted(sessions, key=lambda s: (s[1], *_start(s[2], s[3]))):
+        if topic_id not in free:
+            free[topic_id] = sorted(
+                (*_start(on_date, slot), slot_id, slot)
+                for slot_id, on_date, slot in conn.execute(queries.FREE_TOPIC_SLOTS, (topic_id, today))
+            )
+        candidates = free[topic_id]
+        pick = next((c for c in candidates if c[0] >= old_date), candidates[0] if candidates else None)
+        if pick is None:
+            unplaced.append(schedule_id)
+            continue
+        candidates.remove(pick)
+        conn.execute(queries.MOVE_SESSION, (pick[2], pick[0], pick[3], schedule_id))
+        moved.append(schedule_id)
+    return Replan(moved, unplaced, _rearm_reminders(conn, user_id, moved))
+
+def follow_edited_slots(conn: sqlite3.Connection, user_id: int, slot_ids: list[int]) -> Replan:
+    """Move the open sessions of edited slots to the slots' new date and time."""
+    moved = [row[0] for row in conn.execute(queries.FOLLOW_EDITED_SLOTS, (json.dumps(slot_ids), user_id)).fetchall()]
+    return Replan(moved, [], _rearm_reminders(conn, user_id, moved))
@@ -0,0 +1,143 @@
+"""LLM schedule generation and persistence without Streamlit.
+
+The LLM and web search are passed in as plain callables, so callers (and load tests) can swap in
+any provider or a fake without touching this module.
+"""
+import json
+import sqlite3
+from collections.abc import Callable
+from datetime import date
+from typing import NamedTuple
+import metrics
+import queries
+from db import transaction
+from recurrence import next_occurrences
+from services.replanning import link_slots, match_slot
+from services.slots import list_available_slots
+from services.tasks import get_task_details
+
+Completion = Callable[[str], str]  # prompt -> completion text
+SearchClient = Callable[[str], str]  # query -> result text
+MAX_PROMPT_SESSION_DATES = 14  # Occurrences of a recurring task listed in the prompt
+
+class ScheduleItem(NamedTuple):
+    subtopic: str
+    duration: str
+    time_slot: str
+
+def groq_completion(api_key: str, model: str) -> Completion:
+    """Return a Completion backed by Groq chat completions, with latency and token metrics."""
+    from groq import Groq  # Heavy; only loaded when a schedule is generated
+
+    client = Groq(api_key=api_key)
+
+    def complete(prompt):
+        with metrics.timed(metrics.LLM_REQUEST_SECONDS, provider="groq", model=model):
+            response = client.chat.completions.create(messages=[{"role": "user", "content": prompt}], model=model)
+        metrics.record_llm_usage("groq", model, response.usage)
+        return response.choices[0].message.content
+
+    return complete
+
+def duckduckgo_search(max_results: int = 3) -> SearchClient:
+    """Return a SearchClient backed by DuckDuckGo, with latency metrics."""
+    from langchain_community.tools import DuckDuckGoSearchRun  # Heavy; only loaded when generating
+
+    tool = DuckDuckGoSearchRun()
+
+    def search(query):
+        with metrics.timed(metrics.SEARCH_REQUEST_SECONDS, provider="duckduckgo"):
+            return tool.invoke(query, max_results=max_results)
+
+    return search
+
+def build_prompt(category, task_name, from_date, due_date, search_results, available_slots, session_dates=None) -> str:
+    """Generate the prompt for the LLM; `session_dates` restricts a recurring task to its occurrence dates."""
+    recurring = (
+        f" It is a recurring task: schedule sessions only on {', '.join(f'{d:%d-%b-%Y}' for d in session_dates)}."
+        if session_dates else ""
+    )
+    return f"""
+    Create a detailed breakdown of the {category} - '{task_name}' with subtopics.
+    Assign estimated durations to each subtopic, and create a schedule to complete it between {from_date} and {due_date}.
+    Check the available slots - {available_slots} for the day.{recurring}
+
+    Here are some relevant resources from DuckDuckGo:
+    {search_results}
+
+    Format the output as a table with exactly 3 columns:
+    1. Subtopic: The name of the subtopic.
+    2. Duration: The estimated duration (e.g., 30 minutes, 1 hour).
+    3. Suggested Time Slot: A suggested time slot (e.g., 10:00 AM - 10:30 AM).
+
+    Separate columns using the '|' symbol. For example:
+    Subtopic | Duration | Suggested Time Slot
+    ---------|----------|--------------------
+    Introduction | 30 minutes | 16-Mar-2025  10:00 AM - 10:30 AM
+    Practice Problems | 1 hour | 16-Mar-2025  10:30 AM - 11:30 AM
+    Review | 30 minutes | 17-Mar-2025  11:30 AM - 12:00 PM
+    """
+
+def parse_schedule(text: str) -> list[ScheduleItem]:
+    """Parse the '|'-separated table in an LLM reply, with or without outer pipes; other lines are ignored."""
+    items = []
+    for line in text.strip().splitlines():
+        if "|" not in line:
+            continue
+        cells = [cell.strip() for cell in line.strip().strip("|").split("|")]
+        if len(cells) < 3 or all(set(cell) <= set("-: ") for cell in cells):
+            continue  # Too short, or the header separator
+        if cells[0].lower() == "subtopic":
+            continue
+        items.append(ScheduleItem(*cells[:3]))
+    return items
+
+def generate_schedule(conn: sqlite3.Connection, user_id: int, topic_id: int, from_date: date, due_date: date,
+                      category: str, complete: Completion, search: SearchClient | None = None) -> list[ScheduleItem]:
+    """Ask the LLM to break an open task into scheduled subtopics. Nothing is saved."""
+    task = get_task_details(conn, user_id, topic_id)
+    if task is None:
+        raise ValueError("No task details found for the selected task.")
+    title, recurrence = task[0], task[7]
+    session_dates = None
+    if recurrence and recurrence != "None":
+        session_dates = next_occurrences(
+            date.fromisoformat(task[6]), recurrence, after=from_date, limit=MAX_PROMPT_SESSION_DATES, until=due_date
+        )
+    search_results = search(f"{category} {title} resources") if search else ""
+    prompt = build_prompt(
+        category, title, from_date, due_date, search_results, list_available_slots(conn, user_id, due_date), session_dates
+    )
+    return parse_schedule(complete(prompt))
+
+def save_schedule(conn: sqlite3.Connection, user_id: int, topic_id: int, on_date: date,
+                  items: list[ScheduleItem]) -> int:
+    """Persist generated items as not-yet-completed schedule rows; returns rows written.
+
+    Items whose suggested time is one of the task's slots are booked into it (and take its date and
+    time), so the session can be re-planned when the slot changes. Raises ValueError if the task is
+    not the user's.
+    """
+    with transaction(conn):
+        if not conn.execute(queries.OWNED_TOPIC_IDS, (user_id, json.dumps([topic_id]))).fetchone():
+            raise ValueError(f"Unknown topic: {topic_id}")
+        rows = []
+        for item, slot_id in zip(items, link_slots(conn, topic_id, on_date, [item.time_slot for item in items])):
+            # Unbooked items keep the LLM's text but take the date written in it, if any
+            target = match_slot(item.time_slot, on_date)
+            slot_date, time_slot = target if slot_id else (target[0] if target else str(on_date), item.time_slot)
+            rows.append((user_id, topic_id, slot_date, time_slot, item.subtopic, False, slot_id))
+        conn.executemany(queries.INSERT_SCHEDULE_ROW_IN_SLOT, rows)
+    return len(items)
+
+def complete_sessions(conn: sqlite3.Connection, user_id: int, schedule_ids: list[int]) -> int:
+    """Mark the user's schedule rows completed in one statement; returns rows newly completed.
+
+    Triggers roll the change up into topic.progress and status.
+    """
+    with transaction(conn):
+        return conn.execute(queries.MARK_SESSIONS_COMPLETED, (json.dumps(list(schedule_ids)), user_id)).rowcount
+
+def completion_by_topic(conn: sqlite3.Connection, user_id: int) -> list[tuple]:
+    """(topic_id, title, sessions, completed, percent) per task with scheduled sessions."""
+    return conn.execute(queries.COMPLETION_BY_TOPIC, (user_id,)).fetchall()
@@ -0,0 +1,181 @@
+"""Study slot CRUD and conflict checks without Streamlit."""
+import os
+import sqlite3
+from datetime import date, datetime, time, timedelta
+import json
+import queries
+from recurrence import between, occurrences
+from services.replanning import Replan, follow_edited_slots, replan_sessions, sessions_in_slots
+from changeset import ChangeSet, apply_changes
+from db import transaction
+
+SLOT_FORMAT = "%I:%M %p"
+SLOT_COLUMNS = {"ID": "slot_id", "Date": "date", "Time Slot": "time_slot"}  # Editor column -> slot column
+SLOT_HORIZON_DAYS = int(os.getenv("SKILLFORGE_SLOT_HORIZON_DAYS", "28"))  # How far ahead recurring slots exist as rows
+
+def validate_time_slot(slot: str) -> bool:
+    """Validate the time slot format (e.g., 10:00 AM - 11:00 AM)."""
+    try:
+        start_time, end_time = slot.split(" - ")
+        datetime.strptime(start_time.strip(), SLOT_FORMAT)
+        datetime.strptime(end_time.strip(), SLOT_FORMAT)
+        return True
+    except ValueError:
+        return False
+
+def is_overlap(slot1: str, slot2: str) -> bool:
+    """Check if two time slots overlap."""
+    start1, end1 = [datetime.strptime(t.strip(), SLOT_FORMAT) for t in slot1.split(" - ")]
+    start2, end2 = [datetime.strptime(t.strip(), SLOT_FORMAT) for t in slot2.split(" - ")]
+    return not (end1 <= start2 or end2 <= start1)
+
+def format_slot(start: datetime, minutes: int) -> str:
+    return f"{start.strftime(SLOT_FORMAT)} - {(start + timedelta(minutes=minutes)).strftime(SLOT_FORMAT)}"
+
+def list_slots(conn: sqlite3.Connection, topic_id: int, from_date: date, to_date: date) -> list[tuple]:
+    """Return (slot_id, date, time_slot) for a task's slots in a date range."""
+    return conn.execute(queries.SLOTS_IN_RANGE, (topic_id, from_date, to_date)).fetchall()
+
+def list_slots_on_date(conn: sqlite3.Connection, topic_id: int, on_date: date) -> list[tuple]:
+    """Return (slot_id, time_slot) for a task's slots on one date."""
+    return conn.execute(queries.SLOTS_ON_DATE, (topic_id, on_date)).fetchall()
+
+def list_available_slots(conn: sqlite3.Connection, user_id: int, on_date: date) -> list[tuple]:
+    """Return (date, time_slot) of every slot the user has on a date."""
+    return conn.execute(queries.AVAILABLE_SLOTS, (user_id, on_date)).fetchall()
+
+def has_conflict(conn: sqlite3.Connection, topic_id: int, slot: str, from_date: date, to_date: date) -> bool:
+    """Whether `slot` overlaps any of the task's slots in the date range. Raises ValueError on a bad format."""
+    if not validate_time_slot(slot):
+        raise ValueError("Invalid time slot format. Please use the format '10:00 AM - 11:00 AM'.")
+    existing = conn.execute(queries.SLOT_TIMES_IN_RANGE, (topic_id, from_date, to_date)).fetchall()
+    return any(is_overlap(slot, other) for (other,) in existing)
+
+def _fill_date(conn: sqlite3.Connection, user_id: int, topic_id: int, on_date: date, start_time: time,
+               end_time: time, interval: int) -> tuple[int, int]:
+    """Create the `interval`-minute slots of one date, skipping overlaps; returns (saved, overlapping)."""
+    saved, overlapping = 0, 0
+    # Existing slots are read once per date and kept up to date locally
+    existing = [s for (s,) in conn.execute(queries.SLOT_TIMES_ON_DATE, (topic_id, on_date))]
+    current_time = datetime.combine(on_date, start_time)
+    end_time_dt = datetime.combine(on_date, end_time)
+    while current_time < end_time_dt:
+        slot = format_slot(current_time, interval)
+        if any(is_overlap(slot, other) for other in existing):
+            overlapping += 1
+        elif conn.execute(queries.INSERT_SLOT_IF_FREE, (user_id, topic_id, str(on_date), slot)).rowcount:
+            existing.append(slot)
+            saved += 1
+        else:
+            overlapping += 1  # The user already has this time booked for another task
+        current_time += timedelta(minutes=interval)
+    return saved, overlapping
+
+def generate_slots(conn: sqlite3.Connection, user_id: int, topic_id: int, first_date: date, last_date: date,
+                   start_time: time, end_time: time, interval: int, recurrence: str = "None",
+                   today: date | None = None) -> tuple[int, int]:
+    """Create `interval`-minute slots between start_time and end_time on each recurring date.
+
+    A recurring pattern is stored once in slot_rule and only its dates up to SLOT_HORIZON_DAYS from
+    today are turned into slots now; extend_slot_rules() adds later ones as the horizon moves.
+    Slots overlapping an existing one are skipped. Returns (saved, overlapping) for the slots created now.
+    """
+    saved, overlapping = 0, 0
+    with transaction(conn):
+        if recurrence == "None":
+            until = first_date
+        else:
+            horizon = (today or date.today()) + timedelta(days=SLOT_HORIZON_DAYS)
+            until = min(last_date, max(horizon, first_date))  # A rule starting past the horizon still gets its first date
+            conn.execute(
+                queries.INSERT_SLOT_RULE,
+                (user_id, topic_id, str(first_date), str(last_date), recurrence, 1, start_time.strftime("%H:%M"),
+                 end_time.strftime("%H:%M"), interval, str(until))
+            )
+        for on_date in occurrences(first_date, recurrence, until=until):
+            counts = _fill_date(conn, user_id, topic_id, on_date, start_time, end_time, interval)
+            saved, overlapping = saved + counts[0], overlapping + counts[1]
+    return saved, overlapping
+
+def extend_slot_rules(conn: sqlite3.Connection, today: date | None = None) -> int:
+    """Create the slots of every slot_rule date that has come within the horizon; returns slots created."""
+    horizon = (today or date.today()) + timedelta(days=SLOT_HORIZON_DAYS)
+    rules = conn.execute(queries.SLOT_RULES_TO_EXTEND, (str(horizon),)).fetchall()
+    saved = 0
+    with transaction(conn):
+        for (rule_id, user_id, topic_id, first_date, until_date, frequency, interval,
+             start_time, end_time, slot_minutes, materialized_until) in rules:
+            until = min(horizon, date.fromisoformat(until_date)) if until_date else horizon
+            dates = between(
+                date.fromisoformat(first_date), frequency, date.fromisoformat(materialized_until) + timedelta(days=1),
+                until, interval
+            )
+            for on_date in dates:
+                saved += _fill_date(
+                    conn, user_id, topic_id, on_date, time.fromisoformat(start_time), time.fromisoformat(end_time), slot_minutes
+                )[0]
+            conn.execute(queries.SET_SLOT_RULE_MATERIALIZED, (str(until), rule_id))
+    return saved
+
+def add_slots(conn: sqlite3.Connection, user_id: int, slots: list[tuple[int, date, str]]) -> tuple[int, list[tuple[int, str]]]:
+    """Register (topic_id, date, time_slot) slots in one transaction.
+
+    Slots that overlap an existing or earlier slot of the task, or that the user already booked on that
+    date, are skipped. Returns (created, [(index, reason), ...] for the skipped ones). Raises ValueError
+    for malformed time slots or topics the user does not own, before anything is written.
+    """
+    invalid = [index for index, (_, _, slot) in enumerate(slots) if not isinstance(slot, str) or not validate_time_slot(slot)]
+    if invalid:
+        raise ValueError(f"Invalid time slot at index {', '.join(map(str, invalid[:10]))}. Use the format '10:00 AM - 11:00 AM'.")
+    topic_ids = sorted({topic_id for topic_id, _, _ in slots})
+    owned = {row[0] for row in conn.execute(queries.OWNED_TOPIC_IDS, (user_id, json.dumps(topic_ids)))}
+    if len(owned) < len(topic_ids):
+        raise ValueError(f"Unknown topic(s): {', '.join(str(t) for t in topic_ids if t not in owned)}")
+
+    created, skipped = 0, []
+    existing = {}  # {(topic_id, date): [time_slot, ...]}, read once per pair
+    with transaction(conn):
+        for index, (topic_id, on_date, slot) in enumerate(slots):
+            key = (topic_id, str(on_date))
+            if key not in existing:
+                existing[key] = [s for (s,) in conn.execute(queries.SLOT_TIMES_ON_DATE, key)]
+            if any(is_overlap(slot, other) for other in existing[key]):
+                skipped.append((index, "overlaps an existing slot"))
+            elif conn.execute(queries.INSERT_SLOT_IF_FREE, (user_id, topic_id, str(on_date), slot)).rowcount:
+                existing[key].append(slot)
+                created += 1
+            else:
+                skipped.append((index, "already booked on that date"))
+    return created, skipped
+
+def save_slot_changes(conn: sqlite3.Connection, user_id: int, topic_id: int, changes: ChangeSet) -> Replan:
+    """Apply edited slot rows (columns from SLOT_COLUMNS) and re-plan the sessions booked into them.
+
+    Sessions follow an edited slot; those of deleted slots move to free slots (see replanning).
+    Raises ValueError for malformed time slots and sqlite3.IntegrityError for a double booking.
+    """
+    invalid = [
+        slot for frame in (changes.inserted, changes.updated) for slot in frame["Time Slot"]
+        if not isinstance(slot, str) or not validate_time_slot(slot)
+    ]
+    if invalid:
+        raise ValueError(
+            f"Invalid time slot(s): {', '.join(map(str, invalid))}. Please use the format '10:00 AM - 11:00 AM'."
+        )
+    with transaction(conn):
+        orphaned = sessions_in_slots(conn, user_id, [int(slot_id) for slot_id in changes.deleted])
+        apply_changes(
+            conn, "slot", changes, key="ID", columns=SLOT_COLUMNS,
+            scope={"user_id": user_id, "topic_id": topic_id}
+        )
+        followed = follow_edited_slots(conn, user_id, [int(slot_id) for slot_id in changes.updated["ID"]])
+        replanned = replan_sessions(conn, user_id, orphaned)
+    return Replan(followed.moved + replanned.moved, replanned.unplaced, followed.reminders + replanned.reminders)
+
+def delete_slots(conn: sqlite3.Connection, user_id: int, slot_ids: list[int]) -> tuple[int, Replan]:
+    """Delete the user's slots by id and move their open sessions to free slots; returns (deleted, replan)."""
+    with transaction(conn):
+        orphaned = sessions_in_slots(conn, user_id, slot_ids)
+        cursor = conn.executemany(queries.DELETE_SLOT, [(slot_id, user_id) for slot_id in slot_ids])
+        replanned = replan_sessions(conn, user_id, orphaned)
+    return cursor.rowcount, replanned
@@ -0,0 +1,124 @@
+"""Topic (task) CRUD without Streamlit."""
+import sqlite3
+from datetime import date
+import queries
+from changeset import ChangeSet, apply_changes
+from db import transaction
+from queries import TASK_COLUMNS
+from tags import set_topic_tags
+
+TASK_STATUSES = ["Not Started", "Pending", "In Progress", "Completed"]
+TASK_PRIORITIES = ["High", "Medium", "Low"]
+TASK_RECURRENCES = ["None", "Daily", "Weekly", "Monthly"]
+TASK_CATEGORIES = [
+    "Programming", "Mathematics", "Science", "Literature", "History",
+    "Art", "Music", "Finance", "Health & Fitness", "Business",
+    "Design", "Engineering", "Language Learning", "Personal Development",
+    "Travel", "Cooking", "Sports", "Technology", "Gaming", "Photography"
+]
+PAGE_SIZE = 25
+# Keyword arguments of create_task, as accepted by create_tasks
+REQUIRED_TASK_FIELDS = ("title", "from_date", "due_date", "priority", "category")
+OPTIONAL_TASK_FIELDS = ("recurrence", "description", "tags")
+
+Cursor = tuple[str, int]  # (due_date, topic_id) of the last row on a page
+
+def create_task(conn: sqlite3.Connection, user_id: int, title: str, from_date: date, due_date: date,
+                priority: str, category: str, recurrence: str = "None", description: str = "", tags: str = "") -> int:
+    """Insert a task with its tags and return its topic_id. Raises ValueError on invalid input."""
+    if not title or not from_date or not due_date or not priority:
+        raise ValueError("Please fill in all required fields (marked with *).")
+    if from_date > due_date:
+        raise ValueError("'From Date' cannot be later than 'Due Date'.")
+    if priority not in TASK_PRIORITIES:
+        raise ValueError(f"Unknown priority: {priority}")
+    if recurrence not in TASK_RECURRENCES:
+        raise ValueError(f"Unknown recurrence: {recurrence}")
+
+    with transaction(conn):
+        cursor = conn.execute(
+            queries.INSERT_TASK,
+            (user_id, title, description, from_date.strftime("%Y-%m-%d"), due_date.strftime("%Y-%m-%d"),
+             "Not Started", priority, 0, category, recurrence, tags)
+        )
+        set_topic_tags(conn, user_id, [(cursor.lastrowid, tags)])
+    return cursor.lastrowid
+
+def create_tasks(conn: sqlite3.Connection, user_id: int, tasks: list[dict]) -> list[int]:
+    """Create several tasks (create_task keyword arguments) all-or-nothing; returns their topic_ids.
+
+    A ValueError names the index and field of the first invalid task.
+    """
+    topic_ids = []
+    with transaction(conn):
+        for index, task in enumerate(tasks):
+            missing = [field for field in REQUIRED_TASK_FIELDS if field not in task]
+            if missing:
+                raise ValueError(f"Task {index}: '{missing[0]}' is required.")
+            unknown = [field for field in task if field not in REQUIRED_TASK_FIELDS + OPTIONAL_TASK_FIELDS]
+            if unknown:
+                raise ValueError(f"Task {index}: '{unknown[0]}' is not a task field.")
+            try:
+                topic_ids.append(create_task(conn, user_id, **task))
+            except ValueError as e:
+                raise ValueError(f"Task {index}: {str(e)}") from e
+    return topic_ids
+
+def list_tasks_page(conn: sqlite3.Connection, user_id: int, filters: dict | None = None,
+                    after: Cursor | None = None, limit: int = PAGE_SIZE) -> tuple[list[tuple], Cursor | None]:
+    """Fetch one page of tasks ordered by (due_date, topic_id), starting after the `after` cursor.
+
+    Returns (rows, next_cursor); rows follow queries.TASK_COLUMNS and next_cursor is None on the last page.
+    """
+    sql, params = queries.build_tasks_page(user_id, filters, after, limit + 1)
+    # One extra row tells whether another page follows
+    rows = conn.execute(sql, params).fetchall()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, (last[TASK_COLUMNS.index("due_date")], last[0])
+    return rows, None
+
+def list_task_titles(conn: sqlite3.Connection, user_id: int) -> dict[int, str]:
+    """Return {topic_id: title} for every task of the user."""
+    return dict(conn.execute(queries.TASK_TITLES, (user_id,)).fetchall())
+
+def list_schedulable_tasks(conn: sqlite3.Connection, user_id: int) -> list[tuple]:
+    """Return the user's open tasks as (topic_id, title, due_date, category, status, progress, priority)."""
+    return conn.execute(queries.SCHEDULABLE_TASKS, (user_id,)).fetchall()
+
+def get_task_details(conn: sqlite3.Connection, user_id: int, topic_id: int) -> tuple | None:
+    """Return (title, due_date, status, progress, priority, category, from_date, recurrence) of the user's open task, or None."""
+    return conn.execute(queries.TASK_DETAILS, (topic_id, user_id)).fetchone()
+
+def get_task_description(conn: sqlite3.Connection, user_id: int, topic_id: int) -> str | None:
+    row = conn.execute(queries.TASK_DESCRIPTION, (topic_id, user_id)).fetchone()
+    return row[0] if row else None
+
+def update_task_description(conn: sqlite3.Connection, user_id: int, topic_id: int, description: str) -> None:
+    with transaction(conn):
+        conn.execute(queries.UPDATE_TASK_DESCRIPTION, (description, topic_id, user_id))
+
+def update_tasks(conn: sqlite3.Connection, user_id: int, changes: ChangeSet) -> int:
+    """Apply edited task rows (columns from queries.TASK_COLUMNS) and their tags; returns rows updated.
+
+    Rows whose status the user changed keep it from then on, whatever their sessions say.
+    """
+    with transaction(conn):
+        conn.executemany(
+            queries.PIN_TASK_STATUS,
+            [(int(topic_id), user_id, status) for topic_id, status in changes.updated[["topic_id", "status"]].itertuples(index=False)]
+        )
+        apply_changes(
+            conn, "topic", changes, key="topic_id",
+            columns={column: column for column in TASK_COLUMNS},
+            scope={"user_id": user_id}
+        )
+        set_topic_tags(conn, user_id, changes.updated[["topic_id", "tags"]].itertuples(index=False))
+    return len(changes.updated)
+
+def delete_task(conn: sqlite3.Connection, user_id: int, topic_id: int) -> bool:
+    """Delete a task (its slots, schedules and sessions cascade); False if it was not the user's."""
+    with transaction(conn):
+        return conn.execute(queries.DELETE_TASK, (topic_id, user_id)).rowcount > 0
@@ -0,0 +1,226 @@
+"""Drive concurrent scripted learner sessions through the Streamlit app and report rerun latency.
+
+    python app/seed.py --db bench.db --scale small
+    python app/session_load.py --db bench.db --sessions 16 --concurrency 1,4,8 [--out sessions.json] [--compare old.json]
+
+Each session runs skillforgeAi.py in streamlit.testing's AppTest: register, log in, open the dashboard,
+add a task, generate slots for it and generate a schedule. The LLM and web search are replaced by fakes
+with a fixed latency, so the numbers measure the app and its database, not Groq. Sessions register
+throwaway 'load_' users, deleted at the end; the rest of the seeded data is the background they run against.
+
+AppTest keeps process-wide state (the Runtime singleton, st.secrets), so simultaneous sessions run in
+separate worker processes. They share the database, so write-lock contention shows up in full; GIL
+contention between sessions of one server process does not.
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+import db
+import services
+import sqltrace
+from benchmark import _percentile
+
+APP_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skillforgeAi.py")
+STEPS = ["landing", "login_page", "register", "login", "dashboard", "task_page", "add_task", "slots_page", "generate_slots",
+         "schedule_page", "generate_schedule"]
+WRITE_VERBS = ("INSERT", "UPDATE", "DELETE", "RELEASE", "SAVEPOINT", "REPLACE")
+RUN_TIMEOUT_SECONDS = 120
+
+def fake_completion(latency):
+    """A groq_completion stand-in: waits `latency` seconds and answers with a small schedule or quiz table."""
+    def factory(api_key, model):
+        def complete(prompt):
+            time.sleep(latency)
+            if "multiple-choice questions" in prompt:
+                return "Question | A | B | C | D | Answer\n---|---|---|---|---|---\n" + "\n".join(
+                    f"Question {i}? | one | two | three | four | {'ABCD'[i % 4]}" for i in range(1, 11)
+                )
+            rows = [f"Part {i} | 30 minutes | {date.today():%d-%b-%Y}  {9 + i:02d}:00 AM - {9 + i:02d}:30 AM" for i in range(1, 4)]
+            return "Subtopic | Duration | Suggested Time Slot\n---|---|---\n" + "\n".join(rows)
+        return complete
+    return factory
+
+def _offline_search(max_results=3):
+    return lambda query: "No results (offline load test)."
+
+def _init_worker(db_path, llm_latency):
+    """Point a worker process at the database and the fake LLM, and warm up its imports."""
+    from streamlit.testing.v1 import AppTest
+
+    db.DB_PATH = db_path
+    sqltrace.SQL_TRACE = True  # Statement timings give the write-lock wait
+    services.groq_completion = fake_completion(llm_latency)
+    services.duckduckgo_search = _offline_search
+    AppTest.from_file(APP_SCRIPT, default_timeout=RUN_TIMEOUT_SECONDS).run()  # Cold imports are not what we measure
+
+def _by_label(elements, label):
+    for element in elements:
+        if element.label == label:
+            return element
+    raise LookupError(f"No widget labelled {label!r}")
+
+def run_session(name):
+    """Walk one learner through the app; returns [(step, ms, error or None)], one per rerun."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_SCRIPT, default_timeout=RUN_TIMEOUT_SECONDS)
+    at.secrets["general"] = {"groq_api_key": "load-test"}
+    due = date.today() + timedelta(days=28)
+    records = []
+
+    def step(label, action):
+        started = time.perf_counter()
+        error = None
+        try:
+            action()
+            if at.exception:
+                error = at.exception[0].message
+            elif at.error:
+                error = at.error[0].value
+        except Exception as e:
+            error = f"{type(e).__name__}: {str(e)}"
+        records.append((label, (time.perf_counter() - started) * 1000, error))
+        return error is None
+
+    def register():
+        at.text_input(key="register_username").input(name)
+        at.text_input(key="register_password").input("load-test")
+        _by_label(at.button, "Register").click().run()
+
+    def login():
+        at.text_input(key="login_username").input(name)
+        at.text_input(key="login_password").input("load-test")
+        _by_label(at.button, "Login").click().run()
+
+    def add_task():
+        _by_label(at.text_input, "Enter Title*").input(f"Load test {name}")
+        _by_label(at.date_input, "Due Date*").set_value(due)
+        _by_label(at.button, "💾 Save Task").click().run()
+
+    def open_slots():
+        at.sidebar.radio[0].set_value("Time Slots").run()
+        _by_label(at.date_input, "📅 Due Date").set_value(due)
+        at.run()
+
+    def generate_slots():
+        _by_label(at.selectbox, "🔁 Recurrence").set_value("Weekly")
+        _by_label(at.button, "🔄 Generate Slots").click().run()
+
+    # A failed step leaves the session somewhere unexpected, so the rest of it is skipped
+    all(step(label, action) for label, action in [
+        ("landing", at.run),
+        ("login_page", lambda: at.button(key="get_started").click().run()),
+        ("register", register),
+        ("login", login),
+        ("dashboard", lambda: at.sidebar.radio[0].set_value("Dashboard").run()),
+        ("task_page", lambda: at.sidebar.radio[0].set_value("Task").run()),
+        ("add_task", add_task),
+        ("slots_page", open_slots),
+        ("generate_slots", generate_slots),
+        ("schedule_page", lambda: at.sidebar.radio[0].set_value("Generate Schedule").run()),
+        ("generate_schedule", lambda: _by_label(at.button, "🚀 Generate Schedule").click().run()),
+    ])
+    return records
+
+def _session_task(name):
+    """Run one session in a worker; returns its step records and the write statements it timed."""
+    sqltrace.process_stats.reset()
+    records = run_session(name)
+    writes = [
+        (item["sql"], item["calls"], item["total_ms"]) for item in sqltrace.process_stats.summary()
+        if item["sql"].lstrip().upper().startswith(WRITE_VERBS)
+    ]
+    return records, writes
+
+def run_load(db_path, sessions=8, concurrency=4, llm_latency=0.5):
+    """Run `sessions` scripted sessions, `concurrency` at a time, and return the report dict."""
+    timings, errors, writes = {}, {}, {}
+    prefix = f"load_{uuid.uuid4().hex[:8]}"
+
+    with ProcessPoolExecutor(concurrency, initializer=_init_worker, initargs=(db_path, llm_latency)) as pool:
+        # Start every worker (and its warm-up) before the clock does
+        list(pool.map(time.sleep, [0.1] * concurrency))
+        started = time.perf_counter()
+        for records, statements in pool.map(_session_task, [f"{prefix}_{index}" for index in range(sessions)]):
+            for label, elapsed_ms, error in records:
+                timings.setdefault(label, []).append(elapsed_ms)
+                if error:
+                    messages = errors.setdefault(label, {})
+                    messages[error[:200]] = messages.get(error[:200], 0) + 1
+            for sql, calls, total_ms in statements:
+                before = writes.get(sql, (0, 0.0))
+                writes[sql] = (before[0] + calls, before[1] + total_ms)
+        duration = time.perf_counter() - started
+
+    conn = db.connect(db_path)
+    conn.execute("DELETE FROM user WHERE username LIKE ?", (f"{prefix}%",))  # Their tasks, slots and schedules cascade
+    conn.commit()
+    conn.close()
+
+    failed = sum(sum(counts.values()) for counts in errors.values())
+    return {
+        "meta": {"sessions": sessions, "concurrency": concurrency, "llm_latency_s": llm_latency, "seconds": round(duration, 2)},
+        "sessions_per_minute": round(sessions / duration * 60, 1),
+        "error_rate": round(failed / max(1, sum(len(values) for values in timings.values())), 4),
+        "results": {
+            label: {
+                "count": len(timings[label]),
+                "errors": sum(errors.get(label, {}).values()),
+                "p50_ms": round(_percentile(timings[label], 50), 1),
+                "p95_ms": round(_percentile(timings[label], 95), 1),
+                "mean_ms": round(statistics.fmean(timings[label]), 1),
+                "max_ms": round(max(timings[label]), 1),
+            }
+            for label in STEPS if label in timings
+        },
+        "errors": errors,
+        # Statement time of writes; under contention this is mostly waiting for the write lock
+        "write_sql": {
+            "calls": sum(calls for calls, _ in writes.values()),
+            "total_ms": round(sum(total_ms for _, total_ms in writes.values()), 1),
+            "slowest": [
+                {"sql": sql, "calls": calls, "total_ms": round(total_ms, 1)}
+                for sql, (calls, total_ms) in sorted(writes.items(), key=lambda item: item[1][1], reverse=True)[:5]
+            ],
+        },
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent-session load test of the SkillForgeAI Streamlit app.")
+    parser.add_argument("--db", default="bench.db", help="Seeded database the app runs against")
+    parser.add_argument("--sessions", type=int, default=16, help="Sessions per concurrency level")
+    parser.add_argument("--concurrency", default="1,4,8", help="Comma-separated numbers of simultaneous sessions")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Seconds the fake LLM takes per call")
+    parser.add_argument("--out", help="Write the JSON reports to this file")
+    parser.add_argument("--compare", help="Previous JSON reports to compare against")
+    args = parser.parse_args()
+
+    # AppTest swaps out __main__, so workers must find the task functions under the module's own name
+    import session_load
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    reports = {str(level): session_load.run_load(args.db, args.sessions, level, args.llm_latency) for level in levels}
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(reports, f, indent=2)
+    old = {}
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+    for level, report in reports.items():
+        before = old.get(level, {})
+        print(f"concurrency {level}: {report['sessions_per_minute']} sessions/min, error rate {report['error_rate']:.2%}, "
+              f"write SQL {report['write_sql']['total_ms']} ms")
+        for label, result in report["results"].items():
+            previous = before.get("results", {}).get(label, {}).get("p95_ms")
+            change = f"  (was {previous})" if previous is not None else ""
+            print(f"  {label:<18} p50 {result['p50_ms']:>8} ms  p95 {result['p95_ms']:>8} ms  errors {result['errors']}{change}")
+        for label, messages in report["errors"].items():
+            for message, count in messages.items():
+                print(f"  ! {label}: {count} x {message}")
@@ -1,45 +1,45 @@
 import streamlit as st
 import sqlite3
-import hashlib  # For password hashing
-import secrets  # For generating salt
-from dashboard import show_dashboard
-from add_task import add_task
-from schedule import generate_schedule
-from slots import get_time_slot
-from model import llm_model
+import time
+from pages import PAGES, render_page
+from search import search_box
+from maintenance import start_background_maintenance
+from admin import show_sql_trace_panel
+import auth
 import db
-
-# Initialize database connection
-conn = db.init_db()
-
-# Initialize the model and memory
-if 'llm' not in st.session_state or 'memory' not in st.session_state:
-    try:
-        st.session_state['llm'], st.session_state['memory'] = llm_model(provider="groq")
-    except Exception as e:
-        st.error(f"Failed to initialize model: {str(e)}")
-        st.stop()
-
-# Password Hashing with hashlib
-def hash_password(password):
-    salt = secrets.token_hex(16)  # Generate a random salt
-    salted_password = salt + password
-    hashed_password = hashlib.sha256(salted_password.encode('utf-8')).hexdigest()
-    return f"{salt}:{hashed_password}"
-
-def check_password(hashed_password, user_password):
-    salt, stored_hash = hashed_password.split(':')
-    salted_password = salt + user_password
-    computed_hash = hashlib.sha256(salted_password.encode('utf-8')).hexdigest()
-    return computed_hash == stored_hash
-
-# User Authentication
+import metrics
+import replay
+from reminders import start_dispatcher
+from util import show_notifications, show_reminders
+from writer import write
+
+rerun_started = time.perf_counter()
+
+@st.cache_resource
+def init_schema():
+    """Create/migrate the schema once per process instead of on every rerun."""
+    db.init_db().close()
+
+@st.cache_resource
+def install_replay():
+    """Record or replay LLM/search traffic when SKILLFORGE_REPLAY is set; once per process so clients wrap once."""
+    replay.install()
+
+# Initialize database connection; pages read through it and write through writer.write
+init_schema()
+install_replay()
+conn = db.connect_readonly()
+start_background_maintenance()
+start_dispatcher()
+metrics.start_exporters()
+
+# Toasts queued by the previous run (usually right before st.rerun())
+show_notifications()
+
+# User Authentication; password hashing runs on auth's worker pool
 def register_user(username, password):
     try:
-        hashed_password = hash_password(password)
-        c = conn.cursor()
-        c.execute("INSERT INTO user (username, password) VALUES (?, ?)", (username, hashed_password))
-        conn.commit()
+        auth.register(username, password)
         return True
     except sqlite3.IntegrityError:
         st.error("Username already exists. Please choose a different username.")
@@ -50,16 +50,25 @@ def register_user(username, password):
 
 def authenticate_user(username, password):
     try:
-        c = conn.cursor()
-        c.execute("SELECT user_id, password FROM user WHERE username = ?", (username,))
-        user = c.fetchone()
-        if user and check_password(user[1], password):
-            return user[0]
-        return None
+        return auth.authenticate(conn, username, password)
     except Exception as e:
         st.error(f"Error authenticating user: {str(e)}")
         return None
 
+def log_in(user_id, username):
+    st.session_state['logged_in'] = True
+    st.session_state['username'] = username
+    st.session_state['user_id'] = user_id
+    st.session_state['page'] = 'dashboard'
+
+def log_out():
+    if st.session_state.get('session_token') and st.session_state.get('user_id'):
+        auth.revoke_sessions(st.session_state['user_id'])  # Tokens of this user stop working everywhere
+    st.session_state['logged_in'] = False
+    st.session_state['username'] = None
+    st.session_state['user_id'] = None
+    st.session_state['session_token'] = None
+
 # Session State Management
 if 'logged_in' not in st.session_state:
     st.session_state['logged_in'] = False
@@ -70,6 +79,14 @@ if 'user_id' not in st.session_state:
 if 'page' not in st.session_state:
     st.session_state['page'] = 'landing'  # Default to landing page
 
+# The signed session token lives only in the session state and is checked on every run; that costs one
+# HMAC and a primary-key lookup, never a password hash. Expired or revoked tokens end the login.
+session_token = st.session_state.get('session_token')
+if session_token and auth.verify_session_token(conn, session_token) is None:
+    st.session_state['session_token'] = None  # Already revoked or expired; nothing to revoke again
+    log_out()
+    st.session_state['page'] = 'login'
+
 # Custom CSS for styling
 st.markdown(
     """
@@ -302,10 +319,8 @@ elif st.session_state['page'] == 'login':
         if submit_button:
             user_id = authenticate_user(username, password)
             if user_id:
-                st.session_state['logged_in'] = True
-                st.session_state['username'] = username
-                st.session_state['user_id'] = user_id
-                st.session_state['page'] = 'dashboard'  # Redirect to the dashboard
+                log_in(user_id, username)  # Redirect to the dashboard
+                st.session_state['session_token'] = auth.issue_session_token(conn, user_id, username)
                 st.success(f"Welcome {username}!")
                 st.rerun()
             else:
@@ -339,29 +354,23 @@ elif st.session_state['page'] == 'login':
 elif st.session_state['page'] == 'dashboard':
     st.sidebar.header("Dashboard")
      
-    panel_option = st.sidebar.radio("Select Option", ["Dashboard", "Task", "Time Slots", "Generate Schedule"])
-    # Today's Tasks
-    if panel_option == "Dashboard":
-        show_dashboard(conn, st.session_state['user_id'])
-
-    # Add Task
-    if panel_option == "Task":
-        add_task(conn, st.session_state['user_id'])
+    show_reminders(conn, st.session_state['user_id'])
+    panel_option = st.sidebar.radio("Select Option", list(PAGES))
+    search_box(conn, st.session_state['user_id'])
+    render_page(panel_option, conn, st.session_state['user_id'])
 
-    # Time Slots
-    if panel_option == "Time Slots":
-        get_time_slot(conn)
-
-    # Schedule Task
-    if panel_option == "Generate Schedule":
-        generate_schedule(conn)
+    # Statements run by this page, for admins when SQL tracing is enabled
+    show_sql_trace_panel(conn, st.session_state['username'])
 
     # Logout Button
     if st.sidebar.button("Logout"):
-        st.session_state['logged_in'] = False
-        st.session_state['username'] = None
-        st.session_state['user_id'] = None
+        log_out()
         st.session_state['points'] = 0
         st.session_state['page'] = 'landing'  # Redirect to the landing page
         st.success("Logged out successfully!")
-        st.rerun()  # Force the app to rerun and update the page
\ No newline at end of file
+        st.rerun()  # Force the app to rerun and update the page
+
+show_notifications()
+
+# Reruns cut short by st.rerun()/st.stop() never reach this line and are not counted
+metrics.RERUN_SECONDS.observe(time.perf_counter() - rerun_started, page=st.session_state['page'])
@@ -1,30 +1,30 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import streamlit as st
 import sqlite3
 import pandas as pd
-
-def validate_time_slot(slot):
-    """Validate the time slot format (e.g., 10:00 AM - 11:00 AM)."""
-    try:
-        start_time, end_time = slot.split(" - ")
-        datetime.strptime(start_time.strip(), "%I:%M %p")
-        datetime.strptime(end_time.strip(), "%I:%M %p")
-        return True
-    except ValueError:
-        return False
-
-def is_overlap(slot1, slot2):
-    """Check if two time slots overlap."""
-    start1, end1 = [datetime.strptime(t.strip(), "%I:%M %p") for t in slot1.split(" - ")]
-    start2, end2 = [datetime.strptime(t.strip(), "%I:%M %p") for t in slot2.split(" - ")]
-    return not (end1 <= start2 or end2 <= start1)
-
+from changeset import diff_frames, has_changes
+import services
+from util import notify
+from metrics import track_page
+from reminders import start_dispatcher
+from writer import write
+
+def notify_replan(replan):
+    """Report sessions moved by a slot change and hand their re-armed reminders to the dispatcher."""
+    if replan.moved:
+        notify(f"{len(replan.moved)} scheduled session(s) moved with their slots.", icon="🔀")
+    if replan.unplaced:
+        notify(f"{len(replan.unplaced)} scheduled session(s) lost their slot and no free slot was left; add slots for them.", icon="⚠️")
+    dispatcher = start_dispatcher()
+    for schedule_id, fire_at in replan.reminders:
+        dispatcher.schedule(schedule_id, fire_at)
+
+@track_page("time_slots")
 def get_time_slot(conn):
     st.subheader("📋 Task and Slot Management")
 
     # Fetch tasks from the database
-    tasks = conn.execute("SELECT * FROM topic WHERE user_id = ?", (st.session_state['user_id'],)).fetchall()
-    task_options = {task[0]: task[2] for task in tasks}  # {topic_id: title}
+    task_options = services.list_task_titles(conn, st.session_state['user_id'])  # {topic_id: title}
 
     col1, col2, col3 = st.columns(3)
     # Select task and date range
@@ -41,10 +41,7 @@ def get_time_slot(conn):
 
     # Display slots for the selected task and date range
     st.subheader("📅 Time Slots")
-    slots = conn.execute(
-        "SELECT slot_id, date, time_slot FROM slot WHERE topic_id = ? AND date BETWEEN ? AND ?",
-        (selected_task_id, from_date, due_date)
-    ).fetchall()
+    slots = services.list_slots(conn, selected_task_id, from_date, due_date)
 
     # Add New Slots
     with st.expander("➕ Add New Slots", expanded=False):
@@ -60,39 +57,17 @@ def get_time_slot(conn):
         recurrence = st.selectbox("🔁 Recurrence", ["None", "Daily", "Weekly", "Monthly"])
 
         if st.button("🔄 Generate Slots"):
-            current_date = slot_date
-            while current_date <= due_date:
-                current_time = datetime.combine(current_date, start_time)
-                end_time_dt = datetime.combine(current_date, end_time)
-                while current_time < end_time_dt:
-                    slot = f"{current_time.strftime('%I:%M %p')} - {(current_time + timedelta(minutes=interval)).strftime('%I:%M %p')}"
-                    
-                    # Check for overlapping slots
-                    existing_slots = [s[0] for s in conn.execute(
-                        "SELECT time_slot FROM slot WHERE topic_id = ? AND date = ?",
-                        (selected_task_id, current_date)
-                    ).fetchall()]
-                    if any(is_overlap(slot, existing_slot) for existing_slot in existing_slots):
-                        st.warning(f"⚠️ Overlapping slot detected: {slot}")
-                    else:
-                        conn.execute(
-                            "INSERT INTO slot (user_id, topic_id, date, time_slot) VALUES (?, ?, ?, ?)",
-                            (st.session_state['user_id'], selected_task_id, current_date, slot)
-                        )
-                        conn.commit()
-                        st.success(f"✅ Slot saved: {slot}")
-                    current_time += timedelta(minutes=interval)
-
-                # Update current_date based on recurrence
-                if recurrence == "Daily":
-                    current_date += timedelta(days=1)
-                elif recurrence == "Weekly":
-                    current_date += timedelta(weeks=1)
-                elif recurrence == "Monthly":
-                    current_date = current_date.replace(month=current_date.month + 1)
-                else:
-                    break  # No recurrence
-
+            saved, overlapping = write(
+                services.generate_slots, st.session_state['user_id'], selected_task_id, slot_date, due_date,
+                start_time, end_time, interval, recurrence
+            )
+            notify(f"{saved} slot(s) saved.", icon="✅")
+            # Matches generate_slots: dates up to the horizon from today (or just the first date) exist now
+            materialized_until = max(date.today() + timedelta(days=services.SLOT_HORIZON_DAYS), slot_date)
+            if recurrence != "None" and due_date > materialized_until:
+                notify(f"Later {recurrence.lower()} slots are added as their dates come within {services.SLOT_HORIZON_DAYS} days.", icon="🔁")
+            if overlapping:
+                notify(f"{overlapping} overlapping slot(s) skipped.", icon="⚠️")
             st.rerun()
 
     if slots:
@@ -114,14 +89,17 @@ def get_time_slot(conn):
             )
 
             if st.button("💾 Save Changes"):
-                for index, row in edited_df.iterrows():
-                    conn.execute(
-                        "UPDATE slot SET date = ?, time_slot = ? WHERE slot_id = ?",
-                        (row["Date"].strftime("%Y-%m-%d"), row["Time Slot"], row["ID"])
-                    )
-                conn.commit()
-                st.success("✅ Slots updated successfully!")
-                st.rerun()
+                changes = diff_frames(slots_df, edited_df, key="ID")
+                if has_changes(changes):
+                    try:
+                        replan = write(services.save_slot_changes, st.session_state['user_id'], selected_task_id, changes)
+                        notify("Slots updated successfully!", icon="✅")
+                        notify_replan(replan)
+                        st.rerun()
+                    except ValueError as e:
+                        st.error(f"❌ {str(e)}")
+                    except sqlite3.IntegrityError:
+                        st.error("❌ One of the slots is already booked on that date.")
 
         # Delete Slots
         with st.expander("🗑️ Delete Slots", expanded=False):
@@ -131,10 +109,9 @@ def get_time_slot(conn):
                 format_func=lambda x: f"{x['Date']} - {x['Time Slot']}"
             )
             if st.button("❌ Delete Selected Slots"):
-                for slot in slots_to_delete:
-                    conn.execute("DELETE FROM slot WHERE slot_id = ?", (slot["ID"],))
-                conn.commit()
-                st.success("✅ Selected slots deleted successfully!")
+                _, replan = write(services.delete_slots, st.session_state['user_id'], [slot["ID"] for slot in slots_to_delete])
+                notify("Selected slots deleted successfully!", icon="✅")
+                notify_replan(replan)
                 st.rerun()
     else:
         st.info("ℹ️ No slots available for the selected task and date range.")
@@ -142,10 +119,7 @@ def get_time_slot(conn):
     # View Slots by Date
     with st.expander("📅 View Slots by Date", expanded=False):
         view_date = st.date_input("Select Date to View Slots", min_value=from_date, max_value=due_date)
-        slots_on_date = conn.execute(
-            "SELECT slot_id, time_slot FROM slot WHERE topic_id = ? AND date = ?",
-            (selected_task_id, view_date)
-        ).fetchall()
+        slots_on_date = services.list_slots_on_date(conn, selected_task_id, view_date)
 
         if slots_on_date:
             st.write(f"Slots on {view_date}:")
@@ -158,14 +132,10 @@ def get_time_slot(conn):
     with st.expander("🔍 Check Slot Availability", expanded=False):
         check_slot = st.text_input("Enter Slot to Check (e.g., 10:00 AM - 11:00 AM)")
         if st.button("🔎 Check"):
-            if not validate_time_slot(check_slot):
-                st.error("❌ Invalid time slot format. Please use the format '10:00 AM - 11:00 AM'.")
-            else:
-                existing_slots = [s[0] for s in conn.execute(
-                    "SELECT time_slot FROM slot WHERE topic_id = ? AND date BETWEEN ? AND ?",
-                    (selected_task_id, from_date, due_date)
-                ).fetchall()]
-                if any(is_overlap(check_slot, existing_slot) for existing_slot in existing_slots):
+            try:
+                if services.has_conflict(conn, selected_task_id, check_slot, from_date, due_date):
                     st.error("⚠️ Slot conflict detected!")
                 else:
-                    st.success("✅ Slot is available!")
\ No newline at end of file
+                    st.success("✅ Slot is available!")
+            except ValueError as e:
+                st.error(f"❌ {str(e)}")
\ No newline at end of file
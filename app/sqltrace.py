@@ -0,0 +1,203 @@
+"""Opt-in SQL instrumentation: per-statement call counts, latency, rows and a slow-query log.
+
+Enable with SKILLFORGE_SQL_TRACE=1; db.connect then builds traced connections. With tracing off,
+connections are plain sqlite3 connections and nothing here runs.
+"""
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+SQL_TRACE = os.getenv("SKILLFORGE_SQL_TRACE", "0") == "1"
+SLOW_QUERY_MS = float(os.getenv("SKILLFORGE_SLOW_QUERY_MS", "50"))
+SLOW_QUERY_LOG = os.getenv("SKILLFORGE_SLOW_QUERY_LOG", "slow_queries.log")
+LATENCY_WINDOW = 1000  # Latencies kept per statement for percentiles
+
+slow_log = logging.getLogger("skillforge.slow_sql")
+
+@lru_cache(maxsize=2048)
+def normalize_sql(sql):
+    """Reduce a statement to its shape: literals become ?, IN lists collapse, whitespace is single spaces."""
+    sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    sql = re.sub(r"\b\d+(?:\.\d+)?\b", "?", sql)
+    sql = re.sub(r"\(\s*\?(?:\s*,\s*\?)+\s*\)", "(?, ...)", sql)
+    return re.sub(r"\s+", " ", sql).strip()
+
+class SqlStats:
+    """Thread-safe per-statement aggregates."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}  # {normalized_sql: [calls, total_ms, rows, deque_of_latencies]}
+        self._started = {}  # {normalized_sql: times SQLite started it}, from the trace callback
+
+    def record(self, sql, elapsed_ms, rows):
+        with self._lock:
+            entry = self._stats.get(sql)
+            if entry is None:
+                entry = self._stats[sql] = [0, 0.0, 0, deque(maxlen=LATENCY_WINDOW)]
+            entry[0] += 1
+            entry[1] += elapsed_ms
+            entry[2] += rows
+            entry[3].append(elapsed_ms)
+
+    def record_started(self, sql):
+        with self._lock:
+            self._started[sql] = self._started.get(sql, 0) + 1
+
+    def summary(self):
+        """Return one dict per statement, highest total time first.
+
+        `started` counts every time SQLite began the statement, so it exceeds `calls` when triggers
+        run; statements only the trace callback saw (the implicit BEGIN, executescript) have no calls.
+        """
+        with self._lock:
+            items = [(sql, calls, total, rows, sorted(latencies)) for sql, (calls, total, rows, latencies) in self._stats.items()]
+            items += [(sql, 0, 0.0, 0, [0.0]) for sql in self._started if sql not in self._stats]
+            started = dict(self._started)
+        return sorted(
+            (
+                {
+                    "sql": sql,
+                    "calls": calls,
+                    "started": started.get(sql, 0),
+                    "total_ms": round(total, 3),
+                    "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+                    "rows": rows,
+                }
+                for sql, calls, total, rows, latencies in items
+            ),
+            key=lambda item: item["total_ms"],
+            reverse=True,
+        )
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._started.clear()
+
+# Aggregates across every traced connection in the process
+process_stats = SqlStats()
+
+def _finish(sql, elapsed_ms, rows, connection_stats):
+    key = normalize_sql(sql)
+    connection_stats.record(key, elapsed_ms, rows)
+    process_stats.record(key, elapsed_ms, rows)
+    if elapsed_ms >= SLOW_QUERY_MS:
+        slow_log.warning("%.1f ms, %d rows: %s", elapsed_ms, rows, key)
+
+class TracedCursor(sqlite3.Cursor):
+    """Cursor that times each statement from execute until its rows are consumed."""
+
+    _call = None  # [sql, elapsed_ms, rows] of the statement in flight
+
+    def _timed(self, method, *args):
+        started = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            if self._call is not None:
+                self._call[1] += (time.perf_counter() - started) * 1000
+
+    def _flush(self):
+        if self._call is not None:
+            sql, elapsed_ms, rows = self._call
+            self._call = None
+            _finish(sql, elapsed_ms, rows, self.connection.sql_stats)
+
+    def execute(self, sql, parameters=()):
+        self._flush()
+        self._call = [sql, 0.0, 0]
+        self._timed(super().execute, sql, parameters)
+        if self.description is None:  # No result set; the statement is done
+            self._call[2] = max(self.rowcount, 0)
+            self._flush()
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._flush()
+        self._call = [sql, 0.0, 0]
+        self._timed(super().executemany, sql, seq_of_parameters)
+        self._call[2] = max(self.rowcount, 0)
+        self._flush()
+        return self
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if row is None:
+            self._flush()
+        elif self._call is not None:
+            self._call[2] += 1
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed(super().fetchmany, self.arraysize if size is None else size)
+        if self._call is not None:
+            self._call[2] += len(rows)
+        if not rows:
+            self._flush()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        if self._call is not None:
+            self._call[2] += len(rows)
+        self._flush()
+        return rows
+
+    def __next__(self):
+        try:
+            row = self._timed(super().__next__)
+        except StopIteration:
+            self._flush()
+            raise
+        if self._call is not None:
+            self._call[2] += 1
+        return row
+
+    def close(self):
+        self._flush()
+        super().close()
+
+    def __del__(self):
+        self._flush()
+
+class TracedConnection(sqlite3.Connection):
+    """Connection whose cursors record into `sql_stats` (this connection) and `process_stats`."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sql_stats = SqlStats()
+        # Sees statements that bypass cursors and each trigger program a statement runs
+        self.set_trace_callback(self._on_trace)
+
+    def _on_trace(self, statement):
+        key = normalize_sql(statement)
+        self.sql_stats.record_started(key)
+        process_stats.record_started(key)
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    # The C implementations of these skip the Python-level cursor methods
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+def configure_slow_log(path=SLOW_QUERY_LOG):
+    """Send slow-query warnings to `path` (idempotent)."""
+    if not any(isinstance(handler, logging.FileHandler) for handler in slow_log.handlers):
+        handler = logging.FileHandler(path)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        slow_log.addHandler(handler)
+        slow_log.setLevel(logging.WARNING)
+        slow_log.propagate = False
+
+if SQL_TRACE:
+    configure_slow_log()
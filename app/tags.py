@@ -0,0 +1,54 @@
+def parse_tags(text):
+    """Split a comma-separated tag string into unique, trimmed tag names (case-insensitive)."""
+    names = []
+    seen = set()
+    for name in (text or "").split(","):
+        name = name.strip()
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+    return names
+
+def set_topic_tags(conn, user_id, topics):
+    """Replace the tag links of each (topic_id, tag_string) pair in `topics`. The caller commits."""
+    topics = [(topic_id, parse_tags(text)) for topic_id, text in topics]
+    conn.executemany(
+        "INSERT OR IGNORE INTO tag (name) VALUES (?)",
+        {(name,) for _, names in topics for name in names}
+    )
+    conn.executemany("DELETE FROM topic_tag WHERE topic_id = ?", [(topic_id,) for topic_id, _ in topics])
+    conn.executemany(
+        """
+        INSERT OR IGNORE INTO topic_tag (user_id, tag_id, topic_id)
+        SELECT ?, tag_id, ? FROM tag WHERE name = ?
+        """,
+        [(user_id, topic_id, name) for topic_id, names in topics for name in names]
+    )
+
+def migrate_topic_tags(conn):
+    """Populate tag/topic_tag from the free-text topic.tags column."""
+    rows = conn.execute(
+        "SELECT user_id, topic_id, tags FROM topic WHERE tags IS NOT NULL AND tags != ''"
+    ).fetchall()
+    by_user = {}
+    for user_id, topic_id, text in rows:
+        by_user.setdefault(user_id, []).append((topic_id, text))
+    for user_id, topics in by_user.items():
+        set_topic_tags(conn, user_id, topics)
+
+def fetch_tag_counts(conn, user_id):
+    """Count the user's topics per tag, most used first."""
+    return conn.execute(
+        """
+        SELECT tg.name, counts.topics
+        FROM (
+            SELECT tag_id, COUNT(*) AS topics
+            FROM topic_tag
+            WHERE user_id = ?
+            GROUP BY tag_id
+        ) counts
+        JOIN tag tg ON tg.tag_id = counts.tag_id
+        ORDER BY counts.topics DESC, tg.name
+        """,
+        (user_id,)
+    ).fetchall()
@@ -0,0 +1,45 @@
+import http.client
+import json
+import threading
+import pytest
+from api import ApiServer, issue_token
+from writer import get_writer
+
+TASK = {"title": "Python", "from_date": "2025-03-01", "due_date": "2025-03-31", "priority": "High", "category": "Programming"}
+
+@pytest.fixture
+def server(tmp_path):
+    path = str(tmp_path / "api.db")
+    server = ApiServer(("127.0.0.1", 0), path, pool_size=2)
+    get_writer(path).write(lambda conn: conn.execute("INSERT INTO user (username, password) VALUES ('ada', 'x')"))
+    server.token = get_writer(path).write(issue_token, "ada", "tests")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    get_writer(path).close()
+
+def request(server, method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection(*server.server_address, timeout=10)
+    headers = {"Authorization": f"Bearer {server.token}", **(headers or {})}
+    conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+    response = conn.getresponse()
+    status, payload = response.status, json.loads(response.read())
+    conn.close()
+    return status, payload
+
+def test_post_topics_creates_tasks(server):
+    status, payload = request(server, "POST", "/topics", {"topics": [TASK]})
+    assert status == 201 and len(payload["topic_ids"]) == 1
+
+@pytest.mark.parametrize("task, message", [
+    ({key: value for key, value in TASK.items() if key != "category"}, "Task 0: 'category' is required."),
+    ({**TASK, "colour": "red"}, "Task 0: 'colour' is not a task field."),
+])
+def test_post_topics_names_the_bad_field(server, task, message):
+    assert request(server, "POST", "/topics", {"topics": [task]}) == (400, {"error": message})
+
+@pytest.mark.parametrize("length", ["abc", "-5"])
+def test_invalid_content_length_is_rejected(server, length):
+    status, payload = request(server, "GET", "/topics", headers={"Content-Length": length})
+    assert status == 400 and "Content-Length" in payload["error"]
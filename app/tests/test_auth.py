@@ -0,0 +1,56 @@
+import hashlib
+import pytest
+import auth
+from db import connect_readonly, init_db
+from writer import get_writer
+
+LONG_PASSWORD = "correct horse battery staple " * 4  # 116 bytes, over bcrypt's 72
+
+@pytest.fixture(autouse=True)
+def fast_bcrypt(monkeypatch):
+    monkeypatch.setattr(auth, "PASSWORD_SCHEME", "bcrypt")
+    monkeypatch.setattr(auth, "BCRYPT_ROUNDS", 4)
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "auth.db")
+    init_db(path).close()
+    yield path
+    get_writer(path).close()
+
+def _stored_hash(db_path, username):
+    conn = connect_readonly(db_path)
+    try:
+        return conn.execute("SELECT password FROM user WHERE username = ?", (username,)).fetchone()[0]
+    finally:
+        conn.close()
+
+def _login(db_path, username, password):
+    conn = connect_readonly(db_path)
+    try:
+        return auth.authenticate(conn, username, password, db_path)
+    finally:
+        conn.close()
+
+def test_long_passwords_register_and_log_in(db_path):
+    auth.register("ada", LONG_PASSWORD, db_path)
+    assert _login(db_path, "ada", LONG_PASSWORD) is not None
+    # Every byte counts, not just the first 72
+    assert _login(db_path, "ada", LONG_PASSWORD[:-1] + "!") is None
+
+def test_legacy_user_with_long_password_is_rehashed(db_path):
+    salt = "0123456789abcdef"
+    legacy = f"{salt}:{hashlib.sha256((salt + LONG_PASSWORD).encode('utf-8')).hexdigest()}"
+    get_writer(db_path).write(auth._insert_user, "bob", legacy)
+
+    assert _login(db_path, "bob", LONG_PASSWORD) is not None
+    assert _stored_hash(db_path, "bob").startswith("$2")
+    assert _login(db_path, "bob", LONG_PASSWORD) is not None
+
+def test_hashes_of_truncated_long_passwords_still_verify():
+    # What bcrypt before 5.0 stored for a long password: a hash of its first 72 bytes
+    stored = auth.bcrypt.hashpw(LONG_PASSWORD.encode("utf-8")[:72], auth.bcrypt.gensalt(4)).decode("ascii")
+    assert auth.verify_password(stored, LONG_PASSWORD)
+
+def test_unknown_user_with_long_password_is_rejected(db_path):
+    assert _login(db_path, "nobody", LONG_PASSWORD) is None
@@ -0,0 +1,34 @@
+import pytest
+import queries
+from db import connect, init_db
+from maintenance import purge_orphans
+
+@pytest.fixture
+def conn(tmp_path):
+    path = str(tmp_path / "maintenance.db")
+    init_db(path).close()
+    conn = connect(path)
+    conn.execute("INSERT INTO user (username, password) VALUES ('ada', 'x')")
+    for title in ("Kept", "Deleted"):
+        conn.execute("INSERT INTO topic (user_id, title, from_date, due_date) VALUES (1, ?, '2025-03-01', '2025-03-31')", (title,))
+    conn.execute(queries.INSERT_SLOT_IF_FREE, (1, 1, "2025-03-10", "10:00 AM - 11:00 AM"))
+    conn.executemany(queries.INSERT_SCHEDULE_ROW_IN_SLOT, [
+        (1, 1, "2025-03-10", "10:00 AM - 11:00 AM", "Booked", False, 1),
+        (1, 2, "2025-03-11", "10:00 AM - 11:00 AM", "Of a deleted topic", False, None),
+    ])
+    conn.commit()
+    # Parents removed behind the foreign keys' back, as in databases written with them off
+    conn.execute("PRAGMA foreign_keys = OFF")
+    conn.execute("DELETE FROM slot")
+    conn.execute("DELETE FROM topic WHERE topic_id = 2")
+    conn.commit()
+    conn.execute("PRAGMA foreign_keys = ON")
+    yield conn
+    conn.close()
+
+def test_purge_orphans_follows_each_keys_on_delete_action(conn):
+    report = purge_orphans(conn)
+    assert report["deleted"] == {"schedule": 1}
+    assert report["set_null"] == {"schedule.slot_id": 1}
+    assert conn.execute("SELECT subtopics, slot_id FROM schedule").fetchall() == [("Booked", None)]
+    assert purge_orphans(conn) == {"deleted": {}, "set_null": {}}
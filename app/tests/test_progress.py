@@ -0,0 +1,76 @@
+import pytest
+from db import init_db
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = init_db(str(tmp_path / "progress.db"))
+    conn.execute("INSERT INTO user (username, password) VALUES ('ada', 'x')")
+    for title in ("Python", "SQL"):
+        conn.execute(
+            "INSERT INTO topic (user_id, title, from_date, due_date, status) VALUES (1, ?, '2025-03-01', '2025-03-31', 'Not Started')",
+            (title,)
+        )
+    yield conn
+    conn.close()
+
+def add_sessions(conn, topic_id, *completed):
+    conn.executemany(
+        "INSERT INTO schedule (user_id, topic_id, date, time_slot, subtopics, is_completed) VALUES (1, ?, '2025-03-10', '10:00 AM - 11:00 AM', 'Part', ?)",
+        [(topic_id, done) for done in completed]
+    )
+
+def progress(conn, topic_id):
+    """(sessions_total, sessions_done, progress, status) of a topic."""
+    return conn.execute(
+        "SELECT sessions_total, sessions_done, progress, status FROM topic WHERE topic_id = ?", (topic_id,)
+    ).fetchone()
+
+def test_insert_counts_sessions(conn):
+    add_sessions(conn, 1, False, False, True, False)
+    assert progress(conn, 1) == (4, 1, 25, "In Progress")
+    assert progress(conn, 2) == (0, 0, 0, "Not Started")
+
+def test_completing_every_session_completes_the_topic(conn):
+    add_sessions(conn, 1, False, False)
+    conn.execute("UPDATE schedule SET is_completed = TRUE WHERE schedule_id = 1")
+    assert progress(conn, 1) == (2, 1, 50, "In Progress")
+    conn.execute("UPDATE schedule SET is_completed = TRUE")
+    assert progress(conn, 1) == (2, 2, 100, "Completed")
+    conn.execute("UPDATE schedule SET is_completed = FALSE")
+    assert progress(conn, 1) == (2, 0, 0, "Not Started")
+
+def test_delete_uncounts_sessions(conn):
+    add_sessions(conn, 1, True, False)
+    conn.execute("DELETE FROM schedule WHERE is_completed = FALSE")
+    assert progress(conn, 1) == (1, 1, 100, "Completed")
+
+def test_moving_a_session_to_another_topic_moves_its_count(conn):
+    add_sessions(conn, 1, True, False)
+    add_sessions(conn, 2, False)
+    conn.execute("UPDATE schedule SET topic_id = 2, is_completed = FALSE WHERE schedule_id = 1")
+    assert progress(conn, 1) == (1, 0, 0, "Not Started")
+    assert progress(conn, 2) == (2, 0, 0, "Not Started")
+    conn.execute("UPDATE schedule SET topic_id = 1 WHERE schedule_id = 3")
+    assert progress(conn, 1) == (2, 0, 0, "Not Started")
+    assert progress(conn, 2) == (1, 0, 0, "Not Started")
+
+def test_pinned_status_is_not_overwritten(conn):
+    add_sessions(conn, 1, False, False)
+    conn.execute("UPDATE topic SET status = 'Pending', status_pinned = 1 WHERE topic_id = 1")
+    conn.execute("UPDATE schedule SET is_completed = TRUE")
+    assert progress(conn, 1) == (2, 2, 100, "Pending")
+
+def test_editing_the_status_pins_it_but_other_edits_do_not(conn):
+    import pandas as pd
+    from changeset import ChangeSet
+    from queries import TASK_COLUMNS
+    from services import update_tasks
+
+    def edit(**values):
+        row = conn.execute(f"SELECT {', '.join(TASK_COLUMNS)} FROM topic WHERE topic_id = 1").fetchone()
+        edited = pd.DataFrame([row], columns=TASK_COLUMNS).assign(**values)
+        update_tasks(conn, 1, ChangeSet(edited.iloc[0:0], edited, []))
+        return conn.execute("SELECT status_pinned FROM topic WHERE topic_id = 1").fetchone()[0]
+
+    assert edit(title="Python 3") == 0
+    assert edit(status="Pending") == 1
@@ -0,0 +1,7 @@
+from db import init_db
+from query_plans import check_query_plans
+
+def test_hot_queries_use_an_index_on_a_fresh_schema():
+    conn = init_db(":memory:")
+    assert [(name, problem) for name, problem, _ in check_query_plans(conn)] == []
+    conn.close()
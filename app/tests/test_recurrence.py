@@ -0,0 +1,28 @@
+from datetime import date
+import pytest
+from recurrence import add_months, between, next_occurrences, occurrences
+
+def test_monthly_rules_clamp_to_month_end_and_keep_their_day():
+    assert list(occurrences(date(2024, 1, 31), "Monthly", until=date(2024, 5, 31))) == [
+        date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30), date(2024, 5, 31),
+    ]
+
+def test_add_months_crosses_years_and_clamps():
+    assert add_months(date(2024, 12, 31), 2) == date(2025, 2, 28)
+    assert add_months(date(2025, 1, 15), -1) == date(2024, 12, 15)
+
+def test_not_before_skips_ahead_without_walking_earlier_dates():
+    assert next_occurrences(date(2025, 1, 31), "Monthly", after=date(2025, 4, 1), limit=2) == [date(2025, 4, 30), date(2025, 5, 31)]
+    assert list(between(date(2025, 1, 1), "Weekly", date(2025, 1, 9), date(2025, 1, 22))) == [date(2025, 1, 15), date(2025, 1, 22)]
+    assert list(between(date(2025, 1, 1), "Daily", date(2025, 1, 3), date(2025, 1, 10), interval=3)) == [
+        date(2025, 1, 4), date(2025, 1, 7), date(2025, 1, 10),
+    ]
+
+def test_count_and_until_bound_the_rule():
+    assert list(occurrences(date(2025, 1, 1), "Daily", count=3)) == [date(2025, 1, 1), date(2025, 1, 2), date(2025, 1, 3)]
+    assert list(occurrences(date(2025, 1, 1), "None", until=date(2025, 12, 31))) == [date(2025, 1, 1)]
+
+@pytest.mark.parametrize("frequency, interval", [("Yearly", 1), ("Daily", 0)])
+def test_invalid_rules_are_rejected(frequency, interval):
+    with pytest.raises(ValueError):
+        next(occurrences(date(2025, 1, 1), frequency, interval))
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+import pytest
+import queries
+import reminders
+from db import init_db
+from writer import get_writer
+
+NOW = datetime(2025, 3, 10, 9, 0)
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "reminders.db")
+    conn = init_db(path)
+    conn.execute("INSERT INTO user (username, password) VALUES ('ada', 'x')")
+    conn.execute("INSERT INTO topic (user_id, title, from_date, due_date) VALUES (1, 'Python', '2025-03-01', '2025-03-31')")
+    conn.execute(queries.INSERT_SLOT_IF_FREE, (1, 1, "2025-03-10", "10:00 AM - 11:00 AM"))
+    rows = [
+        ("2025-03-10", "10:00 AM - 11:00 AM", "Booked", 1),  # 1: in a slot
+        ("2025-03-31", "12-Mar-2025  02:00 PM - 03:00 PM", "Dated by the LLM", None),  # 2: due date in `date`
+        ("2025-03-31", "04:00 PM - 05:00 PM", "Undated", None),  # 3: no date of its own
+    ]
+    conn.executemany(queries.INSERT_SCHEDULE_ROW_IN_SLOT, [(1, 1, d, slot, sub, False, slot_id) for d, slot, sub, slot_id in rows])
+    conn.commit()
+    conn.close()
+    yield path
+    get_writer(path).close()
+
+def set_reminder(db_path, schedule_id, minutes_before, now=NOW):
+    return get_writer(db_path).write(reminders.set_reminder, 1, schedule_id, minutes_before, now=now)
+
+def test_session_start_prefers_the_date_in_the_time_slot():
+    assert reminders.session_start("2025-03-31", "12-Mar-2025  02:00 PM - 03:00 PM") == datetime(2025, 3, 12, 14, 0)
+    assert reminders.session_start("2025-03-10", "10:00 AM - 11:00 AM") == datetime(2025, 3, 10, 10, 0)
+
+def test_set_reminder_uses_the_llm_date_not_the_due_date(db_path):
+    assert set_reminder(db_path, 2, 30) == "2025-03-12 13:30:00"
+
+def test_set_reminder_refuses_undated_unbooked_sessions(db_path):
+    with pytest.raises(ValueError, match="no date"):
+        set_reminder(db_path, 3, 15)
+
+def test_set_reminder_refuses_started_sessions(db_path):
+    with pytest.raises(ValueError, match="already started"):
+        set_reminder(db_path, 1, 15, now=NOW + timedelta(hours=2))
+
+def test_dispatcher_fires_only_when_the_clock_reaches_a_reminder(db_path):
+    clock, fired = FakeClock(NOW), []
+    set_reminder(db_path, 1, 15)
+    dispatcher = reminders.ReminderDispatcher(db_path, sinks=[fired.extend], clock=clock)
+    assert len(dispatcher) == 1
+
+    clock.now = NOW + timedelta(minutes=44)
+    assert dispatcher.run_due() == 0
+    clock.now = NOW + timedelta(minutes=45)
+    assert dispatcher.run_due() == 1
+    assert [(r.schedule_id, r.fire_at) for r in fired] == [(1, "2025-03-10 09:45:00")]
+    assert dispatcher.run_due() == 0  # Claimed, so never fired twice
+
+def test_dispatcher_picks_up_pushed_and_later_window_reminders(db_path):
+    clock, fired = FakeClock(NOW), []
+    dispatcher = reminders.ReminderDispatcher(db_path, sinks=[fired.extend], clock=clock, horizon=timedelta(hours=2))
+    assert len(dispatcher) == 0
+
+    dispatcher.schedule(1, set_reminder(db_path, 1, 0))  # Within the window: pushed onto the heap
+    set_reminder(db_path, 2, 60)  # Beyond the window: loaded when the clock gets there
+    assert len(dispatcher) == 1
+
+    clock.now = datetime(2025, 3, 12, 13, 0)
+    assert dispatcher.run_due() == 2
+    assert sorted(r.schedule_id for r in fired) == [1, 2]
+
+def test_a_failing_sink_does_not_block_the_others(db_path):
+    fired = []
+
+    def broken(_):
+        raise RuntimeError("webhook down")
+
+    set_reminder(db_path, 1, 15)
+    dispatcher = reminders.ReminderDispatcher(db_path, sinks=[broken, fired.extend], clock=FakeClock(NOW))
+    assert dispatcher.run_due(NOW + timedelta(hours=1)) == 1
+    assert len(fired) == 1
+
+def test_completed_sessions_are_claimed_but_not_delivered(db_path):
+    fired = []
+    set_reminder(db_path, 1, 15)
+    get_writer(db_path).write(lambda conn: conn.execute("UPDATE schedule SET is_completed = TRUE WHERE schedule_id = 1"))
+    dispatcher = reminders.ReminderDispatcher(db_path, sinks=[fired.extend], clock=FakeClock(NOW))
+    assert dispatcher.run_due(NOW + timedelta(hours=1)) == 0
+    assert fired == []
@@ -0,0 +1,69 @@
+from datetime import date
+import pytest
+import queries
+from db import init_db
+from services import ScheduleItem, save_schedule
+from services.replanning import link_slots, match_slot
+
+ON = date(2025, 3, 10)
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = init_db(str(tmp_path / "replanning.db"))
+    conn.execute("INSERT INTO user (username, password) VALUES ('ada', 'x')")
+    conn.execute("INSERT INTO user (username, password) VALUES ('bob', 'x')")
+    conn.execute("INSERT INTO topic (user_id, title, from_date, due_date) VALUES (1, 'Python', '2025-03-01', '2025-03-31')")
+    conn.execute(queries.INSERT_SLOT_IF_FREE, (1, 1, "2025-03-10", "10:00 AM - 11:00 AM"))
+    conn.execute(queries.INSERT_SLOT_IF_FREE, (1, 1, "2025-03-12", "02:00 PM - 03:00 PM"))
+    conn.commit()
+    yield conn
+    conn.close()
+
+@pytest.mark.parametrize("text, expected", [
+    ("10:00 AM - 11:00 AM", ("2025-03-10", "10:00 AM - 11:00 AM")),
+    ("9:30am-10:15AM", ("2025-03-10", "09:30 AM - 10:15 AM")),
+    ("12-Mar-2025  02:00 PM - 03:00 PM", ("2025-03-12", "02:00 PM - 03:00 PM")),
+])
+def test_match_slot_reads_dates_and_times(text, expected):
+    assert match_slot(text, ON) == expected
+
+@pytest.mark.parametrize("text", [
+    "Anytime in the afternoon",
+    "13:00 PM - 14:00 PM",
+    "31-Feb-2025 10:00 AM - 11:00 AM",
+    "10:75 AM - 11:00 AM",
+])
+def test_match_slot_returns_none_for_missing_or_impossible_times(text):
+    assert match_slot(text, ON) is None
+
+def test_link_slots_books_exact_matches_once(conn):
+    slot_ids = link_slots(conn, 1, ON, [
+        "10:00 AM - 11:00 AM",
+        "10:00 AM - 11:00 AM",  # Same slot again: already taken
+        "10:30 AM - 11:30 AM",  # Overlaps the slot but is not it
+        "12-Mar-2025 02:00 PM - 03:00 PM",
+    ])
+    assert slot_ids == [1, None, None, 2]
+
+def test_save_schedule_keeps_unmatched_and_malformed_items(conn):
+    items = [
+        ScheduleItem("Booked", "1 hour", "10:00 AM - 11:00 AM"),
+        ScheduleItem("Overlapping", "1 hour", "10:30 AM - 11:30 AM"),
+        ScheduleItem("Impossible time", "1 hour", "13:00 PM - 14:00 PM"),
+        ScheduleItem("Impossible date", "1 hour", "31-Feb-2025 10:00 AM - 11:00 AM"),
+        ScheduleItem("Dated", "1 hour", "14-Mar-2025 09:00 AM - 10:00 AM"),
+    ]
+    assert save_schedule(conn, 1, 1, ON, items) == 5
+    rows = conn.execute("SELECT subtopics, date, time_slot, slot_id FROM schedule ORDER BY schedule_id").fetchall()
+    assert rows == [
+        ("Booked", "2025-03-10", "10:00 AM - 11:00 AM", 1),
+        ("Overlapping", "2025-03-10", "10:30 AM - 11:30 AM", None),
+        ("Impossible time", "2025-03-10", "13:00 PM - 14:00 PM", None),
+        ("Impossible date", "2025-03-10", "31-Feb-2025 10:00 AM - 11:00 AM", None),
+        ("Dated", "2025-03-14", "14-Mar-2025 09:00 AM - 10:00 AM", None),
+    ]
+
+def test_save_schedule_refuses_another_users_topic(conn):
+    with pytest.raises(ValueError, match="Unknown topic"):
+        save_schedule(conn, 2, 1, ON, [ScheduleItem("Intro", "1 hour", "10:00 AM - 11:00 AM")])
+    assert conn.execute("SELECT COUNT(*) FROM schedule").fetchone()[0] == 0
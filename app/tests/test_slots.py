@@ -0,0 +1,35 @@
+from datetime import date, time
+import pytest
+from db import init_db
+from services import extend_slot_rules, generate_slots
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = init_db(str(tmp_path / "slots.db"))
+    conn.execute("INSERT INTO user (username, password) VALUES ('ada', 'x')")
+    conn.execute("INSERT INTO topic (user_id, title, from_date, due_date) VALUES (1, 'Python', '2025-01-01', '2025-12-31')")
+    yield conn
+    conn.close()
+
+def slot_dates(conn):
+    return [date.fromisoformat(row[0]) for row in conn.execute("SELECT DISTINCT date FROM slot ORDER BY date")]
+
+def test_monthly_slots_are_materialized_as_the_horizon_moves(conn):
+    # Two 30-minute slots on each date; the first date lies beyond the 28-day horizon
+    saved, overlapping = generate_slots(
+        conn, 1, 1, date(2025, 1, 31), date(2025, 5, 31), time(9, 0), time(10, 0), 30, "Monthly", today=date(2025, 1, 1)
+    )
+    assert (saved, overlapping) == (2, 0)
+    assert slot_dates(conn) == [date(2025, 1, 31)]
+
+    assert extend_slot_rules(conn, today=date(2025, 3, 15)) == 4  # Horizon 12 April: 28 Feb and 31 Mar
+    assert slot_dates(conn) == [date(2025, 1, 31), date(2025, 2, 28), date(2025, 3, 31)]
+
+def test_extending_again_creates_nothing_new(conn):
+    generate_slots(conn, 1, 1, date(2025, 1, 6), date(2025, 3, 31), time(9, 0), time(9, 30), 30, "Weekly", today=date(2025, 1, 6))
+    first = extend_slot_rules(conn, today=date(2025, 2, 1))
+    assert first > 0
+    assert extend_slot_rules(conn, today=date(2025, 2, 1)) == 0
+    extend_slot_rules(conn, today=date(2025, 12, 1))
+    assert len(slot_dates(conn)) == 13  # Every Monday from 6 January to 31 March, each once
+    assert extend_slot_rules(conn, today=date(2025, 12, 1)) == 0
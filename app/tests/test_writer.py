@@ -0,0 +1,29 @@
+import pytest
+from db import init_db
+from writer import Writer, get_writer
+
+def _insert_user(conn, username):
+    return conn.execute("INSERT INTO user (username, password) VALUES (?, 'x')", (username,)).lastrowid
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "writer.db")
+    init_db(path).close()
+    yield path
+    get_writer(path).close()
+
+def test_get_writer_after_close_starts_a_new_writer(db_path):
+    first = get_writer(db_path)
+    assert first.write(_insert_user, "ada") == 1
+    first.close()
+
+    second = get_writer(db_path)
+    assert second is not first
+    assert second.write(_insert_user, "bob") == 2
+
+def test_closed_writer_refuses_jobs(db_path):
+    writer = Writer(db_path)
+    writer.close()
+    writer.close()  # Closing twice is harmless
+    with pytest.raises(RuntimeError, match="closed"):
+        writer.write(_insert_user, "ada")
@@ -0,0 +1,170 @@
+import streamlit as st
+import pandas as pd
+from collections import defaultdict
+from datetime import datetime, timedelta
+import queries
+from db import transaction
+from metrics import track_page
+from util import notify
+from writer import write
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+def record_sessions(conn, sessions):
+    """Write study sessions to time_tracking and fold them into the daily rollup in one transaction.
+
+    Each session is a dict with user_id, topic_id, start_time, end_time (datetimes) and optional notes.
+    """
+    rows = []
+    rollup = defaultdict(lambda: [0, 0])  # {(user_id, day, topic_id): [seconds, sessions]}
+    for session in sessions:
+        start, end = session["start_time"], session["end_time"]
+        if end < start:
+            raise ValueError("Session end time cannot be earlier than its start time.")
+        time_spent = int((end - start).total_seconds())
+        rows.append((
+            session["user_id"], session["topic_id"], start.strftime(TIME_FORMAT),
+            end.strftime(TIME_FORMAT), time_spent, session.get("notes")
+        ))
+        totals = rollup[(session["user_id"], start.strftime("%Y-%m-%d"), session["topic_id"])]
+        totals[0] += time_spent
+        totals[1] += 1
+
+    if not rows:
+        return 0
+
+    with transaction(conn):
+        conn.executemany(
+            """
+            INSERT INTO time_tracking (user_id, topic_id, start_time, end_time, time_spent, notes)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            rows
+        )
+        # Rows are pre-aggregated per key so each rollup row is touched once per batch
+        conn.executemany(
+            """
+            INSERT INTO time_tracking_daily (user_id, day, topic_id, time_spent, sessions)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(user_id, day, topic_id) DO UPDATE SET
+                time_spent = time_spent + excluded.time_spent,
+                sessions = sessions + excluded.sessions
+            """,
+            [(*key, seconds, count) for key, (seconds, count) in rollup.items()]
+        )
+    return len(rows)
+
+def rebuild_daily_rollup(conn):
+    """Recompute time_tracking_daily and its archive from the raw sessions."""
+    with transaction(conn):
+        for rollup, sessions in (("time_tracking_daily", "time_tracking"), ("time_tracking_daily_archive", "time_tracking_archive")):
+            conn.execute(f"DELETE FROM {rollup}")
+            conn.execute(
+                f"""
+                INSERT INTO {rollup} (user_id, day, topic_id, time_spent, sessions)
+                SELECT user_id, substr(start_time, 1, 10), topic_id, SUM(time_spent), COUNT(*)
+                FROM {sessions}
+                GROUP BY user_id, substr(start_time, 1, 10), topic_id
+                """
+            )
+
+def fetch_daily_totals(conn, user_id, since):
+    """Fetch total study seconds per day from the rollup, archived topics included, starting at `since` (a date)."""
+    since = since.strftime("%Y-%m-%d")
+    return conn.execute(
+        """
+        SELECT day, SUM(time_spent), SUM(sessions)
+        FROM (
+            SELECT day, time_spent, sessions FROM time_tracking_daily WHERE user_id = ? AND day >= ?
+            UNION ALL
+            SELECT day, time_spent, sessions FROM time_tracking_daily_archive WHERE user_id = ? AND day >= ?
+        )
+        GROUP BY day
+        ORDER BY day
+        """,
+        (user_id, since, user_id, since)
+    ).fetchall()
+
+@track_page("study_timer")
+def show_timer(conn, user_id):
+    st.subheader("⏱️ Study Timer")
+
+    tasks = conn.execute(queries.OPEN_TASK_TITLES, (user_id,)).fetchall()
+    task_options = {task[0]: task[1] for task in tasks}  # {topic_id: title}
+
+    if not task_options:
+        st.info("ℹ️ No open tasks found. Add a task to start tracking time!")
+        return
+
+    running = st.session_state.get('timer_running')  # {"topic_id": ..., "start_time": ...}
+
+    if running:
+        elapsed = datetime.now() - running["start_time"]
+        st.metric(
+            f"Studying: {task_options.get(running['topic_id'], 'Unknown task')}",
+            str(elapsed).split(".")[0]
+        )
+        notes = st.text_input("Notes", placeholder="What did you work on?")
+        if st.button("⏹️ Stop Timer"):
+            try:
+                write(record_sessions, [{
+                    "user_id": user_id,
+                    "topic_id": running["topic_id"],
+                    "start_time": running["start_time"],
+                    "end_time": datetime.now(),
+                    "notes": notes,
+                }])
+                st.session_state['timer_running'] = None
+                notify("Study session saved!", icon="✅")
+                st.rerun()
+            except Exception as e:
+                st.error(f"❌ Error saving session: {str(e)}")
+    else:
+        selected_task_id = st.selectbox("📋 Select Task", options=list(task_options.keys()), format_func=lambda x: task_options[x])
+        if st.button("▶️ Start Timer"):
+            st.session_state['timer_running'] = {"topic_id": selected_task_id, "start_time": datetime.now()}
+            st.rerun()
+
+    # Log several past sessions and save them as one batch
+    with st.expander("📝 Log Past Sessions", expanded=False):
+        now = datetime.now().replace(second=0, microsecond=0)
+        log_df = st.data_editor(
+            pd.DataFrame(
+                {"Task": pd.Series(dtype="object"), "Start": pd.Series(dtype="datetime64[ns]"),
+                 "Minutes": pd.Series(dtype="int"), "Notes": pd.Series(dtype="object")}
+            ),
+            column_config={
+                "Task": st.column_config.SelectboxColumn("Task", options=list(task_options.values()), required=True),
+                "Start": st.column_config.DatetimeColumn("Start", format="YYYY-MM-DD HH:mm", default=now, required=True),
+                "Minutes": st.column_config.NumberColumn("Minutes", min_value=1, max_value=24 * 60, default=30, required=True),
+                "Notes": st.column_config.TextColumn("Notes"),
+            },
+            num_rows="dynamic",
+            key="timer_log_editor",
+            use_container_width=True
+        )
+        if st.button("💾 Save Sessions"):
+            title_to_id = {title: topic_id for topic_id, title in task_options.items()}
+            sessions = [
+                {
+                    "user_id": user_id,
+                    "topic_id": title_to_id[row.Task],
+                    "start_time": row.Start.to_pydatetime(),
+                    "end_time": row.Start.to_pydatetime() + timedelta(minutes=int(row.Minutes)),
+                    "notes": row.Notes if isinstance(row.Notes, str) else None,
+                }
+                for row in log_df.dropna(subset=["Task", "Start", "Minutes"]).itertuples(index=False)
+            ]
+            try:
+                saved = write(record_sessions, sessions)
+                st.success(f"✅ {saved} session(s) saved!")
+            except Exception as e:
+                st.error(f"❌ Error saving sessions: {str(e)}")
+
+    # Recent study time from the daily rollup
+    totals = fetch_daily_totals(conn, user_id, datetime.now().date() - timedelta(days=6))
+    if totals:
+        st.write("### 📅 Last 7 Days")
+        totals_df = pd.DataFrame(totals, columns=["Date", "Seconds", "Sessions"])
+        totals_df["Minutes"] = totals_df["Seconds"] // 60
+        st.dataframe(totals_df[["Date", "Minutes", "Sessions"]], use_container_width=True, hide_index=True)
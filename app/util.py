@@ -1,14 +1,37 @@
 import time
 import streamlit as st
+import reminders
+from writer import write
 
-def success_msg( ):
-    success_message = st.empty()  # Create a placeholder
-    success_message.success("🎉 Changes saved successfully!")  # Show success message
-    time.sleep(3)  # Wait for 5 seconds
-    success_message.empty()  # Clear the message
+NOTIFICATION_SECONDS = 10  # Undisplayed notifications older than this are dropped
+
+def notify(message, icon="🎉"):
+    """Queue a toast for this or the next run, so it survives st.rerun() without blocking the script."""
+    st.session_state.setdefault('notifications', []).append(
+        {"message": message, "icon": icon, "expires_at": time.time() + NOTIFICATION_SECONDS}
+    )
+
+def show_notifications():
+    """Show and clear the queued notifications; called at the start and end of every run."""
+    queued = st.session_state.get('notifications')
+    if not queued:
+        return
+    now = time.time()
+    for notification in queued:
+        if notification["expires_at"] > now:
+            st.toast(notification["message"], icon=notification["icon"])
+    st.session_state['notifications'] = []
+
+def show_reminders(conn, user_id):
+    """Toast the user's unread reminders from the inbox and mark them read."""
+    unread = reminders.fetch_unread_reminders(conn, user_id)
+    for _, message in unread:
+        st.toast(message, icon="⏰")
+    if unread:
+        write(reminders.mark_reminders_read, user_id, [inbox_id for inbox_id, _ in unread])
+
+def success_msg(message="Changes saved successfully!"):
+    notify(message)
 
 def delete_msg(message):
-    delete_message = st.empty()  # Create a placeholder
-    st.success(f"🎉 Task '{message}' deleted successfully!")                    
-    time.sleep(3)  # Wait for 5 seconds
-    delete_message.empty()  # Clear the message
+    notify(f"Task '{message}' deleted successfully!", icon="🗑️")
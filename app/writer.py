@@ -0,0 +1,136 @@
+"""One writer thread per database, committing queued write jobs in groups.
+
+Pages and the API read through read-only connections (db.connect_readonly) and send every write here:
+
+    write(services.create_task, user_id, title, from_date, due_date, priority, category)
+
+A job is any `fn(conn, *args, **kwargs)`; it runs on the writer's connection inside its own savepoint,
+so a failing job is rolled back alone and its exception is raised to the caller. Jobs that queue up
+while a commit is in progress share the next transaction, so concurrent sessions cost one commit per
+group rather than one each and never compete for SQLite's write lock.
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+import db
+import metrics
+from db import connect, transaction
+
+GROUP_COMMIT_MAX_JOBS = int(os.getenv("SKILLFORGE_GROUP_COMMIT_MAX_JOBS", "64"))
+# How long the writer waits for more jobs before committing a group; bounds the added latency
+GROUP_COMMIT_WAIT_MS = float(os.getenv("SKILLFORGE_GROUP_COMMIT_WAIT_MS", "2"))
+WRITE_TIMEOUT_SECONDS = 30
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+class Writer:
+    """Owns the only write connection to a database and runs submitted jobs on its own thread."""
+
+    def __init__(self, db_path=None, max_jobs=GROUP_COMMIT_MAX_JOBS, wait_ms=GROUP_COMMIT_WAIT_MS):
+        self.max_jobs, self.wait = max_jobs, wait_ms / 1000
+        self._jobs = queue.Queue()
+        self._closed = False
+        self._state_lock = threading.Lock()  # No job may be queued behind the stop marker
+        self._conn = connect(db_path)
+        self._conn.execute("PRAGMA synchronous = NORMAL")  # Durable at each WAL checkpoint; commits skip the fsync
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, *args, **kwargs):
+        """Queue `fn(conn, *args, **kwargs)` and return a Future for its result."""
+        future = Future()
+        with self._state_lock:
+            if self._closed:
+                raise RuntimeError("The writer is closed.")
+            self._jobs.put((future, fn, args, kwargs, time.perf_counter()))
+        return future
+
+    def write(self, fn, *args, **kwargs):
+        """Run a job and wait for it to commit; raises what the job raised."""
+        if threading.current_thread() is self._thread:  # A job calling write() must not wait on itself
+            return fn(self._conn, *args, **kwargs)
+        return self.submit(fn, *args, **kwargs).result(timeout=WRITE_TIMEOUT_SECONDS)
+
+    def close(self):
+        """Commit what is queued, then stop the thread and close the connection.
+
+        The writer leaves the registry, so the next get_writer() for its database starts a new one.
+        """
+        with _writers_lock:
+            for path, writer in list(_writers.items()):
+                if writer is self:
+                    del _writers[path]
+        with self._state_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._jobs.put(None)
+        self._thread.join()
+        self._conn.close()
+
+    def _next_group(self):
+        group = [self._jobs.get()]
+        deadline = time.perf_counter() + self.wait
+        while group[-1] is not None and len(group) < self.max_jobs:
+            try:
+                group.append(self._jobs.get(timeout=max(0, deadline - time.perf_counter())))
+            except queue.Empty:
+                break
+        return group
+
+    def _run(self):
+        while True:
+            group = self._next_group()
+            stop = group[-1] is None
+            jobs = group[:-1] if stop else group
+            if jobs:
+                self._commit(jobs)
+            if stop:
+                return
+
+    def _commit(self, jobs):
+        conn = self._conn
+        outcomes = []  # (future, result, error)
+        started = time.perf_counter()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for future, fn, args, kwargs, queued_at in jobs:
+                metrics.WRITE_QUEUE_SECONDS.observe(started - queued_at)
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    with transaction(conn):  # Rolls back just this job if it fails
+                        outcomes.append((future, fn(conn, *args, **kwargs), None))
+                except Exception as e:
+                    outcomes.append((future, None, e))
+            conn.commit()
+        except Exception as e:
+            # BEGIN or COMMIT failed, so nothing in the group was written
+            if conn.in_transaction:
+                conn.rollback()
+            outcomes = [
+                (future, None, e) for future, *_ in jobs
+                if future.running() or future.set_running_or_notify_cancel()
+            ]
+        metrics.WRITE_GROUP_JOBS.observe(len(jobs))
+        metrics.WRITE_COMMIT_SECONDS.observe(time.perf_counter() - started)
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+def get_writer(db_path=None):
+    """The process's writer for `db_path` (default db.DB_PATH), started on first use."""
+    db_path = os.path.abspath(db_path or db.DB_PATH)
+    with _writers_lock:
+        if db_path not in _writers:
+            _writers[db_path] = Writer(db_path)
+        return _writers[db_path]
+
+def write(fn, *args, **kwargs):
+    """Run `fn(conn, *args, **kwargs)` on the default database's writer and return its result."""
+    return get_writer().write(fn, *args, **kwargs)